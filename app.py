@@ -2,20 +2,35 @@ from flask import Flask
 from flasgger import Swagger
 from gunicorn.app.base import BaseApplication
 
+from app.repositories.battle_repository import BattleRepository
+from app.repositories.battle_writer import BattleWriteBehind
 from app.repositories.pokemon_repository import PokemonRepository
 from app.routes.battle_routes import create_battle_blueprint
 from app.routes.pokemon_routes import create_pokemon_blueprint
+from app.routes.simulation_routes import create_simulation_blueprint
+from app.routes.tournament_routes import create_tournament_blueprint
 from app.config import Config
 from app.database import db
+from app.cache.bounded_cache import BoundedCache
 from app.cache.pokemon_cache import PokemonCacheManager
+from app.cache.http_cache import DiskHTTPCache
+from app.cache.name_index import PokemonNameIndex
+from app.cache.negative_cache import NegativeCache
+from app.cache.shared_cache import SQLiteCacheBackend
 from app.services.api_client import APIClient
+from app.services.async_api_client import AsyncAPIClient
+from app.services.async_pokeapi_service import AsyncPokeAPIService
+from app.services.background_refresh import BackgroundRefresher
 from app.services.data_tranformer import PokemonDataTransformer
 from app.services.pokeapi_service import PokeAPIService
 from app.battle_logic.battle_simulation import BattleSimulation
-from app.battle_logic.move_handler import MoveHandler
+from app.battle_logic.move_handler import BEST_MOVE, BestDamageMoveHandler, MoveHandler
 from app.battle_logic.type_effectiveness import TypeEffectiveness
 from app.services.battle_service import BattleService
 from app.services.pokemon_service import PokemonService
+from app.services.simulation_service import SimulationService
+from app.services.snapshot_importer import SnapshotImporter
+from app.services.tournament_service import TournamentService
 from app.services.url_map_service import PokemonURLMapper
 
 
@@ -23,27 +38,84 @@ def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
 
-    cache_manager = PokemonCacheManager()
-    url_mapper = PokemonURLMapper(cache_manager)
-    api_client = APIClient(Config.POKEAPI_BASE_URL)
+    shared_cache = None
+    if Config.SHARED_CACHE_PATH:
+        shared_cache = SQLiteCacheBackend(Config.SHARED_CACHE_PATH, max_bytes=Config.SHARED_CACHE_MAX_BYTES)
+    cache_manager = PokemonCacheManager(shared_cache=shared_cache)
+    name_index = PokemonNameIndex(Config.POKEMON_INDEX_PATH)
+    snapshot = None
+    if Config.POKEAPI_SNAPSHOT_DIR:
+        # Warm caches and the name index before the URL mapper would page through PokeAPI
+        snapshot_importer = SnapshotImporter(cache_manager=cache_manager, name_index=name_index)
+        snapshot = snapshot_importer.load(Config.POKEAPI_SNAPSHOT_DIR)
+        snapshot_importer.store(snapshot)
+    url_mapper = PokemonURLMapper(cache_manager, name_index=name_index)
+    http_cache = None
+    if Config.HTTP_CACHE_PATH:
+        http_cache = DiskHTTPCache(Config.HTTP_CACHE_PATH, max_bytes=Config.HTTP_CACHE_MAX_BYTES,
+                                   freshness_seconds=Config.HTTP_CACHE_FRESHNESS_SECONDS)
+    api_client = APIClient(Config.POKEAPI_BASE_URL, http_cache=http_cache)
     data_transformer = PokemonDataTransformer()
-    pokemon_api_service = PokeAPIService(cache_manager=cache_manager, url_mapper=url_mapper, api_client=api_client, data_transformer=data_transformer)
+    negative_cache = NegativeCache(max_entries=Config.NEGATIVE_CACHE_MAX_ENTRIES,
+                                   ttl_seconds=Config.NEGATIVE_CACHE_TTL_SECONDS)
+    refresher = None
+    if Config.CACHE_MAX_STALE_SECONDS:
+        refresher = BackgroundRefresher(max_workers=Config.CACHE_REFRESH_WORKERS,
+                                        max_pending=Config.CACHE_REFRESH_MAX_PENDING)
+    pokemon_api_service = PokeAPIService(cache_manager=cache_manager, url_mapper=url_mapper, api_client=api_client, data_transformer=data_transformer,
+                                         negative_cache=negative_cache, refresher=refresher)
     type_effectiveness_service = TypeEffectiveness()
-    move_handler = MoveHandler(pokemon_api_service)
+    async_pokemon_api_service = None
+    if Config.POKEAPI_ASYNC_FETCH:
+        async_api_client = AsyncAPIClient(Config.POKEAPI_BASE_URL, http_cache=http_cache)
+        async_pokemon_api_service = AsyncPokeAPIService(cache_manager=cache_manager, url_mapper=url_mapper,
+                                                        api_client=async_api_client, data_transformer=data_transformer,
+                                                        negative_cache=negative_cache, refresher=refresher)
+    if Config.MOVE_SELECTION == BEST_MOVE:
+        move_handler = BestDamageMoveHandler(pokemon_api_service,
+                                             table_cache=BoundedCache(max_entries=Config.CACHE_POKEMON_MAX_ENTRIES,
+                                                                      ttl_seconds=Config.CACHE_MOVE_TTL_SECONDS,
+                                                                      stripes=Config.CACHE_LOCK_STRIPES),
+                                             async_pokeapi_service=async_pokemon_api_service)
+        cache_manager.add_move_listener(move_handler.invalidate_move)
+        if snapshot is not None:
+            move_handler.warm(data_transformer.transform_to_pokemon(data) for data in snapshot.pokemon)
+    else:
+        move_handler = MoveHandler(pokemon_api_service)
     battle_simulation = BattleSimulation(type_effectiveness_service=type_effectiveness_service,
                                          move_handler=move_handler)
-    battle_service = BattleService(pokeapi_service=pokemon_api_service, battle_simulation=battle_simulation)
+    battle_result_cache = None
+    if Config.BATTLE_RESULT_CACHE_MAX_ENTRIES:
+        battle_result_cache = BoundedCache(max_entries=Config.BATTLE_RESULT_CACHE_MAX_ENTRIES,
+                                           max_bytes=Config.BATTLE_RESULT_CACHE_MAX_BYTES,
+                                           stripes=Config.CACHE_LOCK_STRIPES)
+    battle_service = BattleService(pokeapi_service=pokemon_api_service, battle_simulation=battle_simulation,
+                                   async_pokeapi_service=async_pokemon_api_service, result_cache=battle_result_cache)
 
     app.register_blueprint(create_battle_blueprint(battle_service), url_prefix="/api")
+    tournament_service = TournamentService(pokeapi_service=pokemon_api_service, move_handler=move_handler,
+                                           type_effectiveness_service=type_effectiveness_service,
+                                           async_pokeapi_service=async_pokemon_api_service)
+    app.register_blueprint(create_tournament_blueprint(tournament_service), url_prefix="/api")
+    simulation_service = SimulationService(pokeapi_service=pokemon_api_service, battle_simulation=battle_simulation,
+                                           async_pokeapi_service=async_pokemon_api_service)
+    app.register_blueprint(create_simulation_blueprint(simulation_service), url_prefix="/api")
     pokemon_repository = PokemonRepository()
     pokemon_api_service = PokemonService(pokemon_repository, pokemon_api_service)
     app.register_blueprint(create_pokemon_blueprint(pokemon_api_service), url_prefix="/api")
 
     db.init_app(app)
     Swagger(app)
+    if Config.BATTLE_WRITE_BEHIND:
+        BattleRepository.write_behind = BattleWriteBehind(app, max_queue=Config.BATTLE_WRITE_QUEUE_SIZE,
+                                                          batch_size=Config.BATTLE_WRITE_BATCH_SIZE,
+                                                          flush_interval=Config.BATTLE_WRITE_FLUSH_MS / 1000,
+                                                          put_timeout=Config.BATTLE_WRITE_PUT_TIMEOUT_SECONDS)
 
     with app.app_context():
         db.create_all()
+        PokemonRepository.ensure_name_index()
+        BattleRepository.ensure_record_column()
 
     return app
 
@@ -0,0 +1,142 @@
+from typing import Dict, Iterable, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.battle_logic.move_handler import MoveHandler, MoveTable
+from app.battle_logic.type_effectiveness import DEFENDER_CHART, TYPES, TypeEffectiveness, defender_type_index
+from app.config import Config
+from app.models import Pokemon
+
+UNDECIDED = -1
+
+# Columns of the per-species stats array of build_roster_matchups.
+_ATTACK, _DEFENSE, _SPECIAL_ATTACK, _SPECIAL_DEFENSE = range(4)
+_NO_MOVE = {'name': None, 'power': 0, 'type': None, 'damage_class': None}
+
+
+class MatchupBatch(NamedTuple):
+    """Per-matchup arrays of shape (N,); index 0 is the side that attacks first."""
+    hp1: np.ndarray
+    hp2: np.ndarray
+    damage1: np.ndarray
+    damage2: np.ndarray
+
+
+class BatchBattleResult(NamedTuple):
+    winner: np.ndarray  # 0 or 1 for the winning side, UNDECIDED when the turn budget ran out
+    turns: np.ndarray  # attacks made, i.e. the length of the scalar battle log
+    hp1: np.ndarray
+    hp2: np.ndarray
+
+
+class BatchBattleSimulation:
+    """
+    Simulates N battles at once with the rules of BattleSimulation: sides alternate hits,
+    side 0 first, each hit capped at the defender's remaining HP. Battles advance in lockstep
+    and finished ones drop out of the working set, so each turn costs O(active battles).
+    """
+
+    def __init__(self, max_turns: int = Config.BATTLE_MAX_TURNS):
+        self.max_turns = max_turns
+
+    @staticmethod
+    def compute_damage(attack: np.ndarray, defense: np.ndarray, power: np.ndarray,
+                       type_multiplier: np.ndarray, has_move: np.ndarray) -> np.ndarray:
+        """Per-hit damage exactly as BattleSimulation.calculate_damage: max(1, int(power * atk / def * mult))."""
+        damage = (power.astype(np.float64) * attack / defense) * type_multiplier
+        return np.where(has_move, np.maximum(1, np.trunc(damage)), 0).astype(np.int64)
+
+    def simulate(self, batch: MatchupBatch) -> BatchBattleResult:
+        hp = np.stack([batch.hp1, batch.hp2]).astype(np.int64)
+        damage = np.stack([batch.damage1, batch.damage2]).astype(np.int64)
+        battles = hp.shape[1]
+        winner = np.full(battles, UNDECIDED, dtype=np.int8)
+        turns = np.zeros(battles, dtype=np.int64)
+
+        active = np.flatnonzero((hp[0] > 0) & (hp[1] > 0))
+        for turn in range(self.max_turns):
+            if active.size == 0:
+                break
+            attacker = turn % 2
+            defender = 1 - attacker
+
+            remaining = hp[defender, active] - np.minimum(damage[attacker, active], hp[defender, active])
+            hp[defender, active] = remaining
+            turns[active] += 1
+
+            knocked_out = remaining == 0
+            winner[active[knocked_out]] = attacker
+            active = active[~knocked_out]
+
+        return BatchBattleResult(winner=winner, turns=turns, hp1=hp[0], hp2=hp[1])
+
+
+def build_matchups(pairs: Sequence[Tuple[Pokemon, Pokemon]], move_handler: MoveHandler,
+                   type_effectiveness: TypeEffectiveness) -> MatchupBatch:
+    """Per-hit damage arrays for `pairs`; see build_roster_matchups."""
+    roster: Dict[int, Pokemon] = {}
+    for pair in pairs:
+        for pokemon in pair:
+            roster.setdefault(id(pokemon), pokemon)
+    positions = {key: position for position, key in enumerate(roster)}
+    sides = np.array([(positions[id(pokemon1)], positions[id(pokemon2)]) for pokemon1, pokemon2 in pairs],
+                     dtype=np.intp).reshape(-1, 2)
+    return build_roster_matchups(list(roster.values()), sides[:, 0], sides[:, 1], move_handler, type_effectiveness)
+
+
+def build_roster_matchups(roster: Sequence[Pokemon], first: np.ndarray, second: np.ndarray,
+                          move_handler: MoveHandler, type_effectiveness: TypeEffectiveness) -> MatchupBatch:
+    """
+    Per-hit damage arrays for the matchups roster[first[k]] vs roster[second[k]]. Stats, type chart
+    columns and moves are resolved once per species (moves once per matchup when the handler picks
+    them per defender), and each move is fetched once; the damage of every side is then gathered
+    from those arrays and DEFENDER_CHART in one compute_damage call.
+    """
+    first, second = np.asarray(first, dtype=np.intp), np.asarray(second, dtype=np.intp)
+    stats = np.array([(pokemon.attack, pokemon.defense, pokemon.special_attack, pokemon.special_defense)
+                      for pokemon in roster], dtype=np.int64).reshape(-1, 4)
+    hp = np.array([pokemon.hp for pokemon in roster], dtype=np.int64)
+    chart, columns = _type_chart(roster, type_effectiveness)
+
+    # Move id 0 is "no move": power 0, neutral type, no damage.
+    move_ids: Dict[Optional[str], int] = {None: 0}
+
+    def select(selected: Iterable[Optional[str]]) -> np.ndarray:
+        return np.fromiter((move_ids.setdefault(move, len(move_ids)) for move in selected), dtype=np.intp)
+
+    if all(len(move_handler.candidate_moves(pokemon)) <= 1 for pokemon in roster):
+        by_species = select(move_handler.select_move(pokemon) for pokemon in roster)
+        moves1, moves2 = by_species[first], by_species[second]
+    else:
+        moves1 = select(move_handler.select_move(roster[i], roster[j]) for i, j in zip(first, second))
+        moves2 = select(move_handler.select_move(roster[j], roster[i]) for i, j in zip(first, second))
+    moves = MoveTable.build([_NO_MOVE] + [move_handler.get_move_data(name) for name in list(move_ids)[1:]])
+
+    # Both sides at once: rows [0, N) are pokemon1 attacking, rows [N, 2N) pokemon2.
+    attackers, defenders = np.concatenate([first, second]), np.concatenate([second, first])
+    move = np.concatenate([moves1, moves2])
+    special = moves.special[move]
+    damage = BatchBattleSimulation.compute_damage(
+        np.where(special, stats[attackers, _SPECIAL_ATTACK], stats[attackers, _ATTACK]),
+        np.where(special, stats[defenders, _SPECIAL_DEFENSE], stats[defenders, _DEFENSE]),
+        moves.power[move], chart[moves.type_ids[move], columns[defenders]], move != 0)
+    return MatchupBatch(hp1=hp[first], hp2=hp[second], damage1=damage[:first.size], damage2=damage[first.size:])
+
+
+def _type_chart(roster: Sequence[Pokemon], type_effectiveness: TypeEffectiveness) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    DEFENDER_CHART with a neutral row for move types outside it, plus a column for each species
+    whose types have none (asking `type_effectiveness`), and the chart column of every species.
+    """
+    columns = [pokemon.type_index if pokemon.type_index is not None else defender_type_index(pokemon.types)
+               for pokemon in roster]
+    chart = np.vstack([DEFENDER_CHART, np.ones(DEFENDER_CHART.shape[1])])
+    uncharted = [position for position, column in enumerate(columns) if column is None]
+    if uncharted:
+        extra = np.ones((chart.shape[0], len(uncharted)))
+        for offset, position in enumerate(uncharted):
+            extra[:len(TYPES), offset] = [type_effectiveness.get_type_effectiveness([type_name], roster[position].types)
+                                          for type_name in TYPES]
+            columns[position] = chart.shape[1] + offset
+        chart = np.hstack([chart, extra])
+    return chart, np.array(columns, dtype=np.intp)
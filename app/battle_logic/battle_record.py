@@ -0,0 +1,187 @@
+import zlib
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Damage runs of one side, flattened: damage per hit, consecutive hits, damage per hit, consecutive hits, ...
+Runs = Tuple[int, ...]
+
+# Flags byte: format version in the high nibble, then these bits
+_FORMAT_VERSION = 2
+_DRAW = 1
+_SIDE2_FIRST = 2
+_COMPRESSED = 4
+_VARINTS = 8
+_HEADER_SIZE = 7
+# Short bodies do not shrink under zlib and compressing them costs more than the insert saves
+_COMPRESS_ABOVE = 128
+
+
+def turn_message(attacker: str, damage: int, defender: str, remaining_hp: int) -> str:
+    return f"{attacker} dealt {damage} damage to {defender}. Remaining HP: {remaining_hp}"
+
+
+def draw_message(pokemon1: str, pokemon2: str, turns: int) -> str:
+    return f"{pokemon1} and {pokemon2} could not finish the battle after {turns} turns. It is a draw."
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    value, shift = 0, 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _pack_varints(numbers: Iterable[int]) -> bytes:
+    out = bytearray()
+    for number in numbers:
+        _write_varint(out, number)
+    return bytes(out)
+
+
+def _unpack(body: bytes, offset: int, count: int, varints: bool) -> Tuple[Tuple[int, ...], int]:
+    if not varints:
+        return tuple(body[offset:offset + count]), offset + count
+    numbers = []
+    for _ in range(count):
+        number, offset = _read_varint(body, offset)
+        numbers.append(number)
+    return tuple(numbers), offset
+
+
+def add_run(runs: List[int], damage: int, hits: int = 1) -> None:
+    if hits <= 0:
+        return
+    if runs and runs[-2] == damage:
+        runs[-1] += hits
+    else:
+        runs += (damage, hits)
+
+
+class BattleRecord(NamedTuple):
+    """
+    A battle as data: sides alternate from `first`, and each side's hits are run-length encoded as
+    flattened (damage, hits) pairs, so a deterministic battle takes a few runs however long it lasts.
+    The text log is rendered from it on demand, and `encode` packs it into a few dozen bytes.
+    """
+    pokemon1: str
+    pokemon2: str
+    hp1: int
+    hp2: int
+    first: int
+    turns: int
+    draw: bool
+    runs: Tuple[Runs, Runs]
+
+    @classmethod
+    def from_events(cls, pokemon1: str, pokemon2: str, hp1: int, hp2: int,
+                    events: Iterable[Tuple[int, int, int]]) -> 'BattleRecord':
+        """Build from (attacker index, damage, defender's remaining HP) turn events."""
+        runs: Tuple[List[int], List[int]] = ([], [])
+        first, turns, knocked_out = 0, 0, False
+        for attacker_index, damage, remaining_hp in events:
+            if not turns:
+                first = attacker_index
+            add_run(runs[attacker_index], damage)
+            turns += 1
+            knocked_out = remaining_hp == 0
+        return cls(pokemon1, pokemon2, hp1, hp2, first, turns, not knocked_out, cls._freeze(runs))
+
+    @classmethod
+    def from_runs(cls, pokemon1: str, pokemon2: str, hp1: int, hp2: int, first: int, turns: int, draw: bool,
+                  runs: Tuple[List[int], List[int]]) -> 'BattleRecord':
+        return cls(pokemon1, pokemon2, hp1, hp2, first, turns, draw, cls._freeze(runs))
+
+    @property
+    def winner(self) -> Optional[int]:
+        """Index of the side that landed the knockout, None for a draw."""
+        if self.draw:
+            return None
+        return self.first if self.turns % 2 else 1 - self.first
+
+    @property
+    def final_hp(self) -> Tuple[int, int]:
+        return self.hp1 - self._total(self.runs[1]), self.hp2 - self._total(self.runs[0])
+
+    def events(self) -> Iterator[Tuple[int, int, int]]:
+        hp = [self.hp1, self.hp2]
+        hits = (self._hits(self.runs[0]), self._hits(self.runs[1]))
+        for turn in range(self.turns):
+            attacker_index = self.first if turn % 2 == 0 else 1 - self.first
+            defender_index = 1 - attacker_index
+            damage = next(hits[attacker_index])
+            hp[defender_index] -= damage
+            yield attacker_index, damage, hp[defender_index]
+
+    def iter_log(self) -> Iterator[str]:
+        names = (self.pokemon1, self.pokemon2)
+        for attacker_index, damage, remaining_hp in self.events():
+            yield turn_message(names[attacker_index], damage, names[1 - attacker_index], remaining_hp)
+        if self.draw:
+            yield draw_message(self.pokemon1, self.pokemon2, self.turns)
+
+    def encode(self) -> bytes:
+        """
+        One flags byte, then both starting HPs, turns, name lengths and run sizes, the runs as
+        (damage, hits) pairs, and the names. Typical battles fit every number in a byte, so the body is
+        a single bytes() call; otherwise the numbers are varints. Long bodies are zlib-compressed when
+        that makes them smaller.
+        """
+        pokemon1, pokemon2, hp1, hp2, first, turns, draw, (runs1, runs2) = self
+        name1, name2 = pokemon1.encode(), pokemon2.encode()
+        flags = _FORMAT_VERSION << 4 | (_DRAW if draw else 0) | (_SIDE2_FIRST if first else 0)
+        numbers = (flags, hp1, hp2, turns, len(name1), len(name2), len(runs1), len(runs2)) + runs1 + runs2
+        try:
+            payload = b''.join((bytes(numbers), name1, name2))
+        except ValueError:
+            payload = b''.join((bytes((flags | _VARINTS,)), _pack_varints(numbers[1:]), name1, name2))
+
+        if len(payload) > _COMPRESS_ABOVE:
+            compressed = zlib.compress(payload[1:])
+            if len(compressed) < len(payload) - 1:
+                return bytes((payload[0] | _COMPRESSED,)) + compressed
+        return payload
+
+    @classmethod
+    def decode(cls, payload: bytes) -> 'BattleRecord':
+        flags = payload[0]
+        if flags >> 4 != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported battle record version {flags >> 4}")
+        body = zlib.decompress(payload[1:]) if flags & _COMPRESSED else payload[1:]
+        varints = bool(flags & _VARINTS)
+        header, offset = _unpack(body, 0, _HEADER_SIZE, varints)
+        hp1, hp2, turns, name1_size, name2_size, runs1_size, runs2_size = header
+        runs1, offset = _unpack(body, offset, runs1_size, varints)
+        runs2, offset = _unpack(body, offset, runs2_size, varints)
+        pokemon1 = body[offset:offset + name1_size].decode()
+        offset += name1_size
+        pokemon2 = body[offset:offset + name2_size].decode()
+        return cls(pokemon1, pokemon2, hp1, hp2, 1 if flags & _SIDE2_FIRST else 0, turns, bool(flags & _DRAW),
+                   (runs1, runs2))
+
+    @staticmethod
+    def _pairs(runs: Runs) -> Iterator[Tuple[int, int]]:
+        return zip(runs[::2], runs[1::2])
+
+    @classmethod
+    def _hits(cls, runs: Runs) -> Iterator[int]:
+        for damage, hits in cls._pairs(runs):
+            for _ in range(hits):
+                yield damage
+
+    @classmethod
+    def _total(cls, runs: Runs) -> int:
+        return sum(damage * hits for damage, hits in cls._pairs(runs))
+
+    @staticmethod
+    def _freeze(runs: Tuple[List[int], List[int]]) -> Tuple[Runs, Runs]:
+        return tuple(runs[0]), tuple(runs[1])
@@ -1,29 +1,225 @@
-from typing import Tuple, List
+import math
+import time
+from typing import Iterator, NamedTuple, Optional, Sequence, Tuple, List
 
+import numpy as np
+
+from app.battle_logic.battle_record import BattleRecord, add_run, draw_message, turn_message
 from app.battle_logic.move_handler import MoveHandler
 from app.battle_logic.type_effectiveness import TypeEffectiveness
+from app.config import Config
 from app.models import Pokemon
 
+# Bump whenever a rule change can change the result of a battle; memoized results are keyed by it.
+RULE_VERSION = 1
+
 SPECIAL = 'special'
+ANALYTIC = 'analytic'
+ITERATIVE = 'iterative'
+STOCHASTIC = 'stochastic'
+DRAW = 'draw'
+
+# Stochastic rules: a uniformly random move out of the first MAX_MOVE_CHOICES, a damage roll in
+# [MIN_DAMAGE_ROLL, 1) and a critical hit with CRITICAL_HIT_CHANCE.
+MAX_MOVE_CHOICES = 4
+MIN_DAMAGE_ROLL = 0.85
+CRITICAL_HIT_CHANCE = 1 / 24
+CRITICAL_HIT_MULTIPLIER = 1.5
+
+
+class DamageProfile(NamedTuple):
+    """One side's attack on a given opponent, resolved once per battle: none of it changes between turns."""
+    move: Optional[str]
+    type_multiplier: float
+    damage: int  # per hit, before it is capped at the defender's remaining HP
+
+
+class BattleOutcome(NamedTuple):
+    winner: str
+    turns: int
+    hp1: int
+    hp2: int
+    damage1: int
+    damage2: int
+
 
 class BattleSimulation:
-    def __init__(self, type_effectiveness_service: TypeEffectiveness, move_handler: MoveHandler):
+    """
+    Turn-based battle where pokemon1 attacks first. With the current deterministic rules every hit
+    of a side deals the same damage, so the `analytic` resolution computes the outcome in O(1) and
+    only replays turns when a log is requested. The `iterative` resolution plays turn by turn over
+    the same pre-battle DamageProfiles and is kept as a reference. Both end in a DRAW when neither side can deal
+    damage or when the turn (or, iteratively, time) budget runs out.
+
+    The `stochastic` resolution adds random move choice, damage rolls, critical hits and
+    speed-based turn order, all drawn from a numpy Generator so a seed replays the battle.
+    """
+
+    def __init__(self, type_effectiveness_service: TypeEffectiveness, move_handler: MoveHandler,
+                 resolution: str = Config.BATTLE_RESOLUTION, max_turns: int = Config.BATTLE_MAX_TURNS,
+                 max_seconds: float = Config.BATTLE_MAX_SECONDS):
         self.type_effectiveness_service = type_effectiveness_service
         self.move_handler = move_handler
+        self.resolution = resolution
+        self.max_turns = max_turns
+        self.max_seconds = max_seconds
+
+    def simulate_battle(self, pokemon1: Pokemon, pokemon2: Pokemon, with_log: bool = True,
+                        seed: Optional[int] = None) -> Tuple[str, List[str]]:
+        if self.resolution == ITERATIVE:
+            return self.simulate_turns(pokemon1, pokemon2)
+        if self.resolution == STOCHASTIC:
+            return self.simulate_stochastic(pokemon1, pokemon2, np.random.default_rng(seed))
+
+        outcome = self.resolve_battle(pokemon1, pokemon2)
+        battle_log = list(self.iter_battle_log(pokemon1, pokemon2, outcome)) if with_log else []
+        pokemon1.hp, pokemon2.hp = outcome.hp1, outcome.hp2
+        return outcome.winner, battle_log
+
+    def play_battle(self, pokemon1: Pokemon, pokemon2: Pokemon,
+                    seed: Optional[int] = None) -> Tuple[BattleOutcome, Iterator[str]]:
+        """
+        The outcome, and the battle log as a lazy iterator that a caller can drop or stream without
+        holding every line. The log is rendered from the battle's record as it is consumed.
+        The Pokemon are not modified.
+        """
+        outcome, record = self.record_battle(pokemon1, pokemon2, seed)
+        return outcome, record.iter_log()
+
+    def record_battle(self, pokemon1: Pokemon, pokemon2: Pokemon,
+                      seed: Optional[int] = None) -> Tuple[BattleOutcome, BattleRecord]:
+        """
+        The outcome and the battle as a BattleRecord, played once without formatting anything.
+        Analytic battles are recorded straight from the outcome. The Pokemon are not modified.
+        """
+        if self.resolution == ITERATIVE:
+            events = self._iter_turn_events(pokemon1, pokemon2)
+        elif self.resolution == STOCHASTIC:
+            events = self._iter_stochastic_events(pokemon1, pokemon2, np.random.default_rng(seed))
+        else:
+            outcome = self.resolve_battle(pokemon1, pokemon2)
+            return outcome, self.record_outcome(pokemon1, pokemon2, outcome)
+
+        record = BattleRecord.from_events(pokemon1.name, pokemon2.name, pokemon1.hp, pokemon2.hp, events)
+        winner = DRAW if record.winner is None else (pokemon1, pokemon2)[record.winner].name
+        return BattleOutcome(winner, record.turns, *record.final_hp, 0, 0), record
+
+    def ran_out_of_time(self, outcome: BattleOutcome) -> bool:
+        """Whether an iterative battle was cut short by max_seconds, rather than by a knockout or max_turns."""
+        return self.resolution == ITERATIVE and outcome.winner == DRAW and outcome.turns < self.max_turns
+
+    def resolve_battle(self, pokemon1: Pokemon, pokemon2: Pokemon) -> BattleOutcome:
+        """Winner, attacks made and final HP from the per-hit damage of each side, without playing turns."""
+        damage1 = self.compile_damage(pokemon1, pokemon2).damage
+        damage2 = self.compile_damage(pokemon2, pokemon1).damage
+        if not damage1 and not damage2:
+            # Neither side can hurt the other: the whole turn budget is played for nothing, as turn by turn.
+            return BattleOutcome(DRAW, self.max_turns, pokemon1.hp, pokemon2.hp, damage1, damage2)
 
-    def simulate_battle(self, pokemon1: Pokemon, pokemon2: Pokemon) -> Tuple[str, List[str]]:
+        hits_to_win1 = math.ceil(pokemon2.hp / damage1) if damage1 else math.inf
+        hits_to_win2 = math.ceil(pokemon1.hp / damage2) if damage2 else math.inf
+        if hits_to_win1 <= hits_to_win2:
+            turns = 2 * hits_to_win1 - 1
+            outcome = BattleOutcome(pokemon1.name, turns, pokemon1.hp - (hits_to_win1 - 1) * damage2, 0,
+                                    damage1, damage2)
+        else:
+            turns = 2 * hits_to_win2
+            outcome = BattleOutcome(pokemon2.name, turns, 0, pokemon2.hp - hits_to_win2 * damage1,
+                                    damage1, damage2)
+
+        if turns > self.max_turns:
+            hits1, hits2 = (self.max_turns + 1) // 2, self.max_turns // 2
+            return BattleOutcome(DRAW, self.max_turns, max(0, pokemon1.hp - hits2 * damage2),
+                                 max(0, pokemon2.hp - hits1 * damage1), damage1, damage2)
+        return outcome
+
+    def iter_battle_log(self, pokemon1: Pokemon, pokemon2: Pokemon, outcome: BattleOutcome) -> Iterator[str]:
+        """Replay the turns of a resolved battle; pokemon1 and pokemon2 must still hold their starting HP."""
+        return self.record_outcome(pokemon1, pokemon2, outcome).iter_log()
+
+    @staticmethod
+    def record_outcome(pokemon1: Pokemon, pokemon2: Pokemon, outcome: BattleOutcome) -> BattleRecord:
+        """
+        Record of a resolved battle in O(1): each side lands the same hit every time,
+        except for a knockout blow capped at the defender's remaining HP.
+        """
+        sides = ((outcome.damage1, (outcome.turns + 1) // 2, pokemon2.hp, outcome.hp2),
+                 (outcome.damage2, outcome.turns // 2, pokemon1.hp, outcome.hp1))
+        runs = ([], [])
+        for side_runs, (damage, hits, defender_hp, final_hp) in zip(runs, sides):
+            if outcome.winner != DRAW and final_hp == 0 and hits:
+                add_run(side_runs, damage, hits - 1)
+                add_run(side_runs, defender_hp - (hits - 1) * damage)
+            else:
+                add_run(side_runs, damage, hits)
+        return BattleRecord.from_runs(pokemon1.name, pokemon2.name, pokemon1.hp, pokemon2.hp, 0, outcome.turns,
+                                      outcome.winner == DRAW, runs)
+
+    def simulate_turns(self, pokemon1: Pokemon, pokemon2: Pokemon) -> Tuple[str, List[str]]:
+        return self._play_events(pokemon1, pokemon2, self._iter_turn_events(pokemon1, pokemon2))
+
+    def simulate_stochastic(self, pokemon1: Pokemon, pokemon2: Pokemon,
+                            rng: np.random.Generator) -> Tuple[str, List[str]]:
+        return self._play_events(pokemon1, pokemon2, self._iter_stochastic_events(pokemon1, pokemon2, rng))
+
+    def _play_events(self, pokemon1: Pokemon, pokemon2: Pokemon,
+                     events: Iterator[Tuple[int, int, int]]) -> Tuple[str, List[str]]:
+        """Collect the log of a turn event stream and leave both Pokemon at their final HP."""
+        pokemons = (pokemon1, pokemon2)
         battle_log = []
+        for attacker_index, damage, remaining_hp in events:
+            attacker, defender = pokemons[attacker_index], pokemons[1 - attacker_index]
+            defender.hp = remaining_hp
+            battle_log.append(turn_message(attacker.name, damage, defender.name, remaining_hp))
+            if remaining_hp == 0:
+                return attacker.name, battle_log
+
+        battle_log.append(draw_message(pokemon1.name, pokemon2.name, len(battle_log)))
+        return DRAW, battle_log
+
+    def _iter_turn_events(self, pokemon1: Pokemon, pokemon2: Pokemon) -> Iterator[Tuple[int, int, int]]:
+        """(attacker index, damage dealt, defender's remaining HP) per turn, pokemon1 first, within the budgets."""
+        damage_per_hit = (self.compile_damage(pokemon1, pokemon2).damage, self.compile_damage(pokemon2, pokemon1).damage)
+        hp = [pokemon1.hp, pokemon2.hp]
+        deadline = time.monotonic() + self.max_seconds if self.max_seconds else None
 
-        while pokemon1.hp > 0 and pokemon2.hp > 0:
-            damage = self.attack(pokemon1, pokemon2)
-            battle_log.append(f"{pokemon1.name} dealt {damage} damage to {pokemon2.name}. Remaining HP: {pokemon2.hp}")
-            if pokemon2.hp == 0:
-                return pokemon1.name, battle_log
+        for turn in range(self.max_turns):
+            if deadline and time.monotonic() > deadline:
+                return
+            attacker_index = turn % 2
+            defender_index = 1 - attacker_index
+            damage = min(damage_per_hit[attacker_index], hp[defender_index])
+            hp[defender_index] -= damage
+            yield attacker_index, damage, hp[defender_index]
+            if hp[defender_index] == 0:
+                return
 
-            damage = self.attack(pokemon2, pokemon1)
-            battle_log.append(f"{pokemon2.name} dealt {damage} damage to {pokemon1.name}. Remaining HP: {pokemon1.hp}")
-            if pokemon1.hp == 0:
-                return pokemon2.name, battle_log
+    def _iter_stochastic_events(self, pokemon1: Pokemon, pokemon2: Pokemon,
+                                rng: np.random.Generator) -> Iterator[Tuple[int, int, int]]:
+        """
+        Turn events of a stochastic battle. Random numbers are drawn in the order MonteCarloSimulation
+        draws them for a single trial: the speed tie-break, then per turn the move, the damage roll and
+        the critical hit.
+        """
+        damage_options = (self.move_damage_options(pokemon1, pokemon2), self.move_damage_options(pokemon2, pokemon1))
+        hp = [pokemon1.hp, pokemon2.hp]
+        tie_break = rng.random()
+        first = 0 if pokemon1.speed > pokemon2.speed or (pokemon1.speed == pokemon2.speed and tie_break < 0.5) else 1
+
+        for turn in range(self.max_turns):
+            attacker_index = first if turn % 2 == 0 else 1 - first
+            defender_index = 1 - attacker_index
+            damage = min(roll_damage(damage_options[attacker_index], rng.random(), rng.random(), rng.random()),
+                         hp[defender_index])
+            hp[defender_index] -= damage
+            yield attacker_index, damage, hp[defender_index]
+            if hp[defender_index] == 0:
+                return
+
+    def move_damage_options(self, attacker: Pokemon, defender: Pokemon) -> List[float]:
+        """Per-hit damage before rolls and truncation for each move the stochastic mode can pick."""
+        return [self.base_damage(attacker, defender, self.move_handler.get_move_data(move))
+                for move in attacker.moves[:MAX_MOVE_CHOICES]]
 
     def attack(self, attacker: Pokemon, defender: Pokemon) -> int:
         damage = self.calculate_damage(attacker, defender)
@@ -33,23 +229,51 @@ class BattleSimulation:
         return damage
 
     def calculate_damage(self, attacker: Pokemon, defender: Pokemon) -> int:
-        move = self.move_handler.select_move(attacker)
+        return self.compile_damage(attacker, defender).damage
+
+    def compile_damage(self, attacker: Pokemon, defender: Pokemon) -> DamageProfile:
+        """Resolve the attacker's move, its type multiplier and the per-hit damage against this defender."""
+        move = self.move_handler.select_move(attacker, defender)
         if not move:
-            return 0
+            return DamageProfile(None, 1.0, 0)
 
         move_data = self.move_handler.get_move_data(move)
-        power = move_data['power']
+        type_multiplier = self.type_multiplier(move_data, defender)
+        damage = self._damage(attacker, defender, move_data, type_multiplier)
+        return DamageProfile(move, type_multiplier, max(1, int(damage)))  # Ensure minimum 1 damage
+
+    def base_damage(self, attacker: Pokemon, defender: Pokemon, move_data: dict) -> float:
+        return self._damage(attacker, defender, move_data, self.type_multiplier(move_data, defender))
 
+    def type_multiplier(self, move_data: dict, defender: Pokemon) -> float:
         # Use move's type for type effectiveness
-        move_type = [move_data['type']]
-        type_multiplier = self.type_effectiveness_service.get_type_effectiveness(
-            move_type,
+        if defender.type_index is not None:
+            return self.type_effectiveness_service.get_type_effectiveness_by_index(
+                move_data['type'],
+                defender.type_index
+            )
+        return self.type_effectiveness_service.get_type_effectiveness(
+            [move_data['type']],
             defender.types
         )
 
+    @staticmethod
+    def _damage(attacker: Pokemon, defender: Pokemon, move_data: dict, type_multiplier: float) -> float:
+        # Moves without a base power (status moves, fixed-damage moves) count as power 0
+        power = move_data['power'] or 0
         if move_data['damage_class'] == SPECIAL:
-            damage = (power * attacker.special_attack / defender.special_defense) * type_multiplier
-        else:
-            damage = (power * attacker.attack / defender.defense) * type_multiplier
+            return (power * attacker.special_attack / defender.special_defense) * type_multiplier
+        return (power * attacker.attack / defender.defense) * type_multiplier
+
+
+def damage_multiplier(roll: float, critical: float) -> float:
+    """Stochastic multiplier from two uniform [0, 1) draws; MonteCarloSimulation computes the same expression."""
+    return (MIN_DAMAGE_ROLL + (1 - MIN_DAMAGE_ROLL) * roll) * (
+        CRITICAL_HIT_MULTIPLIER if critical < CRITICAL_HIT_CHANCE else 1.0)
+
 
-        return max(1, int(damage))  # Ensure minimum 1 damage
+def roll_damage(damage_options: Sequence[float], choice: float, roll: float, critical: float) -> int:
+    if not damage_options:
+        return 0
+    base = damage_options[int(choice * len(damage_options))]
+    return max(1, int(base * damage_multiplier(roll, critical)))
@@ -0,0 +1,93 @@
+import math
+from typing import NamedTuple, Tuple, Union
+
+import numpy as np
+
+from app.battle_logic.batch_simulation import UNDECIDED, BatchBattleResult
+from app.battle_logic.battle_simulation import (CRITICAL_HIT_CHANCE, CRITICAL_HIT_MULTIPLIER, MAX_MOVE_CHOICES,
+                                                MIN_DAMAGE_ROLL, BattleSimulation)
+from app.config import Config
+from app.models import Pokemon
+
+Seed = Union[None, int, np.random.SeedSequence]
+
+
+class StochasticMatchup(NamedTuple):
+    """Plain numbers describing both sides, cheap to pickle to worker processes."""
+    hp: Tuple[int, int]
+    speed: Tuple[int, int]
+    damage_options: Tuple[Tuple[float, ...], Tuple[float, ...]]
+
+    @classmethod
+    def build(cls, pokemon1: Pokemon, pokemon2: Pokemon, battle_simulation: BattleSimulation) -> 'StochasticMatchup':
+        return cls(hp=(pokemon1.hp, pokemon2.hp), speed=(pokemon1.speed, pokemon2.speed),
+                   damage_options=(tuple(battle_simulation.move_damage_options(pokemon1, pokemon2)),
+                                   tuple(battle_simulation.move_damage_options(pokemon2, pokemon1))))
+
+
+class MonteCarloSimulation:
+    """
+    Many stochastic battles of one matchup in lockstep, under the rules of
+    BattleSimulation.simulate_stochastic. Results depend only on the seed, and a single
+    trial replays the scalar battle for the same seed draw for draw.
+    """
+
+    def __init__(self, max_turns: int = Config.BATTLE_MAX_TURNS):
+        self.max_turns = max_turns
+
+    def simulate(self, matchup: StochasticMatchup, trials: int, seed: Seed = None) -> BatchBattleResult:
+        """Per-trial results; winner is 0 for pokemon1, 1 for pokemon2 and UNDECIDED for a draw."""
+        rng = np.random.default_rng(seed)
+        move_count = np.array([len(options) for options in matchup.damage_options])
+        damage_options = np.zeros((2, MAX_MOVE_CHOICES))
+        for side, options in enumerate(matchup.damage_options):
+            damage_options[side, :len(options)] = options
+
+        hp = np.repeat(np.array(matchup.hp, dtype=np.int64)[:, None], trials, axis=1)
+        speed1, speed2 = matchup.speed
+        tie_break = rng.random(trials)
+        first = np.where((speed1 > speed2) | ((speed1 == speed2) & (tie_break < 0.5)), 0, 1)
+        winner = np.full(trials, UNDECIDED, dtype=np.int8)
+        turns = np.zeros(trials, dtype=np.int64)
+
+        active = np.arange(trials)
+        for turn in range(self.max_turns):
+            if active.size == 0:
+                break
+            attacker = first[active] if turn % 2 == 0 else 1 - first[active]
+            defender = 1 - attacker
+            choice, roll, critical = rng.random(active.size), rng.random(active.size), rng.random(active.size)
+
+            count = move_count[attacker]
+            base = damage_options[attacker, (choice * count).astype(np.int64)]
+            multiplier = (MIN_DAMAGE_ROLL + (1 - MIN_DAMAGE_ROLL) * roll) * np.where(
+                critical < CRITICAL_HIT_CHANCE, CRITICAL_HIT_MULTIPLIER, 1.0)
+            damage = np.where(count > 0, np.maximum(1, np.trunc(base * multiplier)), 0).astype(np.int64)
+
+            defender_hp = hp[defender, active]
+            remaining = defender_hp - np.minimum(damage, defender_hp)
+            hp[defender, active] = remaining
+            turns[active] += 1
+
+            knocked_out = remaining == 0
+            winner[active[knocked_out]] = attacker[knocked_out]
+            active = active[~knocked_out]
+
+        return BatchBattleResult(winner=winner, turns=turns, hp1=hp[0], hp2=hp[1])
+
+    def count_outcomes(self, matchup: StochasticMatchup, trials: int, seed: Seed = None) -> np.ndarray:
+        """[pokemon1 wins, pokemon2 wins, draws]"""
+        winner = self.simulate(matchup, trials, seed).winner
+        return np.array([np.count_nonzero(winner == 0), np.count_nonzero(winner == 1),
+                         np.count_nonzero(winner == UNDECIDED)])
+
+
+def wilson_interval(successes: int, trials: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion (95% for the default z)."""
+    if not trials:
+        return 0.0, 1.0
+    proportion = successes / trials
+    denominator = 1 + z * z / trials
+    center = (proportion + z * z / (2 * trials)) / denominator
+    margin = z * math.sqrt(proportion * (1 - proportion) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
@@ -1,7 +1,21 @@
-from typing import Dict
+import threading
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
 
+import numpy as np
+
+from app.battle_logic.type_effectiveness import DEFENDER_CHART, TYPE_IDS, TYPES
+from app.cache.bounded_cache import BoundedCache
+from app.exceptions import MoveNotFoundException
 from app.models import Pokemon
 
+FIRST_MOVE = 'first'
+BEST_MOVE = 'best'
+
+# DEFENDER_CHART plus a neutral row for move types outside the chart.
+_UNKNOWN_TYPE = len(TYPES)
+_MOVE_CHART = np.vstack([DEFENDER_CHART, np.ones(DEFENDER_CHART.shape[1])])
+
+
 class MoveHandler:
     def __init__(self, pokeapi_service: "PokeAPIService"):
         self.pokeapi_service = pokeapi_service
@@ -10,6 +24,113 @@ class MoveHandler:
         return self.pokeapi_service.get_move_data(move_name)
 
     @staticmethod
-    def select_move(pokemon: Pokemon) -> str:
+    def select_move(pokemon: Pokemon, defender: Optional[Pokemon] = None) -> str:
         first_move = pokemon.moves[0] if pokemon.moves else None
         return first_move
+
+    def candidate_moves(self, pokemon) -> List[str]:
+        """Every move `select_move` may return for this Pokemon, whatever the defender."""
+        return pokemon.moves[:1]
+
+
+class MoveTable(NamedTuple):
+    """A species' learnset as arrays, so picking a move against a defender is one argmax."""
+    names: Tuple[str, ...]
+    power: np.ndarray
+    type_ids: np.ndarray
+    special: np.ndarray
+
+    @classmethod
+    def build(cls, moves: List[dict]) -> 'MoveTable':
+        return cls(names=tuple(move['name'] for move in moves),
+                   power=np.array([move['power'] or 0 for move in moves], dtype=np.float64),
+                   type_ids=np.array([TYPE_IDS.get(move['type'], _UNKNOWN_TYPE) for move in moves], dtype=np.intp),
+                   special=np.array([move['damage_class'] == 'special' for move in moves], dtype=bool))
+
+    def expected_damage(self, attacker: Pokemon, defender: Pokemon) -> np.ndarray:
+        """Per-move damage before truncation, with the formula of BattleSimulation."""
+        attack = np.where(self.special, attacker.special_attack, attacker.attack)
+        defense = np.where(self.special, defender.special_defense, defender.defense)
+        return (self.power * attack / defense) * self._type_multipliers(defender)
+
+    def _type_multipliers(self, defender: Pokemon) -> np.ndarray:
+        if defender.type_index is not None:
+            return _MOVE_CHART[self.type_ids, defender.type_index]
+        # The first len(TYPES) defender columns are the single types.
+        multipliers = np.ones(len(self.names))
+        for defender_type in defender.types:
+            type_id = TYPE_IDS.get(defender_type.lower())
+            if type_id is not None:
+                multipliers *= _MOVE_CHART[self.type_ids, type_id]
+        return multipliers
+
+
+class BestDamageMoveHandler(MoveHandler):
+    """
+    Picks the move with the highest expected damage against the defender out of the whole stored
+    learnset. Each species' learnset is resolved once into a MoveTable; moves that cannot be
+    fetched are left out of it. `warm` builds tables ahead of the first battle, a missing table
+    fetches its moves concurrently when an async service is given, and `invalidate_move` drops
+    every table built with a move whose data changed.
+    """
+
+    def __init__(self, pokeapi_service: "PokeAPIService", table_cache: Optional[BoundedCache] = None,
+                 async_pokeapi_service: Optional["AsyncPokeAPIService"] = None):
+        super().__init__(pokeapi_service)
+        self.table_cache = table_cache if table_cache is not None else BoundedCache(max_entries=2048)
+        self.async_pokeapi_service = async_pokeapi_service
+        self._lock = threading.Lock()
+        self._tables_by_move: Dict[str, Set[Hashable]] = {}
+
+    def select_move(self, pokemon: Pokemon, defender: Optional[Pokemon] = None) -> Optional[str]:
+        table = self.move_table(pokemon)
+        if not table.names:
+            return None
+        if defender is None:
+            return table.names[int(np.argmax(table.power))]
+        return table.names[int(np.argmax(table.expected_damage(pokemon, defender)))]
+
+    def candidate_moves(self, pokemon) -> List[str]:
+        return list(pokemon.moves)
+
+    def move_table(self, pokemon) -> MoveTable:
+        key = (pokemon.name, tuple(pokemon.moves))
+        table = self.table_cache.get(key)
+        if table is None:
+            table = MoveTable.build(self._fetch_moves(pokemon.moves))
+            with self._lock:
+                for move_name in table.names:
+                    self._tables_by_move.setdefault(move_name, set()).add(key)
+            self.table_cache.set(key, table)
+        return table
+
+    def warm(self, roster: Iterable[Pokemon]) -> int:
+        """Build the table of every Pokemon in `roster` (e.g. a snapshot) before any battle needs it."""
+        return sum(1 for pokemon in roster if self.move_table(pokemon) is not None)
+
+    def invalidate_move(self, move_name: str) -> None:
+        """Drop the tables built with `move_name`, so they are rebuilt from its refreshed data."""
+        with self._lock:
+            keys = self._tables_by_move.pop(move_name, set())
+        for key in keys:
+            self.table_cache.delete(key)
+
+    def _fetch_moves(self, move_names: List[str]) -> List[dict]:
+        if self.async_pokeapi_service is not None:
+            results = self.async_pokeapi_service.fetch_move_list(move_names)
+        else:
+            results = []
+            for move_name in move_names:
+                try:
+                    results.append(self.get_move_data(move_name))
+                except MoveNotFoundException as e:
+                    results.append(e)
+
+        moves = []
+        for result in results:
+            if isinstance(result, MoveNotFoundException):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            moves.append(result)
+        return moves
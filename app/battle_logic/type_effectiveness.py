@@ -1,19 +1,79 @@
-from typing import List, Tuple
+from itertools import combinations
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models import PokemonType
+
+TYPES: Tuple[str, ...] = tuple(pokemon_type.value for pokemon_type in PokemonType)
+TYPE_IDS: Dict[str, int] = {name: type_id for type_id, name in enumerate(TYPES)}
+
+# Every single type followed by every unordered pair: 18 + 153 = 171 defender columns.
+DEFENDER_TYPES: Tuple[Tuple[int, ...], ...] = (tuple((type_id,) for type_id in range(len(TYPES))) +
+                                               tuple(combinations(range(len(TYPES)), 2)))
+DEFENDER_INDEX: Dict[Tuple[int, ...], int] = {type_ids: index for index, type_ids in enumerate(DEFENDER_TYPES)}
+
+
+# Attacking type -> defending type -> multiplier; pairs not listed are neutral (1.0).
+TYPE_CHART = {
+    "normal": {"rock": 0.5, "ghost": 0, "steel": 0.5},
+    "fire": {"fire": 0.5, "water": 0.5, "grass": 2.0, "ice": 2.0, "bug": 2.0, "rock": 0.5, "dragon": 0.5,
+             "steel": 2.0},
+    "water": {"fire": 2.0, "water": 0.5, "grass": 0.5, "ground": 2.0, "rock": 2.0, "dragon": 0.5},
+    "electric": {"water": 2.0, "electric": 0.5, "grass": 0.5, "ground": 0, "flying": 2.0, "dragon": 0.5},
+    "grass": {"fire": 0.5, "water": 2.0, "grass": 0.5, "poison": 0.5, "ground": 2.0, "flying": 0.5, "bug": 0.5,
+              "rock": 2.0, "dragon": 0.5, "steel": 0.5},
+    "ice": {"fire": 0.5, "water": 0.5, "grass": 2.0, "ice": 0.5, "ground": 2.0, "flying": 2.0, "dragon": 2.0,
+            "steel": 0.5},
+    "fighting": {"normal": 2.0, "ice": 2.0, "poison": 0.5, "flying": 0.5, "psychic": 0.5, "bug": 0.5,
+                 "rock": 2.0, "ghost": 0, "dark": 2.0, "steel": 2.0, "fairy": 0.5},
+    "poison": {"grass": 2.0, "poison": 0.5, "ground": 0.5, "rock": 0.5, "ghost": 0.5, "steel": 0, "fairy": 2.0},
+    "ground": {"fire": 2.0, "electric": 2.0, "grass": 0.5, "poison": 2.0, "flying": 0, "bug": 0.5, "rock": 2.0,
+               "steel": 2.0},
+    "flying": {"electric": 0.5, "grass": 2.0, "fighting": 2.0, "bug": 2.0, "rock": 0.5, "steel": 0.5},
+    "psychic": {"fighting": 2.0, "poison": 2.0, "psychic": 0.5, "dark": 0, "steel": 0.5},
+    "bug": {"fire": 0.5, "grass": 2.0, "fighting": 0.5, "poison": 0.5, "flying": 0.5, "psychic": 2.0,
+            "ghost": 0.5, "dark": 2.0, "steel": 0.5, "fairy": 0.5},
+    "rock": {"fire": 2.0, "ice": 2.0, "fighting": 0.5, "ground": 0.5, "flying": 2.0, "bug": 2.0, "steel": 0.5},
+    "ghost": {"normal": 0, "psychic": 2.0, "ghost": 2.0, "dark": 0.5},
+    "dragon": {"dragon": 2.0, "steel": 0.5, "fairy": 0},
+    "dark": {"fighting": 0.5, "psychic": 2.0, "ghost": 2.0, "dark": 0.5, "fairy": 0.5},
+    "steel": {"fire": 0.5, "water": 0.5, "electric": 0.5, "ice": 2.0, "rock": 2.0, "steel": 0.5, "fairy": 2.0},
+    "fairy": {"fire": 0.5, "fighting": 2.0, "poison": 0.5, "dragon": 2.0, "dark": 2.0, "steel": 0.5}
+}
+
+
+def _build_chart() -> np.ndarray:
+    chart = np.ones((len(TYPES), len(TYPES)))
+    for attacker, multipliers in TYPE_CHART.items():
+        for defender, multiplier in multipliers.items():
+            chart[TYPE_IDS[attacker], TYPE_IDS[defender]] = multiplier
+    return chart
+
+
+# CHART[attacker id, defender id]; DEFENDER_CHART[attacker id, defender column] covers dual types too.
+CHART = _build_chart()
+DEFENDER_CHART = np.array([[np.prod(CHART[attacker_id, list(type_ids)]) for type_ids in DEFENDER_TYPES]
+                           for attacker_id in range(len(TYPES))])
+_DEFENDER_INDEX_CACHE: Dict[Tuple[str, ...], Optional[int]] = {}
+
+
+def defender_type_index(defender_types: Sequence[str]) -> Optional[int]:
+    """Column of DEFENDER_CHART for a species' one or two types, None for anything else."""
+    key = tuple(defender_types)
+    if key not in _DEFENDER_INDEX_CACHE:
+        try:
+            type_ids = tuple(sorted({TYPE_IDS[name.lower()] for name in key}))
+            _DEFENDER_INDEX_CACHE[key] = DEFENDER_INDEX.get(type_ids)
+        except KeyError:
+            _DEFENDER_INDEX_CACHE[key] = None
+    return _DEFENDER_INDEX_CACHE[key]
+
 
 class TypeEffectiveness:
-    TYPE_EFFECTIVENESS = {
-        ("normal", "rock"): 0.5,
-        ("normal", "ghost"): 0,
-        ("normal", "steel"): 0.5,
-        ("fire", "fire"): 0.5,
-        ("fire", "water"): 0.5,
-        ("fire", "grass"): 2.0,
-        ("fire", "ice"): 2.0,
-        ("fire", "bug"): 2.0,
-        ("fire", "rock"): 0.5,
-        ("fire", "dragon"): 0.5,
-        ("fire", "steel"): 2.0
-    }
+    TYPE_EFFECTIVENESS = TYPE_CHART
+    # Plain lists: indexing them is faster than indexing numpy arrays one element at a time.
+    _DEFENDER_ROWS: List[List[float]] = DEFENDER_CHART.tolist()
 
     def get_type_effectiveness(self, attacker_types: List[Tuple[str]], defender_types: List[str]) -> float:
         """
@@ -23,13 +83,28 @@ class TypeEffectiveness:
         if not attacker_types or not defender_types:
             return 1.0
 
+        defender_index = defender_type_index(defender_types)
         final_effectiveness = 1.0
         for attacker_type in attacker_types:
-            for defender_type in defender_types:
-                effectiveness = self.TYPE_EFFECTIVENESS.get(
-                    (attacker_type.lower(), defender_type.lower()),
-                    1.0
-                )
-                final_effectiveness *= effectiveness
+            attacker_id = TYPE_IDS.get(attacker_type)
+            if attacker_id is None:
+                attacker_id = TYPE_IDS.get(attacker_type.lower())
+            if attacker_id is None:
+                continue
+            if defender_index is not None:
+                final_effectiveness *= self._DEFENDER_ROWS[attacker_id][defender_index]
+            else:
+                # The first 18 defender columns are the single types, in type id order.
+                for defender_type in defender_types:
+                    defender_id = TYPE_IDS.get(defender_type.lower())
+                    if defender_id is not None:
+                        final_effectiveness *= self._DEFENDER_ROWS[attacker_id][defender_id]
 
         return final_effectiveness
+
+    def get_type_effectiveness_by_index(self, attacker_type: str, defender_index: int) -> float:
+        """Single lookup for a defender whose types were resolved up front with `defender_type_index`."""
+        attacker_id = TYPE_IDS.get(attacker_type)
+        if attacker_id is None:
+            return 1.0
+        return self._DEFENDER_ROWS[attacker_id][defender_index]
@@ -0,0 +1,138 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+
+class _Entry(NamedTuple):
+    value: Any
+    size: int
+    expires_at: float
+
+
+def approximate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Deep `sys.getsizeof` over containers and pydantic/slotted objects; shared objects are counted once."""
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return size
+    if isinstance(value, dict):
+        return size + sum(approximate_size(key, seen) + approximate_size(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(approximate_size(item, seen) for item in value)
+    if hasattr(value, '__dict__'):
+        return size + approximate_size(vars(value), seen)
+    slots = getattr(type(value), '__slots__', ())
+    return size + sum(approximate_size(getattr(value, slot, None), seen) for slot in slots)
+
+
+class _Stripe:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self.bytes = 0
+        self.counters = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+
+
+class BoundedCache:
+    """
+    LRU cache bounded by entry count and approximate bytes, with an optional TTL.
+    Keys are spread over `stripes` independently locked LRU segments, so concurrent
+    threads only contend when they hit the same segment; limits apply per segment.
+    Expired entries are kept for another `max_stale_seconds`, during which only
+    `get_entry` returns them (flagged as stale).
+    """
+
+    def __init__(self, max_entries: int = 0, max_bytes: int = 0, ttl_seconds: float = 0, stripes: int = 8,
+                 max_stale_seconds: float = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max_stale_seconds if ttl_seconds else 0
+        self._stripes: List[_Stripe] = [_Stripe() for _ in range(max(1, stripes))]
+        self._stripe_max_entries = -(-max_entries // len(self._stripes)) if max_entries else 0
+        self._stripe_max_bytes = max_bytes // len(self._stripes) if max_bytes else 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._lookup(key, allow_stale=False)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, bool]]:
+        """(value, is_stale) for a fresh or stale entry, None once it is past max staleness."""
+        return self._lookup(key, allow_stale=True)
+
+    def _lookup(self, key: Hashable, allow_stale: bool) -> Optional[Tuple[Any, bool]]:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            stale = False
+            if entry is not None and entry.expires_at:
+                now = time.monotonic()
+                if entry.expires_at + self.max_stale_seconds <= now:
+                    self._remove(stripe, key)
+                    entry = None
+                    stripe.counters['expirations'] += 1
+                else:
+                    stale = entry.expires_at <= now
+            if entry is None or (stale and not allow_stale):
+                stripe.counters['misses'] += 1
+                return None
+            stripe.entries.move_to_end(key)
+            stripe.counters['stale_hits' if stale else 'hits'] += 1
+        return entry.value, stale
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """`ttl_seconds` overrides the cache's TTL for this entry; 0 never expires."""
+        size = approximate_size(value)
+        if self._stripe_max_bytes and size > self._stripe_max_bytes:
+            return
+        ttl_seconds = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else 0
+
+        stripe = self._stripe(key)
+        with stripe.lock:
+            if key in stripe.entries:
+                self._remove(stripe, key)
+            stripe.entries[key] = _Entry(value, size, expires_at)
+            stripe.bytes += size
+            while ((self._stripe_max_entries and len(stripe.entries) > self._stripe_max_entries) or
+                   (self._stripe_max_bytes and stripe.bytes > self._stripe_max_bytes)):
+                self._remove(stripe, next(iter(stripe.entries)))
+                stripe.counters['evictions'] += 1
+
+    def delete(self, key: Hashable) -> None:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            if key in stripe.entries:
+                self._remove(stripe, key)
+
+    def clear(self) -> None:
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+                stripe.bytes = 0
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    def stats(self) -> Dict[str, int]:
+        stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'entries': 0, 'bytes': 0}
+        for stripe in self._stripes:
+            with stripe.lock:
+                for counter, value in stripe.counters.items():
+                    stats[counter] += value
+                stats['entries'] += len(stripe.entries)
+                stats['bytes'] += stripe.bytes
+        return stats
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    @staticmethod
+    def _remove(stripe: _Stripe, key: Hashable) -> None:
+        stripe.bytes -= stripe.entries.pop(key).size
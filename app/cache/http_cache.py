@@ -0,0 +1,76 @@
+import time
+from typing import Dict, NamedTuple, Optional
+
+from app.cache.sqlite_store import SQLiteStore
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class DiskHTTPCache(SQLiteStore):
+    """
+    Response bodies with their ETag/Last-Modified validators in a SQLite file (WAL mode),
+    so every gunicorn worker on the host shares it and restarts start warm.
+    Entries are evicted least-recently-used once the stored bodies exceed `max_bytes`.
+    """
+
+    ACCESS_RESOLUTION_SECONDS = 60
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024, freshness_seconds: float = 86400):
+        super().__init__(path, max_bytes, table='responses',
+                         columns='url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, '
+                                 'size INTEGER NOT NULL, stored_at REAL NOT NULL, last_access REAL NOT NULL',
+                         evict_order='last_access', counters=('fresh_hits', 'revalidated', 'misses'))
+        self.freshness_seconds = freshness_seconds
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        row = self._connection().execute(
+            'SELECT body, etag, last_modified, stored_at, last_access FROM responses WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            self._count('misses')
+            return None
+
+        body, etag, last_modified, stored_at, last_access = row
+        now = time.time()
+        if now - last_access > self.ACCESS_RESOLUTION_SECONDS:
+            self._connection().execute('UPDATE responses SET last_access = ? WHERE url = ?', (now, url))
+        return CachedResponse(body, etag, last_modified, stored_at)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.freshness_seconds
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, body: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO responses (url, body, etag, last_modified, size, stored_at, last_access) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (url, body, etag, last_modified, len(body), now, now)
+        )
+        self._evict(connection)
+
+    def mark_revalidated(self, url: str) -> None:
+        """Restart the freshness window after a 304 Not Modified."""
+        now = time.time()
+        self._connection().execute('UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?',
+                                    (now, now, url))
+        self._count('revalidated')
+
+    def record_fresh_hit(self) -> None:
+        self._count('fresh_hits')
@@ -0,0 +1,49 @@
+import os
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from typing import Dict, Optional
+
+
+class PokemonNameIndex:
+    """
+    Pokemon name -> numeric id index persisted in a local SQLite file, so workers can load it
+    instead of paging through the PokeAPI listing on every boot.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Dict[str, int]:
+        if not os.path.exists(self.path):
+            return {}
+        with closing(self._connect()) as connection:
+            return {sys.intern(name): pokemon_id
+                    for name, pokemon_id in connection.execute('SELECT name, pokemon_id FROM pokemon_names')}
+
+    def save(self, ids: Dict[str, int]) -> None:
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute('DELETE FROM pokemon_names')
+                connection.executemany('INSERT INTO pokemon_names (name, pokemon_id) VALUES (?, ?)', ids.items())
+                connection.execute("INSERT OR REPLACE INTO index_meta (key, value) VALUES ('refreshed_at', ?)",
+                                   (time.time(),))
+
+    def age(self) -> Optional[float]:
+        """Seconds since the index was last saved, or None when it was never saved."""
+        if not os.path.exists(self.path):
+            return None
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT value FROM index_meta WHERE key = 'refreshed_at'").fetchone()
+        return time.time() - row[0] if row else None
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS pokemon_names (name TEXT PRIMARY KEY, pokemon_id INTEGER NOT NULL)')
+        connection.execute('CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value REAL NOT NULL)')
+        return connection
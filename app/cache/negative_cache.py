@@ -0,0 +1,25 @@
+from typing import Dict
+
+from app.cache.bounded_cache import BoundedCache
+
+POKEMON = 'pokemon'
+MOVE = 'move'
+
+
+class NegativeCache:
+    """
+    Remembers names PokeAPI does not know for a short TTL, so repeated typos and bot traffic
+    are rejected without another upstream call.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300):
+        self._cache = BoundedCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    def is_missing(self, kind: str, name: str) -> bool:
+        return self._cache.get((kind, name.lower())) is not None
+
+    def mark_missing(self, kind: str, name: str) -> None:
+        self._cache.set((kind, name.lower()), True)
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
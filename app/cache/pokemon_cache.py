@@ -1,24 +1,120 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.cache.bounded_cache import BoundedCache
+from app.cache.records import MoveRecord, SpeciesRecord
+from app.cache.shared_cache import SharedCacheBackend
+from app.config import Config
+from app.models import PokemonData
+
+URL_MAPPING_KEY = 'pokemon_url_mapping'
+
+
 class PokemonCacheManager:
+    """
+    Per-process cache of species, moves and the name index. Each namespace is a
+    bounded, lock-striped LRU with its own TTL (see the CACHE_* settings).
+    Species and moves missing from this L1 are looked up in the optional host-wide
+    `shared_cache` (L2), which also receives every write. Species and moves are stored as
+    compact SpeciesRecord/MoveRecord values; the API services hand species out as SpeciesRecord,
+    and PokemonService converts to PokemonData at the API boundary.
+    Values written with `pinned=True` (a snapshot import) never expire in either level; they
+    only leave by LRU or size eviction, or when a fetch replaces them.
+    """
     _instance = None
-    _cache = {}
+    shared_cache: Optional[SharedCacheBackend] = None
+    SHARED_NAMESPACES = ('pokemon', 'move')
 
     def __new__(cls, *args, **kwargs):
         if not cls._instance:
             cls._instance = super(PokemonCacheManager, cls).__new__(cls)
+            cls._instance._namespaces = {
+                'pokemon': BoundedCache(max_entries=Config.CACHE_POKEMON_MAX_ENTRIES,
+                                        max_bytes=Config.CACHE_POKEMON_MAX_BYTES,
+                                        ttl_seconds=Config.CACHE_POKEMON_TTL_SECONDS,
+                                        max_stale_seconds=Config.CACHE_MAX_STALE_SECONDS,
+                                        stripes=Config.CACHE_LOCK_STRIPES),
+                'move': BoundedCache(max_entries=Config.CACHE_MOVE_MAX_ENTRIES,
+                                     max_bytes=Config.CACHE_MOVE_MAX_BYTES,
+                                     ttl_seconds=Config.CACHE_MOVE_TTL_SECONDS,
+                                     max_stale_seconds=Config.CACHE_MAX_STALE_SECONDS,
+                                     stripes=Config.CACHE_LOCK_STRIPES),
+                'url_mapping': BoundedCache(ttl_seconds=Config.CACHE_URL_MAPPING_TTL_SECONDS, stripes=1)
+            }
+            cls._instance._move_listeners = []
         return cls._instance
 
+    def __init__(self, shared_cache: Optional[SharedCacheBackend] = None):
+        if shared_cache is not None:
+            self.shared_cache = shared_cache
+
     def get_pokemon_data(self, pokemon_name: str):
         pokemon_name = pokemon_name.lower()
-        return self._cache.get(f'pokemon_{pokemon_name}')
+        return self._get(self._namespace_for(pokemon_name), pokemon_name)
+
+    def set_pokemon_data(self, pokemon_name: str, data: dict, pinned: bool = False):
+        pokemon_name = pokemon_name.lower()
+        if isinstance(data, PokemonData):
+            data = SpeciesRecord.from_pokemon_data(data)
+        self._set(self._namespace_for(pokemon_name), pokemon_name, data, pinned)
 
-    def set_pokemon_data(self, pokemon_name: str, data: dict):
+    def get_pokemon_entry(self, pokemon_name: str) -> Optional[Tuple[Any, bool]]:
+        """(data, is_stale) including entries past their TTL but within CACHE_MAX_STALE_SECONDS."""
         pokemon_name = pokemon_name.lower()
-        self._cache[f'pokemon_{pokemon_name}'] = data
+        return self._get_entry(self._namespace_for(pokemon_name), pokemon_name)
 
     def get_move_data(self, move_name: str) -> dict:
         move_name = move_name.lower()
-        return self._cache.get(f'move_{move_name}')
+        return self._get('move', move_name)
+
+    def get_move_entry(self, move_name: str) -> Optional[Tuple[Any, bool]]:
+        move_name = move_name.lower()
+        return self._get_entry('move', move_name)
 
-    def set_move_data(self, move_name: str, data: dict):
+    def set_move_data(self, move_name: str, data: dict, pinned: bool = False):
         move_name = move_name.lower()
-        self._cache[f'move_{move_name}'] = data
+        if isinstance(data, dict):
+            data = MoveRecord.from_dict(data)
+        self._set('move', move_name, data, pinned)
+        for listener in self._move_listeners:
+            listener(move_name)
+
+    def add_move_listener(self, listener: Callable[[str], None]) -> None:
+        """`listener(move_name)` runs after every write of a move, including background refreshes."""
+        self._move_listeners.append(listener)
+
+    def clear(self) -> None:
+        for namespace in self._namespaces.values():
+            namespace.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        stats = {name: namespace.stats() for name, namespace in self._namespaces.items()}
+        if self.shared_cache is not None:
+            stats['shared'] = self.shared_cache.stats()
+        return stats
+
+    def _get(self, namespace: str, key: str) -> Any:
+        cache = self._namespaces[namespace]
+        value = cache.get(key)
+        if value is None and self.shared_cache is not None and namespace in self.SHARED_NAMESPACES:
+            value = self.shared_cache.get(namespace, key)
+            if value is not None:
+                cache.set(key, value)
+        return value
+
+    def _get_entry(self, namespace: str, key: str) -> Optional[Tuple[Any, bool]]:
+        entry = self._namespaces[namespace].get_entry(key)
+        if entry is not None:
+            return entry
+        value = self._get(namespace, key)
+        return (value, False) if value is not None else None
+
+    def _set(self, namespace: str, key: str, value: Any, pinned: bool = False) -> None:
+        cache = self._namespaces[namespace]
+        ttl_seconds = 0 if pinned else cache.ttl_seconds
+        cache.set(key, value, ttl_seconds=ttl_seconds)
+        if self.shared_cache is not None and namespace in self.SHARED_NAMESPACES:
+            self.shared_cache.set(namespace, key, value, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def _namespace_for(pokemon_name: str) -> str:
+        return 'url_mapping' if pokemon_name == URL_MAPPING_KEY else 'pokemon'
@@ -0,0 +1,81 @@
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+from app.models import PokemonData
+
+STAT_NAMES = ('hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed')
+MOVE_FIELDS = ('name', 'power', 'type', 'damage_class')
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class SpeciesRecord(NamedTuple):
+    """
+    Immutable cache form of PokemonData: interned names and the six base stats as a
+    fixed-width array in STAT_NAMES order. `stats` rebuilds the PokemonData-style dict.
+    """
+    id: int
+    name: str
+    types: Tuple[str, ...]
+    moves: Tuple[str, ...]
+    base_stats: array
+
+    @classmethod
+    def from_pokemon_data(cls, data: PokemonData) -> 'SpeciesRecord':
+        return cls(
+            id=data.id,
+            name=_intern(data.name),
+            types=tuple(map(_intern, data.types)),
+            moves=tuple(map(_intern, data.moves)),
+            base_stats=array('H', (data.stats.get(stat, 0) for stat in STAT_NAMES))
+        )
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(zip(STAT_NAMES, self.base_stats))
+
+    def to_pokemon_data(self) -> PokemonData:
+        return PokemonData(id=self.id, name=self.name, stats=self.stats, types=list(self.types),
+                           moves=list(self.moves))
+
+
+class MoveRecord(Mapping):
+    """Immutable, slotted cache form of the simplified move dict; still reads (and compares) like one."""
+    __slots__ = MOVE_FIELDS
+
+    def __init__(self, name: str, power: Optional[int], type: Optional[str], damage_class: Optional[str]):
+        object.__setattr__(self, 'name', _intern(name))
+        object.__setattr__(self, 'power', power)
+        object.__setattr__(self, 'type', _intern(type))
+        object.__setattr__(self, 'damage_class', _intern(damage_class))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MoveRecord':
+        return cls(*(data.get(field) for field in MOVE_FIELDS))
+
+    def __getitem__(self, key: str):
+        if key not in MOVE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(MOVE_FIELDS)
+
+    def __len__(self) -> int:
+        return len(MOVE_FIELDS)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("MoveRecord is immutable")
+
+    def __hash__(self) -> int:
+        return hash(tuple(self.values()))
+
+    def __reduce__(self):
+        return MoveRecord, tuple(self.values())
+
+    def __repr__(self) -> str:
+        return f"MoveRecord({dict(self)!r})"
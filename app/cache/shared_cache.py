@@ -0,0 +1,63 @@
+import pickle
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from app.cache.sqlite_store import SQLiteStore
+
+
+class SharedCacheBackend(ABC):
+    """Second-level cache shared by every worker process on a host."""
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Any:
+        """The stored value, or None when it is missing or expired."""
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float = 0) -> None:
+        """Store `value`; a `ttl_seconds` of 0 never expires."""
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class SQLiteCacheBackend(SQLiteStore, SharedCacheBackend):
+    """
+    Pickled values in a SQLite file in WAL mode, so readers in other workers never block on a writer.
+    Once the stored values exceed `max_bytes`, expired ones and then the oldest ones are dropped.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__(path, max_bytes, table='entries',
+                         columns='namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, '
+                                 'size INTEGER NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL, '
+                                 'PRIMARY KEY (namespace, key)',
+                         evict_order='stored_at', indexes=('expires_at',), counters=('hits', 'misses'))
+
+    def get(self, namespace: str, key: str) -> Any:
+        row = self._connection().execute(
+            'SELECT value, expires_at FROM entries WHERE namespace = ? AND key = ?', (namespace, key)
+        ).fetchone()
+        if row is None or (row[1] and row[1] <= time.time()):
+            self._count('misses')
+            return None
+        self._count('hits')
+        return pickle.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl_seconds: float = 0) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO entries (namespace, key, value, size, stored_at, expires_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (namespace, key, payload, len(payload), now, now + ttl_seconds if ttl_seconds else 0)
+        )
+        self._evict(connection)
+
+    def _delete_expired(self, connection: sqlite3.Connection) -> int:
+        return connection.execute('DELETE FROM entries WHERE expires_at > 0 AND expires_at <= ?',
+                                  (time.time(),)).rowcount
@@ -0,0 +1,93 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable
+
+
+class SQLiteStore:
+    """
+    A size-bounded table in a SQLite file shared by every worker process on a host, in WAL mode so
+    readers never block on a writer. Rows carry their `size`; triggers keep the table's total in a
+    one-row `<table>_size` table, so checking `max_bytes` after a write does not scan the table.
+    Over the limit, rows are dropped in `evict_order` until the total fits again.
+    """
+
+    def __init__(self, path: str, max_bytes: int, table: str, columns: str, evict_order: str,
+                 indexes: Iterable[str] = (), counters: Iterable[str] = ()):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.table = table
+        self.evict_order = evict_order
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = dict.fromkeys((*counters, 'evictions'), 0)
+
+        connection = self._connection()
+        # One transaction, so a worker starting at the same time cannot seed the total twice
+        # or write a row between the seed and the triggers.
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS {table} ({columns})')
+            for column in (evict_order, *indexes):
+                connection.execute(f'CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ({column})')
+            connection.execute(f'CREATE TABLE IF NOT EXISTS {table}_size (bytes INTEGER NOT NULL)')
+            connection.execute(f'INSERT INTO {table}_size SELECT COALESCE(SUM(size), 0) FROM {table} '
+                               f'WHERE NOT EXISTS (SELECT 1 FROM {table}_size)')
+            for event, change in (('INSERT', 'NEW.size'), ('DELETE', '-OLD.size'),
+                                  ('UPDATE OF size', 'NEW.size - OLD.size')):
+                connection.execute(
+                    f'CREATE TRIGGER IF NOT EXISTS {table}_size_{event.split()[0].lower()} AFTER {event} ON {table} '
+                    f'BEGIN UPDATE {table}_size SET bytes = bytes + {change}; END'
+                )
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        connection = self._connection()
+        entries = connection.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        with self._stats_lock:
+            return dict(self._stats, bytes=self._stored_bytes(connection), entries=entries)
+
+    def _stored_bytes(self, connection: sqlite3.Connection) -> int:
+        return connection.execute(f'SELECT bytes FROM {self.table}_size').fetchone()[0]
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        if self._stored_bytes(connection) <= self.max_bytes:
+            return
+
+        evicted = self._delete_expired(connection)
+        to_free = self._stored_bytes(connection) - self.max_bytes
+        victims = []
+        for rowid, size in connection.execute(f'SELECT rowid, size FROM {self.table} ORDER BY {self.evict_order}'):
+            if to_free <= 0:
+                break
+            victims.append((rowid,))
+            to_free -= size
+        connection.executemany(f'DELETE FROM {self.table} WHERE rowid = ?', victims)
+        self._count('evictions', evicted + len(victims))
+
+    def _delete_expired(self, connection: sqlite3.Connection) -> int:
+        """Drop rows that are past their lifetime before evicting live ones; returns how many."""
+        return 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and per process: sqlite3 connections must not cross a fork.
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            # Rows replaced by INSERT OR REPLACE then fire the delete trigger that keeps the size total.
+            connection.execute('PRAGMA recursive_triggers=ON')
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[counter] += amount
@@ -13,3 +13,91 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     FLASK_ENV = os.getenv("FLASK_ENV", "development")
     DEBUG = FLASK_ENV == "development"
+
+    # Outgoing HTTP connection pool (one per worker process)
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", config_data["HTTP_POOL_CONNECTIONS"]))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", config_data["HTTP_POOL_MAXSIZE"]))
+    HTTP_HOST_POOL_SIZES = config_data["HTTP_HOST_POOL_SIZES"]
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", config_data["HTTP_CONNECT_TIMEOUT"]))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", config_data["HTTP_READ_TIMEOUT"]))
+    HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", config_data["HTTP_MAX_RETRIES"]))
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", config_data["HTTP_BACKOFF_FACTOR"]))
+    HTTP_BACKOFF_JITTER = float(os.getenv("HTTP_BACKOFF_JITTER", config_data["HTTP_BACKOFF_JITTER"]))
+
+    # Resolve both battle Pokémon and their moves concurrently before simulating
+    POKEAPI_ASYNC_FETCH = os.getenv("POKEAPI_ASYNC_FETCH", str(config_data["POKEAPI_ASYNC_FETCH"])).lower() == "true"
+
+    # Local PokeAPI dump used to warm caches at startup (empty disables)
+    POKEAPI_SNAPSHOT_DIR = os.getenv("POKEAPI_SNAPSHOT_DIR", config_data["POKEAPI_SNAPSHOT_DIR"])
+    SNAPSHOT_IMPORT_WORKERS = int(os.getenv("SNAPSHOT_IMPORT_WORKERS", config_data["SNAPSHOT_IMPORT_WORKERS"]))
+    SNAPSHOT_IMPORT_BATCH_SIZE = int(os.getenv("SNAPSHOT_IMPORT_BATCH_SIZE", config_data["SNAPSHOT_IMPORT_BATCH_SIZE"]))
+
+    # Disk-backed conditional HTTP cache shared by all workers on a host (empty path disables)
+    HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", config_data["HTTP_CACHE_PATH"])
+    HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", config_data["HTTP_CACHE_MAX_BYTES"]))
+    HTTP_CACHE_FRESHNESS_SECONDS = float(os.getenv("HTTP_CACHE_FRESHNESS_SECONDS",
+                                                   config_data["HTTP_CACHE_FRESHNESS_SECONDS"]))
+
+    # Persisted Pokemon name -> id index used by PokemonURLMapper
+    POKEMON_INDEX_PATH = os.getenv("POKEMON_INDEX_PATH", config_data["POKEMON_INDEX_PATH"])
+    POKEMON_INDEX_REFRESH_SECONDS = float(os.getenv("POKEMON_INDEX_REFRESH_SECONDS",
+                                                    config_data["POKEMON_INDEX_REFRESH_SECONDS"]))
+
+    # In-process PokemonCacheManager: bounded LRU per namespace (0 disables a limit or TTL)
+    CACHE_LOCK_STRIPES = int(os.getenv("CACHE_LOCK_STRIPES", config_data["CACHE_LOCK_STRIPES"]))
+    CACHE_POKEMON_MAX_ENTRIES = int(os.getenv("CACHE_POKEMON_MAX_ENTRIES", config_data["CACHE_POKEMON_MAX_ENTRIES"]))
+    CACHE_POKEMON_MAX_BYTES = int(os.getenv("CACHE_POKEMON_MAX_BYTES", config_data["CACHE_POKEMON_MAX_BYTES"]))
+    CACHE_POKEMON_TTL_SECONDS = float(os.getenv("CACHE_POKEMON_TTL_SECONDS", config_data["CACHE_POKEMON_TTL_SECONDS"]))
+    CACHE_MOVE_MAX_ENTRIES = int(os.getenv("CACHE_MOVE_MAX_ENTRIES", config_data["CACHE_MOVE_MAX_ENTRIES"]))
+    CACHE_MOVE_MAX_BYTES = int(os.getenv("CACHE_MOVE_MAX_BYTES", config_data["CACHE_MOVE_MAX_BYTES"]))
+    CACHE_MOVE_TTL_SECONDS = float(os.getenv("CACHE_MOVE_TTL_SECONDS", config_data["CACHE_MOVE_TTL_SECONDS"]))
+    CACHE_URL_MAPPING_TTL_SECONDS = float(os.getenv("CACHE_URL_MAPPING_TTL_SECONDS",
+                                                    config_data["CACHE_URL_MAPPING_TTL_SECONDS"]))
+
+    # Host-wide L2 behind PokemonCacheManager, shared by all gunicorn workers (empty path disables)
+    SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", config_data["SHARED_CACHE_PATH"])
+    SHARED_CACHE_MAX_BYTES = int(os.getenv("SHARED_CACHE_MAX_BYTES", config_data["SHARED_CACHE_MAX_BYTES"]))
+
+    # Unknown Pokemon/move names remembered to skip repeated upstream 404s
+    NEGATIVE_CACHE_MAX_ENTRIES = int(os.getenv("NEGATIVE_CACHE_MAX_ENTRIES", config_data["NEGATIVE_CACHE_MAX_ENTRIES"]))
+    NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", config_data["NEGATIVE_CACHE_TTL_SECONDS"]))
+
+    # Stale-while-revalidate: expired species/moves are served for up to CACHE_MAX_STALE_SECONDS
+    # while a bounded background pool refreshes them (0 disables)
+    CACHE_MAX_STALE_SECONDS = float(os.getenv("CACHE_MAX_STALE_SECONDS", config_data["CACHE_MAX_STALE_SECONDS"]))
+    CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", config_data["CACHE_REFRESH_WORKERS"]))
+    CACHE_REFRESH_MAX_PENDING = int(os.getenv("CACHE_REFRESH_MAX_PENDING", config_data["CACHE_REFRESH_MAX_PENDING"]))
+
+    # Battle resolution: "analytic" (closed form) or "iterative" (turn by turn), with a runaway budget
+    BATTLE_RESOLUTION = os.getenv("BATTLE_RESOLUTION", config_data["BATTLE_RESOLUTION"])
+    BATTLE_MAX_TURNS = int(os.getenv("BATTLE_MAX_TURNS", config_data["BATTLE_MAX_TURNS"]))
+    BATTLE_MAX_SECONDS = float(os.getenv("BATTLE_MAX_SECONDS", config_data["BATTLE_MAX_SECONDS"]))
+    # Move choice: "first" (first stored move) or "best" (highest expected damage against the defender
+    # out of the stored learnset); POKEMON_MOVES_LIMIT moves are kept per species, 0 keeps the whole learnset
+    MOVE_SELECTION = os.getenv("MOVE_SELECTION", config_data["MOVE_SELECTION"])
+    POKEMON_MOVES_LIMIT = int(os.getenv("POKEMON_MOVES_LIMIT", config_data["POKEMON_MOVES_LIMIT"]))
+
+    # Memoized deterministic battle results, keyed by matchup, data fingerprint and rule version (0 disables)
+    BATTLE_RESULT_CACHE_MAX_ENTRIES = int(os.getenv("BATTLE_RESULT_CACHE_MAX_ENTRIES",
+                                                    config_data["BATTLE_RESULT_CACHE_MAX_ENTRIES"]))
+    BATTLE_RESULT_CACHE_MAX_BYTES = int(os.getenv("BATTLE_RESULT_CACHE_MAX_BYTES",
+                                                  config_data["BATTLE_RESULT_CACHE_MAX_BYTES"]))
+
+    # Largest roster accepted by POST /api/tournaments
+    TOURNAMENT_MAX_ROSTER = int(os.getenv("TOURNAMENT_MAX_ROSTER", config_data["TOURNAMENT_MAX_ROSTER"]))
+
+    # Monte Carlo win probabilities (POST /api/simulations): trials run in chunks of SIMULATION_CHUNK_TRIALS,
+    # spread over SIMULATION_WORKERS processes when there is more than one chunk (0 runs them in-process)
+    SIMULATION_MAX_TRIALS = int(os.getenv("SIMULATION_MAX_TRIALS", config_data["SIMULATION_MAX_TRIALS"]))
+    SIMULATION_CHUNK_TRIALS = int(os.getenv("SIMULATION_CHUNK_TRIALS", config_data["SIMULATION_CHUNK_TRIALS"]))
+    SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", config_data["SIMULATION_WORKERS"]))
+
+    # Write-behind battle persistence: rows are queued and bulk-inserted every BATTLE_WRITE_BATCH_SIZE rows
+    # or BATTLE_WRITE_FLUSH_MS; a full queue blocks the request up to BATTLE_WRITE_PUT_TIMEOUT_SECONDS,
+    # then the row is written inline
+    BATTLE_WRITE_BEHIND = os.getenv("BATTLE_WRITE_BEHIND", str(config_data["BATTLE_WRITE_BEHIND"])).lower() == "true"
+    BATTLE_WRITE_QUEUE_SIZE = int(os.getenv("BATTLE_WRITE_QUEUE_SIZE", config_data["BATTLE_WRITE_QUEUE_SIZE"]))
+    BATTLE_WRITE_BATCH_SIZE = int(os.getenv("BATTLE_WRITE_BATCH_SIZE", config_data["BATTLE_WRITE_BATCH_SIZE"]))
+    BATTLE_WRITE_FLUSH_MS = int(os.getenv("BATTLE_WRITE_FLUSH_MS", config_data["BATTLE_WRITE_FLUSH_MS"]))
+    BATTLE_WRITE_PUT_TIMEOUT_SECONDS = float(os.getenv("BATTLE_WRITE_PUT_TIMEOUT_SECONDS",
+                                                       config_data["BATTLE_WRITE_PUT_TIMEOUT_SECONDS"]))
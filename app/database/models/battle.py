@@ -1,7 +1,16 @@
 from typing import List
 
+from app.battle_logic.battle_record import BattleRecord
 from app.database import db
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Integer, LargeBinary, String, Text
+
+class RecordBlob(LargeBinary):
+    """LargeBinary bound as the bytes it is given; DB-API drivers take bytes, so skip the per-row Binary() copy."""
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        return None
+
 
 class Battle(db.Model):
     __tablename__ = 'battles'
@@ -10,12 +19,20 @@ class Battle(db.Model):
     pokemon1_id = Column(Integer, nullable=False)
     pokemon2_id = Column(Integer, nullable=False)
     winner = Column(String(50), nullable=False)
-    battle_log = Column(Text, nullable=False)
+    # Text logs of rows written before battle_record; empty for new rows
+    battle_log = Column(Text, nullable=False, default='')
+    battle_record = Column(RecordBlob, nullable=True)
 
     def set_battle_log(self, log_list: List[str]):
         """Convert list of log entries to string"""
         self.battle_log = '\n'.join(log_list)
 
+    def set_battle_record(self, record: BattleRecord):
+        self.battle_record = record.encode()
+        self.battle_log = ''
+
     def get_battle_log(self) -> List[str]:
-        """Convert stored string back to list"""
-        return self.battle_log.split('\n') if self.battle_log else []
\ No newline at end of file
+        """Render the stored record back to log lines, or split a legacy text log"""
+        if self.battle_record is not None:
+            return list(BattleRecord.decode(self.battle_record).iter_log())
+        return self.battle_log.split('\n') if self.battle_log else []
@@ -5,7 +5,8 @@ class Pokemon(db.Model):
     __tablename__ = 'pokemon'
 
     id = Column(Integer, primary_key=True)
-    name = Column(String(50), nullable=False)
+    # Normalized with PokemonRepository.normalize_name; the unique index makes lookups and upserts O(log n)
+    name = Column(String(50), nullable=False, unique=True, index=True)
     hp = Column(Integer, nullable=False)
     attack = Column(Integer, nullable=False)
     defense = Column(Integer, nullable=False)
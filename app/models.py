@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from pydantic import BaseModel, Field
 
@@ -71,10 +71,56 @@ class BattleRequest(BaseModel):
     pokemon1: str
     pokemon2: str
 
+class BattleLogMode(str, Enum):
+    NONE = "none"
+    SUMMARY = "summary"
+    FULL = "full"
+
 class BattleResult(BaseModel):
     winner: str
     battle_log: List[str]
 
+class BattleSummary(BaseModel):
+    winner: str
+    turns: int
+    pokemon1: str
+    pokemon2: str
+    pokemon1_hp: int
+    pokemon2_hp: int
+
+class SimulationRequest(BaseModel):
+    pokemon1: str
+    pokemon2: str
+    trials: int = 10000
+    seed: Optional[int] = None
+
+class SimulationResult(BaseModel):
+    pokemon1: str
+    pokemon2: str
+    trials: int
+    seed: int
+    wins1: int
+    wins2: int
+    draws: int
+    # Probability that pokemon1 wins, with its 95% Wilson score interval
+    win_probability: float
+    confidence_interval: List[float]
+
+class TournamentRequest(BaseModel):
+    pokemon: List[str]
+
+class TournamentStanding(BaseModel):
+    name: str
+    wins: int
+    losses: int
+    draws: int
+
+class TournamentResult(BaseModel):
+    pokemon: List[str]
+    # win_matrix[i][j]: games pokemon[i] won against pokemon[j] (each pair plays twice, alternating who attacks first)
+    win_matrix: List[List[int]]
+    standings: List[TournamentStanding]
+
 
 class Pokemon(BaseModel):
     id: int
@@ -87,6 +133,8 @@ class Pokemon(BaseModel):
     speed: int
     types: List[str]
     moves: List[str]
+    # Pre-resolved TypeEffectiveness defender column for `types`
+    type_index: Optional[int] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -1,13 +1,36 @@
-from typing import List
+from typing import Optional
 
+import sqlalchemy as sa
+
+from app.battle_logic.battle_record import BattleRecord
 from app.database import db
 from app.database.models import Battle
+from app.repositories.battle_writer import BattleWriteBehind
 
 
 class BattleRepository:
+    # Set by create_app when BATTLE_WRITE_BEHIND is enabled
+    write_behind: Optional[BattleWriteBehind] = None
+
     @staticmethod
-    def create_battle(pokemon1_id: int, pokemon2_id: int, winner: str, battle_log: List[str]):
+    def create_battle(pokemon1_id: int, pokemon2_id: int, winner: str, battle_record: BattleRecord):
+        if BattleRepository.write_behind is not None:
+            BattleRepository.write_behind.submit({'pokemon1_id': pokemon1_id, 'pokemon2_id': pokemon2_id,
+                                                  'winner': winner, 'battle_log': '',
+                                                  'battle_record': battle_record.encode()})
+            return
+
         battle = Battle(pokemon1_id=pokemon1_id, pokemon2_id=pokemon2_id, winner=winner)
-        battle.set_battle_log(battle_log)
+        battle.set_battle_record(battle_record)
         db.session.add(battle)
         db.session.commit()
+
+    @staticmethod
+    def ensure_record_column() -> None:
+        """Add the battle_record column to a battles table created before it existed. No-op once it is there."""
+        columns = {column['name'] for column in sa.inspect(db.engine).get_columns(Battle.__tablename__)}
+        if 'battle_record' in columns:
+            return
+        column_type = Battle.__table__.c.battle_record.type.compile(db.engine.dialect)
+        with db.engine.begin() as connection:
+            connection.execute(sa.text(f'ALTER TABLE {Battle.__tablename__} ADD COLUMN battle_record {column_type}'))
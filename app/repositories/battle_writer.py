@@ -0,0 +1,155 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import sqlalchemy as sa
+from flask import Flask
+
+from app.database import db
+from app.database.models import Battle
+
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class BattleWriteBehind:
+    """
+    Takes battle rows off the request path: rows wait in a bounded queue and a background thread
+    writes them with one bulk INSERT per `batch_size` rows or `flush_interval` seconds after the
+    first row of a batch, whichever comes first. When the queue is full a caller waits up to
+    `put_timeout` seconds and then writes its row itself, so rows are never dropped for lack of
+    room. A failed bulk INSERT is logged and retried row by row; only rows the database rejects
+    on their own are dropped, logged and counted as failed. Rows written inline raise as before.
+    `close`, also run at exit, drains the queue. The thread starts on first use, again in forked workers.
+    """
+
+    def __init__(self, app: Flask, max_queue: int = 10000, batch_size: int = 500, flush_interval: float = 0.2,
+                 put_timeout: float = 1.0):
+        self.app = app
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._lock = threading.Lock()
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._closed = False
+        self._stats = {'queued': 0, 'written': 0, 'batches': 0, 'blocked': 0, 'direct': 0, 'failed': 0}
+        atexit.register(self.close)
+
+    def submit(self, row: Dict[str, object]) -> None:
+        rows = self._get_queue()
+        if rows is None:
+            self._insert([row])
+            return
+        try:
+            rows.put_nowait(row)
+        except queue.Full:
+            self._count('blocked')
+            try:
+                rows.put(row, timeout=self.put_timeout)
+            except queue.Full:
+                self._count('direct')
+                self._insert([row])
+                return
+        self._count('queued')
+
+    def flush(self) -> None:
+        """Block until every row queued so far is written."""
+        with self._lock:
+            rows = self._queue if self._pid == os.getpid() else None
+        if rows is not None:
+            rows.join()
+
+    def close(self, timeout: float = 10) -> None:
+        with self._lock:
+            self._closed = True
+            rows, thread = (self._queue, self._thread) if self._pid == os.getpid() else (None, None)
+        if thread is not None and thread.is_alive():
+            rows.put(_STOP)
+            thread.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            pending = self._queue.qsize() if self._queue is not None and self._pid == os.getpid() else 0
+            return dict(self._stats, pending=pending)
+
+    def _get_queue(self) -> Optional[queue.Queue]:
+        with self._lock:
+            if self._closed:
+                return None
+            pid = os.getpid()
+            if self._thread is None or self._pid != pid:
+                # A queue or thread inherited through fork belongs to the parent.
+                self._queue = queue.Queue(maxsize=self.max_queue)
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name='battle-writer',
+                                                daemon=True)
+                self._pid = pid
+                self._thread.start()
+            return self._queue
+
+    def _run(self, rows: queue.Queue) -> None:
+        while True:
+            batch, stop = self._next_batch(rows)
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + stop):
+                rows.task_done()
+            if stop:
+                return
+
+    def _next_batch(self, rows: queue.Queue):
+        batch: List[Dict[str, object]] = []
+        row = rows.get()
+        deadline = time.monotonic() + self.flush_interval
+        while row is not _STOP:
+            batch.append(row)
+            remaining = deadline - time.monotonic()
+            if len(batch) >= self.batch_size or remaining <= 0:
+                return batch, False
+            try:
+                row = rows.get(timeout=remaining)
+            except queue.Empty:
+                return batch, False
+        return batch, True
+
+    def _write(self, batch: List[Dict[str, object]]) -> None:
+        try:
+            self._insert(batch)
+        except Exception:
+            if len(batch) == 1:
+                self._drop(batch[0])
+                return
+            logger.exception("Bulk insert of %d battles failed, retrying them one at a time", len(batch))
+            for row in batch:
+                try:
+                    self._insert([row])
+                except Exception:
+                    self._drop(row)
+            return
+        self._count('batches')
+
+    def _insert(self, rows: List[Dict[str, object]]) -> None:
+        with self.app.app_context():
+            try:
+                db.session.execute(sa.insert(Battle), rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+        self._count('written', len(rows))
+
+    def _drop(self, row: Dict[str, object]) -> None:
+        logger.exception("Dropping battle %s vs %s (winner %s)", row.get('pokemon1_id'), row.get('pokemon2_id'),
+                         row.get('winner'))
+        self._count('failed')
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[counter] += amount
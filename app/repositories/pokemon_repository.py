@@ -1,47 +1,54 @@
 # app/repositories/pokemon_repository.py
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
 from app.database import db
 from app.database.models import Pokemon
-from app.models import PokemonInfo
+from app.models import PokemonInfo, PokemonData
+
+# Columns an upsert overwrites; `name` is the conflict key.
+UPSERT_COLUMNS = ('hp', 'attack', 'defense', 'special_attack', 'special_defense', 'speed', 'type1', 'type2')
 
 
 class PokemonRepository:
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        return name.strip().lower()
+
     def get_pokemon_by_name(self, name: str) -> Optional[PokemonInfo]:
         """
         Retrieve a Pokemon by name from the database.
         If not found, returns None.
         """
         pokemon = db.session.scalar(
-            sa.select(Pokemon).where(sa.func.lower(Pokemon.name) == name.lower())
+            sa.select(Pokemon).where(Pokemon.name == self.normalize_name(name))
         )
 
         if pokemon:
             return PokemonInfo.from_db_model(pokemon)
         return None
 
+    def get_many(self, names: Iterable[str], batch_size: int = 500) -> Dict[str, PokemonInfo]:
+        """
+        Retrieve the stored Pokemon among `names`, keyed by normalized name, with one indexed
+        IN query per `batch_size` names. Names that are not stored are absent from the result.
+        """
+        normalized = list(dict.fromkeys(map(self.normalize_name, names)))
+        found = {}
+        for start in range(0, len(normalized), batch_size):
+            for pokemon in db.session.scalars(
+                    sa.select(Pokemon).where(Pokemon.name.in_(normalized[start:start + batch_size]))):
+                found[pokemon.name] = PokemonInfo.from_db_model(pokemon)
+        return found
+
     def create_pokemon(self, name: str, types: List[str], stats: Dict[str, int]) -> PokemonInfo:
         """
         Create a new Pokemon in the database.
         """
-        # Ensure we have at least one type and at most two types
-        if not types:
-            raise ValueError("Pokemon must have at least one type")
-        if len(types) > 2:
-            raise ValueError("Pokemon cannot have more than two types")
+        self._validate_types(types)
 
         # Create new Pokemon instance
-        pokemon = Pokemon(
-            name=name.lower(),
-            hp=stats.get('hp', 0),
-            attack=stats.get('attack', 0),
-            defense=stats.get('defense', 0),
-            special_attack=stats.get('special-attack', 0),
-            special_defense=stats.get('special-defense', 0),
-            speed=stats.get('speed', 0),
-            type1=types[0],
-            type2=types[1] if len(types) > 1 else None
-        )
+        pokemon = Pokemon(**self._build_row(name, types, stats))
 
         db.session.add(pokemon)
         db.session.commit()
@@ -53,20 +60,101 @@ class PokemonRepository:
         Update an existing Pokemon in the database.
         If the Pokemon doesn't exist, creates it.
         """
+        return self.upsert_pokemon(name, types, stats)
+
+    def upsert_pokemon(self, name: str, types: List[str], stats: Dict[str, int]) -> PokemonInfo:
+        """
+        Insert or update a Pokemon with a single INSERT ... ON CONFLICT statement, so concurrent
+        first requests for the same name cannot create duplicates.
+        """
+        self._validate_types(types)
         pokemon = db.session.scalar(
-            sa.select(Pokemon).where(sa.func.lower(Pokemon.name) == name.lower())
+            self._upsert_statement([self._build_row(name, types, stats)]).returning(Pokemon),
+            execution_options={'populate_existing': True}
         )
+        db.session.commit()
 
-        if pokemon:
-            pokemon.hp = stats.get('hp', 0)
-            pokemon.attack = stats.get('attack', 0)
-            pokemon.defense = stats.get('defense', 0)
-            pokemon.special_attack = stats.get('special-attack', 0)
-            pokemon.special_defense = stats.get('special-defense', 0)
-            pokemon.speed = stats.get('speed', 0)
-            pokemon.type1 = types[0]
-            pokemon.type2 = types[1] if len(types) > 1 else None
-
-            db.session.commit()
-            return PokemonInfo.from_db_model(pokemon)
-        return self.create_pokemon(name, types, stats)
\ No newline at end of file
+        return PokemonInfo.from_db_model(pokemon)
+
+    def upsert_many(self, pokemon_data: List[PokemonData], batch_size: int = 500) -> int:
+        """
+        Insert or update Pokemon in batches of `batch_size` rows, one statement per batch.
+        Pokemon without one or two types are skipped. Returns the number of rows written.
+        """
+        rows = self._build_rows(pokemon_data)
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(self._upsert_statement(rows[start:start + batch_size]))
+        db.session.commit()
+
+        return len(rows)
+
+    def create_many(self, pokemon_data: List[PokemonData], batch_size: int = 500) -> int:
+        """
+        Bulk insert Pokemon that are not stored yet, in batches of `batch_size` rows.
+        Returns the number of inserted rows.
+        """
+        rows = self._build_rows(pokemon_data)
+        inserted = 0
+        for start in range(0, len(rows), batch_size):
+            result = db.session.execute(self._upsert_statement(rows[start:start + batch_size], update=False))
+            inserted += result.rowcount
+        db.session.commit()
+
+        return inserted
+
+    @staticmethod
+    def ensure_name_index() -> None:
+        """
+        Add the unique name index to a table created before it existed, first dropping duplicate
+        rows (the oldest row of each name is kept). No-op once the index is there.
+        """
+        name_index = next(index for index in Pokemon.__table__.indexes if index.unique)
+        if name_index.name in {index['name'] for index in sa.inspect(db.engine).get_indexes(Pokemon.__tablename__)}:
+            return
+        duplicates = sa.select(sa.func.min(Pokemon.id)).group_by(Pokemon.name)
+        db.session.execute(sa.delete(Pokemon).where(Pokemon.id.not_in(duplicates)))
+        db.session.commit()
+        name_index.create(db.engine)
+
+    @staticmethod
+    def _upsert_statement(rows: List[Dict], update: bool = True):
+        # ON CONFLICT is spelled the same by the SQLite and PostgreSQL dialects.
+        insert = postgresql.insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite.insert
+        statement = insert(Pokemon).values(rows)
+        if not update:
+            return statement.on_conflict_do_nothing(index_elements=[Pokemon.name])
+        return statement.on_conflict_do_update(
+            index_elements=[Pokemon.name],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS}
+        )
+
+    def _build_rows(self, pokemon_data: List[PokemonData]) -> List[Dict]:
+        rows = {}
+        for data in pokemon_data:
+            if 1 <= len(data.types) <= 2:
+                # A statement may not touch the same conflict key twice; the last one wins.
+                row = self._build_row(data.name, data.types, data.stats)
+                rows[row['name']] = row
+        return list(rows.values())
+
+    @staticmethod
+    def _validate_types(types: List[str]) -> None:
+        # Ensure we have at least one type and at most two types
+        if not types:
+            raise ValueError("Pokemon must have at least one type")
+        if len(types) > 2:
+            raise ValueError("Pokemon cannot have more than two types")
+
+    @staticmethod
+    def _build_row(name: str, types: List[str], stats: Dict[str, int]) -> Dict:
+        return {
+            'name': PokemonRepository.normalize_name(name),
+            'hp': stats.get('hp', 0),
+            'attack': stats.get('attack', 0),
+            'defense': stats.get('defense', 0),
+            'special_attack': stats.get('special-attack', 0),
+            'special_defense': stats.get('special-defense', 0),
+            'speed': stats.get('speed', 0),
+            'type1': types[0],
+            'type2': types[1] if len(types) > 1 else None
+        }
@@ -1,7 +1,9 @@
-from flask import Blueprint, request, jsonify
+import json
+
+from flask import Blueprint, Response, request, jsonify
 
 from app.exceptions import PokemonNotFoundException
-from app.models import BattleRequest
+from app.models import BattleLogMode, BattleRequest
 
 def create_battle_blueprint(battle_service):
     battle_bp = Blueprint('battle', __name__)
@@ -24,6 +26,15 @@ def create_battle_blueprint(battle_service):
             type: string
             required: true
             description: Name of the second Pokémon
+          - name: log
+            in: query
+            type: string
+            enum: [none, summary, full]
+            required: false
+            description: >
+              none returns the winner and an empty log, summary the winner, turns and remaining HP,
+              full streams the summary and then one log line per row as NDJSON.
+              Without it the whole log is returned in one JSON body.
         responses:
           200:
             description: Battle result with winner and battle log
@@ -55,11 +66,29 @@ def create_battle_blueprint(battle_service):
                   description: Battle events log
         """
         battle_request = BattleRequest(**request.json)
+        log_mode = request.args.get('log')
+        if log_mode is not None and log_mode not in {mode.value for mode in BattleLogMode}:
+            return jsonify({'error': f'Unknown log mode {log_mode}'}), 400
+
         try:
-            battle_result = battle_service.create_battle(battle_request.pokemon1, battle_request.pokemon2)
+            if log_mode is None:
+                battle_result = battle_service.create_battle(battle_request.pokemon1, battle_request.pokemon2)
+                return jsonify(battle_result.dict()), 201
+            summary, battle_log = battle_service.start_battle(battle_request.pokemon1, battle_request.pokemon2)
         except PokemonNotFoundException as e:
             return jsonify({'error': f'Pokemon {e.pokemon_name} not found'}), 404
 
-        return jsonify(battle_result.dict()), 201
+        if log_mode == BattleLogMode.NONE:
+            return jsonify({'winner': summary.winner, 'battle_log': []}), 201
+        if log_mode == BattleLogMode.SUMMARY:
+            return jsonify(summary.dict()), 201
+
+        def stream():
+            # The log is generated turn by turn as the client reads it.
+            yield json.dumps(summary.dict()) + '\n'
+            for line in battle_log:
+                yield json.dumps({'message': line}) + '\n'
+
+        return Response(stream(), status=201, mimetype='application/x-ndjson')
 
     return battle_bp
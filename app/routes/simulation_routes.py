@@ -0,0 +1,65 @@
+from flask import Blueprint, request, jsonify
+
+from app.exceptions import PokemonNotFoundException
+from app.models import SimulationRequest
+
+
+def create_simulation_blueprint(simulation_service):
+    simulation_bp = Blueprint('simulation', __name__)
+
+    @simulation_bp.route('/simulations', methods=['POST'])
+    def create_simulation():
+        """
+        Estimate the probability that the first Pokémon wins, from seeded stochastic battles.
+        ---
+        tags:
+          - Battles
+        parameters:
+          - name: body
+            in: body
+            required: true
+            schema:
+              type: object
+              properties:
+                pokemon1:
+                  type: string
+                pokemon2:
+                  type: string
+                trials:
+                  type: integer
+                  description: Number of battles to simulate (default 10000)
+                seed:
+                  type: integer
+                  description: Seed that makes the result reproducible; generated and returned when omitted
+        responses:
+          200:
+            description: Win counts and the win probability of pokemon1 with a 95% Wilson interval
+            schema:
+              type: object
+              properties:
+                win_probability:
+                  type: number
+                confidence_interval:
+                  type: array
+                  items:
+                    type: number
+                seed:
+                  type: integer
+          400:
+            description: Trial count out of range
+          404:
+            description: Pokémon not found
+        """
+        simulation_request = SimulationRequest(**request.json)
+        try:
+            simulation_result = simulation_service.estimate_win_probability(
+                simulation_request.pokemon1, simulation_request.pokemon2, simulation_request.trials,
+                simulation_request.seed)
+        except PokemonNotFoundException as e:
+            return jsonify({'error': f'Pokemon {e.pokemon_name} not found'}), 404
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify(simulation_result.dict()), 200
+
+    return simulation_bp
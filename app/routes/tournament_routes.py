@@ -0,0 +1,65 @@
+from flask import Blueprint, request, jsonify
+
+from app.exceptions import PokemonNotFoundException
+from app.models import TournamentRequest
+
+
+def create_tournament_blueprint(tournament_service):
+    tournament_bp = Blueprint('tournament', __name__)
+
+    @tournament_bp.route('/tournaments', methods=['POST'])
+    def create_tournament():
+        """
+        Run a round-robin tournament between the given Pokémon.
+        ---
+        tags:
+          - Tournaments
+        parameters:
+          - name: body
+            in: body
+            required: true
+            schema:
+              type: object
+              properties:
+                pokemon:
+                  type: array
+                  items:
+                    type: string
+                  description: Names of the competing Pokémon
+        responses:
+          201:
+            description: Win matrix and standings
+            schema:
+              type: object
+              properties:
+                pokemon:
+                  type: array
+                  items:
+                    type: string
+                win_matrix:
+                  type: array
+                  items:
+                    type: array
+                    items:
+                      type: integer
+                  description: win_matrix[i][j] is the number of games pokemon[i] won against pokemon[j]
+                standings:
+                  type: array
+                  items:
+                    type: object
+          400:
+            description: Roster too small or too large
+          404:
+            description: Pokémon not found
+        """
+        tournament_request = TournamentRequest(**request.json)
+        try:
+            tournament_result = tournament_service.run_tournament(tournament_request.pokemon)
+        except PokemonNotFoundException as e:
+            return jsonify({'error': f'Pokemon {e.pokemon_name} not found'}), 404
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return jsonify(tournament_result.dict()), 201
+
+    return tournament_bp
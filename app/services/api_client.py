@@ -1,19 +1,67 @@
+from typing import Dict, Optional, Tuple
+
 import requests
+from app.cache.http_cache import DiskHTTPCache
 from app.exceptions import PokemonAPIException, PokemonNotFoundException
+from app.services.http_session import HTTPSessionFactory, default_session_factory, default_timeout
 
 
 class APIClient:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, session_factory: Optional[HTTPSessionFactory] = None,
+                 timeout: Optional[Tuple[float, float]] = None, http_cache: Optional[DiskHTTPCache] = None):
         self.base_url = base_url
+        self.session_factory = session_factory or default_session_factory
+        self.timeout = timeout or default_timeout()
+        self.http_cache = http_cache
 
     def get(self, endpoint: str) -> dict:
+        return self._request(endpoint).json()
+
+    def get_raw(self, endpoint: str) -> bytes:
+        """Response body as bytes, for callers that parse only part of the payload."""
+        return self._request(endpoint).content
+
+    def pool_stats(self) -> Dict[str, int]:
+        return self.session_factory.pool_stats()
+
+    def _request(self, endpoint: str) -> requests.Response:
+        url = f"{self.base_url}/{endpoint}"
+        cached = self.http_cache.get(url) if self.http_cache else None
+        if cached and self.http_cache.is_fresh(cached):
+            self.http_cache.record_fresh_hit()
+            return self._cached_response(url, cached.body)
+
+        headers = self.http_cache.conditional_headers(cached) if cached else None
         try:
-            response = requests.get(f"{self.base_url}/{endpoint}")
+            response = self.session_factory.get_session().get(url, timeout=self.timeout, **self._headers(headers))
+            if cached and response.status_code == 304:
+                self.http_cache.mark_revalidated(url)
+                return self._cached_response(url, cached.body)
+
             response.raise_for_status()
-            return response.json()
+            if self.http_cache:
+                self.http_cache.store(url, response.content, response.headers.get('ETag'),
+                                      response.headers.get('Last-Modified'))
+            return response
         except requests.Timeout:
-            raise PokemonAPIException("Request timed out")
-        except requests.RequestException as e:
-            if 'pokemon' in endpoint and response.status_code == 404:
+            raise PokemonAPIException("Request timed out", url=url)
+        except requests.HTTPError as e:
+            status_code = e.response.status_code if e.response is not None else None
+            if 'pokemon' in endpoint and status_code == 404:
                 raise PokemonNotFoundException(f"Failed to get Pokemon data: {str(e)}")
-            raise PokemonAPIException(f"API request failed: {str(e)}")
\ No newline at end of file
+            raise PokemonAPIException(f"API request failed: {str(e)}", url=url, status_code=status_code)
+        except requests.RequestException as e:
+            raise PokemonAPIException(f"API request failed: {str(e)}", url=url)
+
+    @staticmethod
+    def _headers(headers: Optional[Dict[str, str]]) -> dict:
+        return {'headers': headers} if headers else {}
+
+    @staticmethod
+    def _cached_response(url: str, body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = 'utf-8'
+        response._content = body
+        return response
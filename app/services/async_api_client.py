@@ -0,0 +1,100 @@
+import asyncio
+import json
+import random
+from typing import Optional, Tuple
+
+import aiohttp
+
+from app.cache.http_cache import DiskHTTPCache
+from app.config import Config
+from app.exceptions import PokemonAPIException, PokemonNotFoundException
+from app.services.event_loop import run_blocking
+from app.services.http_session import RETRY_STATUSES, default_timeout
+
+
+class AsyncAPIClient:
+    """
+    aiohttp counterpart of APIClient with the same timeout, retry and error semantics.
+    One ClientSession (and its keep-alive connector) is kept per event loop.
+    """
+
+    def __init__(self, base_url: str, timeout: Optional[Tuple[float, float]] = None,
+                 limit_per_host: int = Config.HTTP_POOL_MAXSIZE, max_retries: int = Config.HTTP_MAX_RETRIES,
+                 backoff_factor: float = Config.HTTP_BACKOFF_FACTOR,
+                 backoff_jitter: float = Config.HTTP_BACKOFF_JITTER, http_cache: Optional[DiskHTTPCache] = None):
+        self.base_url = base_url
+        self.timeout = timeout or default_timeout()
+        self.limit_per_host = limit_per_host
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.http_cache = http_cache
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def get(self, endpoint: str) -> dict:
+        return json.loads(await self.get_raw(endpoint))
+
+    async def get_raw(self, endpoint: str) -> bytes:
+        url = f"{self.base_url}/{endpoint}"
+        cached = await run_blocking(self.http_cache.get, url) if self.http_cache else None
+        if cached and self.http_cache.is_fresh(cached):
+            self.http_cache.record_fresh_hit()
+            return cached.body
+
+        headers = self.http_cache.conditional_headers(cached) if cached else None
+        session = self._get_session()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with session.get(url, headers=headers) as response:
+                    if cached and response.status == 304:
+                        await run_blocking(self.http_cache.mark_revalidated, url)
+                        return cached.body
+                    if response.status in RETRY_STATUSES and attempt < self.max_retries:
+                        await asyncio.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+                        continue
+                    if response.status >= 400:
+                        self._raise_for_status(endpoint, url, response.status, response.reason)
+                    body = await response.read()
+                    if self.http_cache:
+                        await run_blocking(self.http_cache.store, url, body, response.headers.get('ETag'),
+                                           response.headers.get('Last-Modified'))
+                    return body
+            except asyncio.TimeoutError:
+                raise PokemonAPIException("Request timed out", url=url)
+            except aiohttp.ClientConnectionError as e:
+                if attempt < self.max_retries:
+                    await asyncio.sleep(self._backoff(attempt))
+                    continue
+                raise PokemonAPIException(f"API request failed: {str(e)}", url=url)
+            except aiohttp.ClientError as e:
+                raise PokemonAPIException(f"API request failed: {str(e)}", url=url)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connect_timeout, read_timeout = self.timeout
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.limit_per_host),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            )
+            self._loop = loop
+        return self._session
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * (2 ** attempt) + random.uniform(0, self.backoff_jitter)
+
+    @staticmethod
+    def _raise_for_status(endpoint: str, url: str, status_code: int, reason: Optional[str]) -> None:
+        message = f"{status_code} {reason or ''} for url: {url}".strip()
+        if 'pokemon' in endpoint and status_code == 404:
+            raise PokemonNotFoundException(f"Failed to get Pokemon data: {message}")
+        raise PokemonAPIException(f"API request failed: {message}", url=url, status_code=status_code)
@@ -0,0 +1,105 @@
+import asyncio
+from typing import List, Optional, Tuple, Union
+
+from app.cache.negative_cache import NegativeCache
+from app.cache.records import SpeciesRecord
+from app.services.async_api_client import AsyncAPIClient
+from app.services.background_refresh import BackgroundRefresher
+from app.services.data_tranformer import PokemonDataTransformer
+from app.services.event_loop import BackgroundEventLoop, default_event_loop, run_blocking
+from app.services.pokeapi_lookup import PokeAPILookup
+from app.services.single_flight import AsyncSingleFlight
+
+
+class AsyncPokeAPIService(PokeAPILookup):
+    """
+    Concurrent variant of PokeAPIService sharing the same cache, URL mapper and transformer.
+    `fetch_battle_data` is the synchronous facade used from Flask request handlers. Cache reads
+    and writes may hit the SQLite shared cache, so they run on the executor, never on the loop.
+    """
+
+    def __init__(self, cache_manager: 'PokemonCacheManager', url_mapper: 'PokemonURLMapper',
+                 api_client: AsyncAPIClient, data_transformer: PokemonDataTransformer,
+                 event_loop: Optional[BackgroundEventLoop] = None,
+                 single_flight: Optional[AsyncSingleFlight] = None,
+                 negative_cache: Optional[NegativeCache] = None,
+                 refresher: Optional[BackgroundRefresher] = None):
+        super().__init__(cache_manager, url_mapper, api_client, data_transformer, negative_cache, refresher)
+        self.event_loop = event_loop or default_event_loop
+        self.single_flight = single_flight or AsyncSingleFlight()
+
+    def fetch_battle_data(self, pokemon1_name: str, pokemon2_name: str) -> Tuple[SpeciesRecord, SpeciesRecord]:
+        return self.event_loop.run(self.get_battle_data(pokemon1_name, pokemon2_name))
+
+    def fetch_roster_data(self, pokemon_names: List[str]) -> List[SpeciesRecord]:
+        return self.event_loop.run(self.get_roster_data(pokemon_names))
+
+    def fetch_move_list(self, move_names: List[str]) -> List[Union[dict, BaseException]]:
+        """The moves in order, fetched concurrently; a failed lookup is returned as its exception."""
+        return self.event_loop.run(self.get_move_list(move_names))
+
+    async def get_move_list(self, move_names: List[str]) -> List[Union[dict, BaseException]]:
+        return list(await asyncio.gather(*(self.get_move_data(move_name) for move_name in move_names),
+                                         return_exceptions=True))
+
+    async def get_battle_data(self, pokemon1_name: str, pokemon2_name: str) -> Tuple[SpeciesRecord, SpeciesRecord]:
+        pokemon1_data, pokemon2_data = await self.get_roster_data([pokemon1_name, pokemon2_name])
+        return pokemon1_data, pokemon2_data
+
+    async def get_roster_data(self, pokemon_names: List[str]) -> List[SpeciesRecord]:
+        """
+        Resolve all species concurrently, then warm the move cache for every move any of them can use,
+        so the simulation afterwards only hits the cache.
+        """
+        roster_data = await asyncio.gather(*(self.get_pokemon_data(pokemon_name) for pokemon_name in pokemon_names))
+
+        move_names = {move_name for pokemon_data in roster_data for move_name in pokemon_data.moves}
+        # Move errors are left for the simulation to raise, exactly as on the sequential path.
+        await asyncio.gather(*(self.get_move_data(move_name) for move_name in move_names),
+                             return_exceptions=True)
+
+        return list(roster_data)
+
+    async def get_pokemon_data(self, pokemon_name: str) -> SpeciesRecord:
+        key = f'pokemon_{pokemon_name.lower()}'
+
+        def fetch():
+            return self.single_flight.do(key, lambda: self._fetch_pokemon_data(pokemon_name))
+
+        # A stale value is refreshed on a refresher thread, which drives `fetch` on our event loop.
+        cached_data = await run_blocking(self._cached_pokemon, pokemon_name, key,
+                                         lambda: self.event_loop.run(fetch()))
+        return cached_data or await fetch()
+
+    async def get_move_data(self, move_name: str) -> dict:
+        if not move_name:
+            raise ValueError("Move name cannot be empty")
+
+        key = f'move_{move_name.lower()}'
+
+        def fetch():
+            return self.single_flight.do(key, lambda: self._fetch_move_data(move_name))
+
+        cached_move = await run_blocking(self._cached_move, move_name, key, lambda: self.event_loop.run(fetch()))
+        return cached_move or await fetch()
+
+    async def _fetch_pokemon_data(self, pokemon_name: str) -> SpeciesRecord:
+        # A previous flight may have filled the cache between our miss and becoming the leader.
+        cached_data = await run_blocking(self.cache_manager.get_pokemon_data, pokemon_name)
+        if cached_data:
+            return cached_data
+
+        # A missing or stale name index is refreshed with blocking requests; keep that off the loop.
+        await run_blocking(self._resolve_pokemon_url, pokemon_name)
+        with self._pokemon_fetch_errors():
+            raw_data = await self.api_client.get_raw(f"pokemon/{pokemon_name}")
+            return await run_blocking(self._store_pokemon, pokemon_name, raw_data)
+
+    async def _fetch_move_data(self, move_name: str) -> dict:
+        cached_move = await run_blocking(self.cache_manager.get_move_data, move_name)
+        if cached_move:
+            return cached_move
+
+        with self._move_fetch_errors(move_name):
+            move_data = await self.api_client.get(f"move/{move_name}")
+            return await run_blocking(self._store_move, move_name, move_data)
@@ -0,0 +1,60 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+
+class BackgroundRefresher:
+    """
+    Runs cache refreshes on a small thread pool, at most one per key at a time.
+    Once `max_pending` refreshes are queued or running, new ones are dropped; the next
+    stale read schedules them again. The pool is recreated in forked worker processes.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 256):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pid: Optional[int] = None
+        self._stats = {'scheduled': 0, 'deduplicated': 0, 'dropped': 0, 'failed': 0}
+
+    def schedule(self, key: str, fn: Callable[[], object]) -> bool:
+        with self._lock:
+            executor = self._get_executor()
+            if key in self._pending:
+                self._stats['deduplicated'] += 1
+                return False
+            if len(self._pending) >= self.max_pending:
+                self._stats['dropped'] += 1
+                return False
+            self._pending.add(key)
+            self._stats['scheduled'] += 1
+
+        executor.submit(self._run, key, fn)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending))
+
+    def _run(self, key: str, fn: Callable[[], object]) -> None:
+        try:
+            fn()
+        except Exception:
+            # The stale value keeps being served until it passes max staleness.
+            with self._lock:
+                self._stats['failed'] += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        pid = os.getpid()
+        if self._executor is None or self._pid != pid:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cache-refresh')
+            self._pid = pid
+            # Refreshes queued in the parent process never run in this one.
+            self._pending.clear()
+        return self._executor
@@ -1,22 +1,95 @@
+from typing import Hashable, Iterator, Optional, Tuple
+
+from app.cache.bounded_cache import BoundedCache
+from app.cache.records import MOVE_FIELDS, STAT_NAMES, SpeciesRecord
+from app.exceptions import MoveNotFoundException
 from app.repositories.battle_repository import BattleRepository
+from app.services.async_pokeapi_service import AsyncPokeAPIService
 from app.services.pokeapi_service import PokeAPIService
-from app.battle_logic.battle_simulation import BattleSimulation
-from app.models import BattleResult
+from app.battle_logic.battle_record import BattleRecord
+from app.battle_logic.battle_simulation import RULE_VERSION, STOCHASTIC, BattleOutcome, BattleSimulation
+from app.models import BattleResult, BattleSummary
 
 class BattleService:
-    def __init__(self, pokeapi_service: PokeAPIService, battle_simulation: BattleSimulation):
+    def __init__(self, pokeapi_service: PokeAPIService, battle_simulation: BattleSimulation,
+                 async_pokeapi_service: Optional[AsyncPokeAPIService] = None,
+                 result_cache: Optional[BoundedCache] = None):
         self.pokeapi_service = pokeapi_service
         self.battle_simulation = battle_simulation
+        self.async_pokeapi_service = async_pokeapi_service
+        self.result_cache = result_cache
 
     def create_battle(self, pokemon1_name: str, pokemon2_name: str) -> BattleResult:
-        pokemon1_data = self.pokeapi_service.get_pokemon_data(pokemon1_name)
-        pokemon2_data = self.pokeapi_service.get_pokemon_data(pokemon2_name)
+        pokemon1_data, pokemon2_data = self._fetch_battle_data(pokemon1_name, pokemon2_name)
+
+        outcome, battle_record = self._play(pokemon1_data, pokemon2_data)
+        BattleRepository.create_battle(pokemon1_data.id, pokemon2_data.id, outcome.winner, battle_record)
+
+        return BattleResult(winner=outcome.winner, battle_log=list(battle_record.iter_log()))
+
+    def start_battle(self, pokemon1_name: str, pokemon2_name: str) -> Tuple[BattleSummary, Iterator[str]]:
+        """
+        Resolve and record a battle without building its log. The log comes back as a lazy iterator
+        for streaming, rendered from the same record that is stored.
+        """
+        pokemon1_data, pokemon2_data = self._fetch_battle_data(pokemon1_name, pokemon2_name)
+
+        outcome, battle_record = self._play(pokemon1_data, pokemon2_data)
+        summary = BattleSummary(winner=outcome.winner, turns=outcome.turns, pokemon1=battle_record.pokemon1,
+                                pokemon2=battle_record.pokemon2, pokemon1_hp=outcome.hp1, pokemon2_hp=outcome.hp2)
+
+        BattleRepository.create_battle(pokemon1_data.id, pokemon2_data.id, outcome.winner, battle_record)
+
+        return summary, battle_record.iter_log()
+
+    def _play(self, pokemon1_data: SpeciesRecord,
+              pokemon2_data: SpeciesRecord) -> Tuple[BattleOutcome, BattleRecord]:
+        """
+        Outcome and record of a matchup, served from the result cache when possible. The cache holds
+        the compact record, so both the full and the streamed log are rendered from it. Battles cut
+        short by the time budget depend on machine load and are not cached.
+        """
+        result_key = self._result_key(pokemon1_data, pokemon2_data)
+        cached = self.result_cache.get(result_key) if result_key else None
+        if cached is not None:
+            return cached
 
         pokemon1 = self.pokeapi_service.transform_pokemon_data(pokemon1_data)
         pokemon2 = self.pokeapi_service.transform_pokemon_data(pokemon2_data)
+        outcome, battle_record = self.battle_simulation.record_battle(pokemon1, pokemon2)
+        if result_key and not self.battle_simulation.ran_out_of_time(outcome):
+            self.result_cache.set(result_key, (outcome, battle_record))
+        return outcome, battle_record
+
+    def _result_key(self, pokemon1_data: SpeciesRecord, pokemon2_data: SpeciesRecord) -> Optional[Hashable]:
+        """
+        Ordered matchup plus everything its result depends on: both species' data, their selected
+        moves, the rule version and the simulation settings. None when results are not memoized.
+        """
+        simulation = self.battle_simulation
+        if self.result_cache is None or simulation.resolution == STOCHASTIC:
+            return None
+        return (RULE_VERSION, simulation.resolution, simulation.max_turns,
+                self._fingerprint(pokemon1_data), self._fingerprint(pokemon2_data))
 
-        winner, battle_log = self.battle_simulation.simulate_battle(pokemon1, pokemon2)
+    def _fingerprint(self, data: SpeciesRecord) -> Hashable:
+        move_handler = self.battle_simulation.move_handler
+        moves = tuple(self._move_fingerprint(move) for move in move_handler.candidate_moves(data))
+        stats = data.stats
+        return (data.id, data.name, tuple(data.types), tuple(data.moves),
+                tuple(stats.get(stat, 0) for stat in STAT_NAMES), type(move_handler).__name__, moves)
 
-        BattleRepository.create_battle(pokemon1.id, pokemon2.id, winner, battle_log)
+    def _move_fingerprint(self, move_name: str) -> Optional[tuple]:
+        try:
+            move_data = self.battle_simulation.move_handler.get_move_data(move_name)
+        except MoveNotFoundException:
+            return None
+        return tuple(move_data.get(field) for field in MOVE_FIELDS)
 
-        return BattleResult(winner=winner, battle_log=battle_log)
+    def _fetch_battle_data(self, pokemon1_name: str, pokemon2_name: str) -> Tuple[SpeciesRecord, SpeciesRecord]:
+        if self.async_pokeapi_service:
+            return self.async_pokeapi_service.fetch_battle_data(pokemon1_name, pokemon2_name)
+
+        pokemon1_data = self.pokeapi_service.get_pokemon_data(pokemon1_name)
+        pokemon2_data = self.pokeapi_service.get_pokemon_data(pokemon2_name)
+        return pokemon1_data, pokemon2_data
@@ -1,36 +1,69 @@
-from typing import Dict
+import json
+from typing import Dict, Optional, Union
 from pydash import get
+from app.battle_logic.type_effectiveness import defender_type_index
+from app.config import Config
 from app.models import PokemonData, Pokemon
+from app.services.payload_parser import select_fields
+
+# None keeps the whole learnset
+MOVES_LIMIT = Config.POKEMON_MOVES_LIMIT or None
+POKEMON_FIELDS = ('id', 'name', 'stats', 'types', 'moves')
 
 class PokemonDataTransformer:
     @staticmethod
-    def transform_to_pokemon_data(raw_data: dict) -> PokemonData:
+    def transform_raw_to_pokemon_data(raw_data: Union[bytes, str],
+                                      moves_limit: Optional[int] = MOVES_LIMIT) -> PokemonData:
+        """
+        Build PokemonData straight from the `/pokemon/{name}` response body, decoding only the
+        fields we keep and the first `moves_limit` moves instead of the whole document.
+        """
+        try:
+            selected = select_fields(raw_data, POKEMON_FIELDS,
+                                     list_limits={'moves': moves_limit} if moves_limit else None)
+        except ValueError:
+            selected = json.loads(raw_data)
+        return PokemonDataTransformer.transform_to_pokemon_data(selected, moves_limit)
+
+    @staticmethod
+    def transform_to_pokemon_data(raw_data: dict, moves_limit: Optional[int] = MOVES_LIMIT) -> PokemonData:
         types = list(map(lambda t: t['type']['name'], raw_data.get('types', [])))
-        moves = list(map(lambda m: m['move']['name'], raw_data.get('moves', [])))
+        moves = list(map(lambda m: m['move']['name'], raw_data.get('moves', [])[:moves_limit]))
 
         return PokemonData(
             id=get(raw_data, 'id'),
             name=get(raw_data, 'name'),
             stats=PokemonDataTransformer._extract_stats(raw_data),
             types=types,
-            moves=moves[:4]
+            moves=moves
         )
 
     @staticmethod
-    def transform_to_pokemon(data: PokemonData) -> Pokemon:
+    def transform_to_pokemon(data: Union[PokemonData, 'SpeciesRecord']) -> Pokemon:
+        stats = data.stats
         return Pokemon(
             id=data.id,
             name=data.name,
-            hp=get(data.stats, 'hp'),
-            attack=get(data.stats, 'attack'),
-            defense=get(data.stats, 'defense'),
-            special_attack=get(data.stats, 'special-attack'),
-            special_defense=get(data.stats, 'special-defense'),
-            speed=get(data.stats, 'speed'),
-            types=data.types,
-            moves=data.moves[:4]
+            hp=get(stats, 'hp'),
+            attack=get(stats, 'attack'),
+            defense=get(stats, 'defense'),
+            special_attack=get(stats, 'special-attack'),
+            special_defense=get(stats, 'special-defense'),
+            speed=get(stats, 'speed'),
+            types=list(data.types),
+            moves=list(data.moves[:MOVES_LIMIT]),
+            type_index=defender_type_index(data.types)
         )
 
+    @staticmethod
+    def transform_to_move_data(raw_data: dict) -> dict:
+        return {
+            'name': raw_data.get('name'),
+            'power': raw_data.get('power', 0),
+            'type': raw_data.get('type', {}).get('name'),
+            'damage_class': raw_data.get('damage_class', {}).get('name')
+        }
+
     @staticmethod
     def _extract_stats(data: dict) -> Dict[str, int]:
         return {
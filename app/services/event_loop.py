@@ -0,0 +1,47 @@
+import asyncio
+import os
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class BackgroundEventLoop:
+    """
+    An asyncio loop running on a daemon thread, so synchronous Flask handlers can
+    await coroutines while aiohttp connection pools stay alive between requests.
+    The loop is started lazily and restarted in forked worker processes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        return future.result(timeout)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        pid = os.getpid()
+        if self._loop is None or self._pid != pid:
+            with self._lock:
+                if self._loop is None or self._pid != pid:
+                    self._loop = self._start_loop()
+                    self._pid = pid
+        return self._loop
+
+    @staticmethod
+    def _start_loop() -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name='pokeapi-event-loop', daemon=True)
+        thread.start()
+        return loop
+
+
+async def run_blocking(function: Callable[..., T], *args) -> T:
+    """Run blocking work such as SQLite cache I/O on the default executor instead of the loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+default_event_loop = BackgroundEventLoop()
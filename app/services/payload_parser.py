@@ -0,0 +1,114 @@
+import json
+import re
+from json.decoder import scanstring
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+_key_boundary = frozenset(',{ \t\n\r')
+
+
+def select_fields(raw: Union[bytes, str], keys: Iterable[str],
+                  list_limits: Optional[Dict[str, int]] = None) -> Dict[str, object]:
+    """
+    Decode only the requested top-level fields of a JSON object.
+
+    The document is read front to back, decoding one top-level value at a time, and stops as
+    soon as a list in `list_limits` has yielded its first N items, so the remainder of that list
+    is never materialized. Fields that come after the truncated list are located from the end of
+    the document: a candidate `"key":` (with any whitespace before the colon) only counts when the pairs following it close the root
+    object, which rules out nested keys. Missing fields are simply absent from the result.
+
+    Raises ValueError on malformed input.
+    """
+    document = raw.decode('utf-8') if isinstance(raw, (bytes, bytearray)) else raw
+    keys = tuple(keys)
+    wanted = frozenset(keys)
+    list_limits = list_limits or {}
+    result: Dict[str, object] = {}
+
+    try:
+        pos = _whitespace.match(document, 0).end()
+        if document[pos] != '{':
+            raise ValueError("Expecting a JSON object")
+        pos, closed = _parse_pairs(document, pos + 1, wanted, result, list_limits)
+        if closed:
+            return result
+
+        for key in keys:
+            if key not in result:
+                _select_from_tail(document, pos, key, wanted, result)
+    except IndexError:
+        raise ValueError("Unexpected end of JSON document")
+
+    return result
+
+
+def _select_from_tail(document: str, start: int, key: str, wanted: frozenset, result: Dict[str, object]) -> None:
+    needle = re.compile(re.escape(f'"{key}"') + r'[ \t\n\r]*:')
+    for match in reversed(list(needle.finditer(document, start))):
+        candidate = match.start()
+        if document[candidate - 1] not in _key_boundary:
+            continue
+
+        found: Dict[str, object] = {}
+        try:
+            tail, closed = _parse_pairs(document, candidate, wanted, found, {})
+        except (ValueError, IndexError):
+            continue
+        if closed and not document[tail:].strip():
+            for found_key, value in found.items():
+                result.setdefault(found_key, value)
+            return
+
+
+def _parse_pairs(document: str, pos: int, wanted: frozenset, result: Dict[str, object],
+                 list_limits: Dict[str, int]) -> Tuple[int, bool]:
+    """Parse `"key": value` pairs; returns the end position and whether the object was closed."""
+    skip_whitespace = _whitespace.match
+    while True:
+        pos = skip_whitespace(document, pos).end()
+        if document[pos] == '}':
+            return pos + 1, True
+        if document[pos] == ',':
+            pos = skip_whitespace(document, pos + 1).end()
+        if document[pos] != '"':
+            raise ValueError(f"Expecting property name at char {pos}")
+
+        key, pos = scanstring(document, pos + 1)
+        pos = skip_whitespace(document, pos).end()
+        if document[pos] != ':':
+            raise ValueError(f"Expecting ':' delimiter at char {pos}")
+        pos = skip_whitespace(document, pos + 1).end()
+
+        if key in wanted and key in list_limits:
+            items, pos, complete = _parse_list_prefix(document, pos, list_limits[key])
+            result[key] = items
+            if not complete:
+                return pos, False
+        else:
+            value, pos = _decoder.raw_decode(document, pos)
+            if key in wanted:
+                result[key] = value
+
+
+def _parse_list_prefix(document: str, pos: int, limit: int) -> Tuple[list, int, bool]:
+    skip_whitespace = _whitespace.match
+    if document[pos] != '[':
+        raise ValueError(f"Expecting '[' at char {pos}")
+    pos = skip_whitespace(document, pos + 1).end()
+
+    items = []
+    if document[pos] == ']':
+        return items, pos + 1, True
+
+    while len(items) < limit:
+        value, pos = _decoder.raw_decode(document, pos)
+        items.append(value)
+        pos = skip_whitespace(document, pos).end()
+        if document[pos] == ']':
+            return items, pos + 1, True
+        if document[pos] != ',':
+            raise ValueError(f"Expecting ',' delimiter at char {pos}")
+        pos = skip_whitespace(document, pos + 1).end()
+    return items, pos, False
@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Union
+
+from pydantic import ValidationError
+
+from app.cache.negative_cache import MOVE, POKEMON, NegativeCache
+from app.cache.records import SpeciesRecord
+from app.config import Config
+from app.exceptions import (
+    PokemonNotFoundException,
+    PokemonAPIException,
+    MoveNotFoundException,
+    InvalidDataException
+)
+from app.services.background_refresh import BackgroundRefresher
+from app.services.data_tranformer import PokemonDataTransformer
+
+
+class PokeAPILookup:
+    """
+    The cache, negative-cache and transform steps of a species or move lookup, shared by
+    PokeAPIService and AsyncPokeAPIService so the two differ only in how they reach PokeAPI.
+    Every step is synchronous; the async service runs the ones that touch the cache off its loop.
+    """
+
+    def __init__(self, cache_manager: 'PokemonCacheManager', url_mapper: 'PokemonURLMapper' = None,
+                 api_client=None, data_transformer: 'PokemonDataTransformer' = None,
+                 negative_cache: Optional[NegativeCache] = None, refresher: Optional[BackgroundRefresher] = None):
+        self.cache_manager = cache_manager
+        self.url_mapper = url_mapper
+        self.api_client = api_client
+        self.data_transformer = data_transformer
+        self.negative_cache = negative_cache or NegativeCache(max_entries=Config.NEGATIVE_CACHE_MAX_ENTRIES,
+                                                              ttl_seconds=Config.NEGATIVE_CACHE_TTL_SECONDS)
+        self.refresher = refresher
+
+    def _cached_pokemon(self, pokemon_name: str, key: str, refresh: Callable[[], object]) -> Optional[SpeciesRecord]:
+        """The cached species, None on a miss; raises for a name PokeAPI is known not to have."""
+        cached_data = self._get_cached(self.cache_manager.get_pokemon_data, self.cache_manager.get_pokemon_entry,
+                                       pokemon_name, key, refresh)
+        if cached_data:
+            return cached_data
+        if self.negative_cache.is_missing(POKEMON, pokemon_name):
+            raise PokemonNotFoundException(pokemon_name)
+        return None
+
+    def _cached_move(self, move_name: str, key: str, refresh: Callable[[], object]) -> Optional[dict]:
+        cached_move = self._get_cached(self.cache_manager.get_move_data, self.cache_manager.get_move_entry,
+                                       move_name, key, refresh)
+        if cached_move:
+            return cached_move
+        if self.negative_cache.is_missing(MOVE, move_name):
+            raise MoveNotFoundException(f"Move {move_name} not found")
+        return None
+
+    def _get_cached(self, get_data, get_entry, name: str, key: str, refresh: Callable[[], object]):
+        """
+        The cached value. With a refresher, a value past its TTL is still returned while
+        `refresh` runs in the background; past max staleness the caller fetches inline.
+        """
+        if self.refresher is None:
+            return get_data(name)
+
+        entry = get_entry(name)
+        if entry is None:
+            return None
+        data, stale = entry
+        if stale:
+            self.refresher.schedule(key, refresh)
+        return data
+
+    def _resolve_pokemon_url(self, pokemon_name: str) -> str:
+        try:
+            return self.url_mapper.get_pokemon_url(pokemon_name)
+        except PokemonNotFoundException:
+            self.negative_cache.mark_missing(POKEMON, pokemon_name)
+            raise PokemonNotFoundException(pokemon_name)
+
+    def _store_pokemon(self, pokemon_name: str, raw_data: Union[bytes, str]) -> SpeciesRecord:
+        pokemon_data = self.data_transformer.transform_raw_to_pokemon_data(raw_data)
+        record = SpeciesRecord.from_pokemon_data(pokemon_data)
+        self.cache_manager.set_pokemon_data(pokemon_name, record)
+        return record
+
+    def _store_move(self, move_name: str, move_data: dict) -> dict:
+        simplified_move_data = PokemonDataTransformer.transform_to_move_data(move_data)
+        self.cache_manager.set_move_data(move_name, simplified_move_data)
+        return simplified_move_data
+
+    @staticmethod
+    @contextmanager
+    def _pokemon_fetch_errors() -> Iterator[None]:
+        try:
+            yield
+        except ValidationError as e:
+            raise InvalidDataException(f"Invalid Pokemon data format: {str(e)}")
+        except Exception as e:
+            raise PokemonAPIException(f"Failed to get Pokemon data: {str(e)}")
+
+    @contextmanager
+    def _move_fetch_errors(self, move_name: str) -> Iterator[None]:
+        try:
+            yield
+        except PokemonAPIException as e:
+            if getattr(e, 'status_code', None) == 404:
+                self.negative_cache.mark_missing(MOVE, move_name)
+                raise MoveNotFoundException(f"Move {move_name} not found")
+            raise
@@ -1,71 +1,62 @@
-from pydantic import ValidationError
+from typing import Dict, Optional
 
-from app.models import PokemonData, Pokemon
-from app.exceptions import (
-    PokemonNotFoundException,
-    PokemonAPIException,
-    MoveNotFoundException,
-    InvalidDataException
-)
-from app.services.data_tranformer import PokemonDataTransformer
-from app.services.api_client import APIClient
+from app.cache.negative_cache import NegativeCache
+from app.cache.records import SpeciesRecord
+from app.models import Pokemon
+from app.services.background_refresh import BackgroundRefresher
+from app.services.pokeapi_lookup import PokeAPILookup
+from app.services.single_flight import SingleFlight
 
 
-class PokeAPIService:
+class PokeAPIService(PokeAPILookup):
     def __init__(self, cache_manager: 'PokemonCacheManager', url_mapper: 'PokemonURLMapper' = None,
-                 api_client: 'APIClient' = None, data_transformer: 'PokemonDataTransformer' = None):
-        self.cache_manager = cache_manager
-        self.url_mapper = url_mapper
-        self.api_client = api_client
-        self.data_transformer = data_transformer
+                 api_client: 'APIClient' = None, data_transformer: 'PokemonDataTransformer' = None,
+                 single_flight: Optional[SingleFlight] = None, negative_cache: Optional[NegativeCache] = None,
+                 refresher: Optional[BackgroundRefresher] = None):
+        super().__init__(cache_manager, url_mapper, api_client, data_transformer, negative_cache, refresher)
+        self.single_flight = single_flight or SingleFlight()
 
-    def get_pokemon_data(self, pokemon_name: str) -> PokemonData:
-        cached_data = self.cache_manager.get_pokemon_data(pokemon_name)
-        if cached_data:
-            return cached_data
-
-        try:
-            url = self.url_mapper.get_pokemon_url(pokemon_name)
-        except PokemonNotFoundException:
-            raise PokemonNotFoundException(pokemon_name)
+    def get_pokemon_data(self, pokemon_name: str) -> SpeciesRecord:
+        """The species as the cache's compact record, whether it was cached or just fetched."""
+        key = f'pokemon_{pokemon_name.lower()}'
 
-        try:
-            raw_data = self.api_client.get(f"pokemon/{pokemon_name}")
-            pokemon_data = self.data_transformer.transform_to_pokemon_data(raw_data)
+        def fetch():
+            return self.single_flight.do(key, lambda: self._fetch_pokemon_data(pokemon_name))
 
-            self.cache_manager.set_pokemon_data(pokemon_name, pokemon_data)
-            return pokemon_data
-
-        except ValidationError as e:
-            raise InvalidDataException(f"Invalid Pokemon data format: {str(e)}")
-
-        except Exception as e:
-            raise PokemonAPIException(f"Failed to get Pokemon data: {str(e)}")
+        return self._cached_pokemon(pokemon_name, key, fetch) or fetch()
 
     def get_move_data(self, move_name: str) -> dict:
         if not move_name:
             raise ValueError("Move name cannot be empty")
 
+        key = f'move_{move_name.lower()}'
+
+        def fetch():
+            return self.single_flight.do(key, lambda: self._fetch_move_data(move_name))
+
+        return self._cached_move(move_name, key, fetch) or fetch()
+
+    def transform_pokemon_data(self, data: SpeciesRecord) -> Pokemon:
+        return self.data_transformer.transform_to_pokemon(data)
+
+    def fetch_stats(self) -> Dict[str, int]:
+        """Upstream fetch counters; `collapsed` counts cache misses served by another caller's fetch."""
+        return self.single_flight.stats()
+
+    def _fetch_pokemon_data(self, pokemon_name: str) -> SpeciesRecord:
+        # A previous flight may have filled the cache between our miss and becoming the leader.
+        cached_data = self.cache_manager.get_pokemon_data(pokemon_name)
+        if cached_data:
+            return cached_data
+
+        self._resolve_pokemon_url(pokemon_name)
+        with self._pokemon_fetch_errors():
+            return self._store_pokemon(pokemon_name, self.api_client.get_raw(f"pokemon/{pokemon_name}"))
+
+    def _fetch_move_data(self, move_name: str) -> dict:
         cached_move = self.cache_manager.get_move_data(move_name)
         if cached_move:
             return cached_move
 
-        try:
-            move_data = self.api_client.get(f"move/{move_name}")
-            simplified_move_data = {
-                'name': move_data.get('name'),
-                'power': move_data.get('power', 0),
-                'type': move_data.get('type', {}).get('name'),
-                'damage_class': move_data.get('damage_class', {}).get('name')
-            }
-
-            self.cache_manager.set_move_data(move_name, simplified_move_data)
-            return simplified_move_data
-
-        except PokemonAPIException as e:
-            if getattr(e, 'status_code', None) == 404:
-                raise MoveNotFoundException(f"Move {move_name} not found")
-            raise
-
-    def transform_pokemon_data(self, data: PokemonData) -> Pokemon:
-        return self.data_transformer.transform_to_pokemon(data)
\ No newline at end of file
+        with self._move_fetch_errors(move_name):
+            return self._store_move(move_name, self.api_client.get(f"move/{move_name}"))
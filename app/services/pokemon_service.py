@@ -11,9 +11,10 @@ class PokemonService:
         pokemon_info = self.pokemon_repository.get_pokemon_by_name(name)
 
         if not pokemon_info:
-            api_pokemon_info = self.pokeapi_service.get_pokemon_data(name)
+            api_pokemon_info = self.pokeapi_service.get_pokemon_data(name).to_pokemon_data()
 
-            pokemon_info = self.pokemon_repository.create_pokemon(
+            # Upsert: a concurrent first request for the same name may have stored it meanwhile
+            pokemon_info = self.pokemon_repository.upsert_pokemon(
                 name=api_pokemon_info.name,
                 types=api_pokemon_info.types,
                 stats=api_pokemon_info.stats
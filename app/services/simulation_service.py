@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Optional, Tuple
+
+import numpy as np
+
+from app.battle_logic.battle_simulation import BattleSimulation
+from app.battle_logic.monte_carlo import MonteCarloSimulation, StochasticMatchup, wilson_interval
+from app.cache.records import SpeciesRecord
+from app.config import Config
+from app.models import SimulationResult
+from app.services.async_pokeapi_service import AsyncPokeAPIService
+from app.services.pokeapi_service import PokeAPIService
+
+
+class SimulationService:
+    """
+    Win probability of a matchup from seeded stochastic trials. Trials are split into chunks of
+    `chunk_trials`, each seeded with its own child of the request seed, so a result depends only on
+    the seed and the trial count; chunks run on a process pool when there is more than one.
+    """
+
+    def __init__(self, pokeapi_service: PokeAPIService, battle_simulation: BattleSimulation,
+                 monte_carlo: Optional[MonteCarloSimulation] = None,
+                 async_pokeapi_service: Optional[AsyncPokeAPIService] = None,
+                 workers: int = Config.SIMULATION_WORKERS, chunk_trials: int = Config.SIMULATION_CHUNK_TRIALS,
+                 max_trials: int = Config.SIMULATION_MAX_TRIALS):
+        self.pokeapi_service = pokeapi_service
+        self.battle_simulation = battle_simulation
+        self.monte_carlo = monte_carlo or MonteCarloSimulation()
+        self.async_pokeapi_service = async_pokeapi_service
+        self.workers = workers
+        self.chunk_trials = chunk_trials
+        self.max_trials = max_trials
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pid: Optional[int] = None
+
+    def estimate_win_probability(self, pokemon1_name: str, pokemon2_name: str, trials: int,
+                                 seed: Optional[int] = None) -> SimulationResult:
+        if not 1 <= trials <= self.max_trials:
+            raise ValueError(f"trials must be between 1 and {self.max_trials}")
+        if seed is None:
+            seed = secrets.randbits(32)
+
+        pokemon1_data, pokemon2_data = self._fetch_battle_data(pokemon1_name, pokemon2_name)
+        pokemon1 = self.pokeapi_service.transform_pokemon_data(pokemon1_data)
+        pokemon2 = self.pokeapi_service.transform_pokemon_data(pokemon2_data)
+        matchup = StochasticMatchup.build(pokemon1, pokemon2, self.battle_simulation)
+
+        wins1, wins2, draws = (int(count) for count in self.count_outcomes(matchup, trials, seed))
+        return SimulationResult(pokemon1=pokemon1.name, pokemon2=pokemon2.name, trials=trials, seed=seed,
+                                wins1=wins1, wins2=wins2, draws=draws, win_probability=wins1 / trials,
+                                confidence_interval=list(wilson_interval(wins1, trials)))
+
+    def count_outcomes(self, matchup: StochasticMatchup, trials: int, seed: int) -> np.ndarray:
+        chunk_sizes = [min(self.chunk_trials, trials - start) for start in range(0, trials, self.chunk_trials)]
+        chunk_seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        if self.workers and len(chunk_sizes) > 1:
+            outcomes = self._get_executor().map(self.monte_carlo.count_outcomes, repeat(matchup), chunk_sizes,
+                                                chunk_seeds)
+        else:
+            outcomes = map(self.monte_carlo.count_outcomes, repeat(matchup), chunk_sizes, chunk_seeds)
+        return sum(outcomes)
+
+    def _fetch_battle_data(self, pokemon1_name: str, pokemon2_name: str) -> Tuple[SpeciesRecord, SpeciesRecord]:
+        if self.async_pokeapi_service:
+            # Also warms the cache with every move the stochastic mode can pick.
+            return self.async_pokeapi_service.fetch_battle_data(pokemon1_name, pokemon2_name)
+        return self.pokeapi_service.get_pokemon_data(pokemon1_name), self.pokeapi_service.get_pokemon_data(pokemon2_name)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            pid = os.getpid()
+            if self._executor is None or self._pid != pid:
+                # spawn, not fork: the web workers run threads (event loop, cache refreshes).
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+                self._pid = pid
+            return self._executor
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Per-key in-flight deduplication: concurrent callers for the same key wait for the
+    first caller's fetch and share its result or its exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._stats = {'calls': 0, 'executions': 0, 'collapsed': 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+                self._stats['executions'] += 1
+            else:
+                self._stats['collapsed'] += 1
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
+
+
+class AsyncSingleFlight:
+    """asyncio flavour of SingleFlight for coroutines running on one event loop."""
+
+    def __init__(self):
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._stats = {'calls': 0, 'executions': 0, 'collapsed': 0}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self._stats['calls'] += 1
+        future = self._futures.get(key)
+        if future is not None:
+            self._stats['collapsed'] += 1
+            return await asyncio.shield(future)
+
+        self._stats['executions'] += 1
+        future = self._futures[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting for it.
+            future.exception()
+            raise
+        finally:
+            del self._futures[key]
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._stats, in_flight=len(self._futures))
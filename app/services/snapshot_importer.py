@@ -0,0 +1,204 @@
+"""
+Bulk import of a local PokeAPI dump, so a deploy can start pre-warmed and without network access.
+
+The dump is a directory holding the JSON payloads `APIClient.get` returns, grouped under
+`pokemon/` and `move/` (e.g. `pokemon/pikachu.json` or the api-data layout `pokemon/25/index.json`).
+Listing payloads (`{"results": [...]}`) found under `pokemon/` are added to the name index,
+which the CLI persists to POKEMON_INDEX_PATH for the URL mapper to load. The CLI also writes
+species and moves to the host-wide shared cache at SHARED_CACHE_PATH, which every worker reads;
+with SHARED_CACHE_PATH empty it imports species into the database only.
+
+Usage:
+    python -m app.services.snapshot_importer /path/to/dump [--workers N] [--batch-size N]
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.cache.name_index import PokemonNameIndex
+from app.cache.pokemon_cache import URL_MAPPING_KEY
+from app.config import Config
+from app.models import PokemonData
+from app.services.data_tranformer import PokemonDataTransformer
+from app.services.url_map_service import PokemonURLMapper
+
+POKEMON = 'pokemon'
+MOVE = 'move'
+NAME_INDEX = 'name_index'
+
+
+def parse_snapshot_file(path: str) -> Optional[Tuple[str, object]]:
+    """
+    Parse one dump file into ('pokemon', PokemonData), ('move', move dict) or
+    ('name_index', {name: id}). Runs in pool workers, so it must stay module level.
+    """
+    kind = _payload_kind(path)
+    if kind is None:
+        return None
+
+    try:
+        with open(path, 'rb') as payload_file:
+            raw_data = json.loads(payload_file.read())
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(raw_data, dict):
+        return None
+
+    if kind == POKEMON and 'results' in raw_data:
+        return NAME_INDEX, {entry['name']: PokemonURLMapper.pokemon_id_from_url(entry['url'])
+                            for entry in raw_data['results']}
+
+    try:
+        if kind == POKEMON and 'stats' in raw_data:
+            return POKEMON, PokemonDataTransformer.transform_to_pokemon_data(raw_data)
+        if kind == MOVE and 'damage_class' in raw_data:
+            return MOVE, PokemonDataTransformer.transform_to_move_data(raw_data)
+    except (KeyError, TypeError, ValidationError):
+        return None
+    return None
+
+
+def _payload_kind(path: str) -> Optional[str]:
+    for part in reversed(os.path.normpath(os.path.dirname(path)).split(os.sep)):
+        if part in (POKEMON, MOVE):
+            return part
+    return None
+
+
+class Snapshot:
+    def __init__(self):
+        self.pokemon: List[PokemonData] = []
+        self.moves: List[dict] = []
+        self.pokemon_ids: Dict[str, int] = {}
+
+
+class SnapshotImporter:
+    def __init__(self, cache_manager: 'PokemonCacheManager' = None, pokemon_repository: 'PokemonRepository' = None,
+                 name_index: Optional[PokemonNameIndex] = None, workers: int = Config.SNAPSHOT_IMPORT_WORKERS,
+                 batch_size: int = Config.SNAPSHOT_IMPORT_BATCH_SIZE):
+        self.cache_manager = cache_manager
+        self.pokemon_repository = pokemon_repository
+        self.name_index = name_index
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def import_snapshot(self, directory: str) -> Dict[str, int]:
+        return self.store(self.load(directory))
+
+    def store(self, snapshot: Snapshot) -> Dict[str, int]:
+        if self.name_index is not None and snapshot.pokemon_ids:
+            pokemon_ids = self.name_index.load()
+            pokemon_ids.update(snapshot.pokemon_ids)
+            self.name_index.save(pokemon_ids)
+
+        if self.cache_manager is not None:
+            self.warm_cache(snapshot)
+
+        inserted = 0
+        if self.pokemon_repository is not None:
+            inserted = self.pokemon_repository.create_many(snapshot.pokemon, batch_size=self.batch_size)
+
+        return {
+            'pokemon': len(snapshot.pokemon),
+            'moves': len(snapshot.moves),
+            'names': len(snapshot.pokemon_ids),
+            'inserted': inserted
+        }
+
+    def load(self, directory: str) -> Snapshot:
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"Snapshot directory '{directory}' does not exist")
+
+        snapshot = Snapshot()
+        for parsed in self._parse_all(sorted(self._iter_json_files(directory))):
+            if parsed is None:
+                continue
+            kind, data = parsed
+            if kind == POKEMON:
+                snapshot.pokemon.append(data)
+                snapshot.pokemon_ids[data.name] = data.id
+            elif kind == MOVE:
+                snapshot.moves.append(data)
+            else:
+                for name, pokemon_id in data.items():
+                    snapshot.pokemon_ids.setdefault(name, pokemon_id)
+        return snapshot
+
+    def warm_cache(self, snapshot: Snapshot) -> None:
+        """Species and moves are pinned: a deploy without network access keeps serving them past their TTL."""
+        for pokemon_data in snapshot.pokemon:
+            self.cache_manager.set_pokemon_data(pokemon_data.name, pokemon_data, pinned=True)
+        for move_data in snapshot.moves:
+            self.cache_manager.set_move_data(move_data['name'], move_data, pinned=True)
+
+        pokemon_ids = dict(self.cache_manager.get_pokemon_data(URL_MAPPING_KEY) or {})
+        if self.name_index is not None:
+            pokemon_ids.update(self.name_index.load())
+        pokemon_ids.update(snapshot.pokemon_ids)
+        self.cache_manager.set_pokemon_data(URL_MAPPING_KEY, pokemon_ids)
+
+    def _parse_all(self, paths: List[str]) -> Iterable[Optional[Tuple[str, object]]]:
+        if self.workers <= 1 or len(paths) < 2:
+            return map(parse_snapshot_file, paths)
+
+        chunksize = max(1, len(paths) // (self.workers * 4))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(parse_snapshot_file, paths, chunksize=chunksize))
+
+    @staticmethod
+    def _iter_json_files(directory: str) -> Iterator[str]:
+        for root, _, files in os.walk(directory):
+            for file_name in files:
+                if file_name.endswith('.json'):
+                    yield os.path.join(root, file_name)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from flask import Flask
+    from app.cache.pokemon_cache import PokemonCacheManager
+    from app.cache.shared_cache import SQLiteCacheBackend
+    from app.database import db
+    from app.repositories.pokemon_repository import PokemonRepository
+
+    parser = argparse.ArgumentParser(
+        description="Import a local PokeAPI dump into the pokemon table and the shared cache",
+        epilog="Species and moves go to the shared cache at SHARED_CACHE_PATH, where every worker reads them; "
+               "when it is empty, moves are parsed but not stored.")
+    parser.add_argument('directory', help="Directory containing pokemon/ and move/ JSON payloads")
+    parser.add_argument('--workers', type=int, default=Config.SNAPSHOT_IMPORT_WORKERS,
+                        help="Parser processes (0 = one per CPU)")
+    parser.add_argument('--batch-size', type=int, default=Config.SNAPSHOT_IMPORT_BATCH_SIZE,
+                        help="Rows per INSERT batch")
+    args = parser.parse_args(argv)
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    db.init_app(app)
+    cache_manager = None
+    if Config.SHARED_CACHE_PATH:
+        cache_manager = PokemonCacheManager(shared_cache=SQLiteCacheBackend(Config.SHARED_CACHE_PATH,
+                                                                            max_bytes=Config.SHARED_CACHE_MAX_BYTES))
+
+    with app.app_context():
+        db.create_all()
+        PokemonRepository.ensure_name_index()
+        importer = SnapshotImporter(cache_manager=cache_manager, pokemon_repository=PokemonRepository(),
+                                    name_index=PokemonNameIndex(Config.POKEMON_INDEX_PATH),
+                                    workers=args.workers, batch_size=args.batch_size)
+        result = importer.import_snapshot(args.directory)
+
+    print(f"Parsed {result['pokemon']} Pokemon, {result['moves']} moves and {result['names']} names; "
+          f"inserted {result['inserted']} new Pokemon rows.")
+    if cache_manager is not None:
+        print(f"Cached species and moves in {Config.SHARED_CACHE_PATH}.")
+    else:
+        print("SHARED_CACHE_PATH is empty: moves were not stored.")
+
+
+if __name__ == '__main__':
+    main()
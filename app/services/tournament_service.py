@@ -0,0 +1,65 @@
+from typing import List, Optional
+
+import numpy as np
+
+from app.battle_logic.batch_simulation import UNDECIDED, BatchBattleSimulation, build_roster_matchups
+from app.battle_logic.move_handler import MoveHandler
+from app.battle_logic.type_effectiveness import TypeEffectiveness
+from app.cache.records import SpeciesRecord
+from app.config import Config
+from app.models import TournamentResult, TournamentStanding
+from app.services.async_pokeapi_service import AsyncPokeAPIService
+from app.services.pokeapi_service import PokeAPIService
+
+
+class TournamentService:
+    """
+    Round robin over a roster: every ordered pair battles once, so each pairing is played twice with
+    each side attacking first once. Species and moves are resolved once, and all battles run in one
+    BatchBattleSimulation call instead of one BattleService.create_battle per pairing.
+    """
+
+    def __init__(self, pokeapi_service: PokeAPIService, move_handler: MoveHandler,
+                 type_effectiveness_service: TypeEffectiveness,
+                 batch_simulation: Optional[BatchBattleSimulation] = None,
+                 async_pokeapi_service: Optional[AsyncPokeAPIService] = None,
+                 max_roster: int = Config.TOURNAMENT_MAX_ROSTER):
+        self.pokeapi_service = pokeapi_service
+        self.move_handler = move_handler
+        self.type_effectiveness_service = type_effectiveness_service
+        self.batch_simulation = batch_simulation or BatchBattleSimulation(max_turns=Config.BATTLE_MAX_TURNS)
+        self.async_pokeapi_service = async_pokeapi_service
+        self.max_roster = max_roster
+
+    def run_tournament(self, pokemon_names: List[str]) -> TournamentResult:
+        names = list(dict.fromkeys(name.lower() for name in pokemon_names))
+        if len(names) < 2:
+            raise ValueError("A tournament needs at least two different Pokemon")
+        if len(names) > self.max_roster:
+            raise ValueError(f"A tournament can have at most {self.max_roster} Pokemon")
+
+        roster = [self.pokeapi_service.transform_pokemon_data(data) for data in self._fetch_roster_data(names)]
+        size = len(roster)
+        first, second = np.nonzero(~np.eye(size, dtype=bool))
+        batch = build_roster_matchups(roster, first, second, self.move_handler, self.type_effectiveness_service)
+        result = self.batch_simulation.simulate(batch)
+
+        decided = result.winner != UNDECIDED
+        winners = np.where(result.winner == 0, first, second)[decided]
+        losers = np.where(result.winner == 0, second, first)[decided]
+        win_matrix = np.zeros((size, size), dtype=np.int64)
+        np.add.at(win_matrix, (winners, losers), 1)
+        draws = np.bincount(first[~decided], minlength=size) + np.bincount(second[~decided], minlength=size)
+
+        standings = [TournamentStanding(name=pokemon.name, wins=int(win_matrix[index].sum()),
+                                        losses=int(win_matrix[:, index].sum()), draws=int(draws[index]))
+                     for index, pokemon in enumerate(roster)]
+        standings.sort(key=lambda standing: (-standing.wins, standing.losses))
+
+        return TournamentResult(pokemon=[pokemon.name for pokemon in roster], win_matrix=win_matrix.tolist(),
+                                standings=standings)
+
+    def _fetch_roster_data(self, names: List[str]) -> List[SpeciesRecord]:
+        if self.async_pokeapi_service:
+            return self.async_pokeapi_service.fetch_roster_data(names)
+        return [self.pokeapi_service.get_pokemon_data(name) for name in names]
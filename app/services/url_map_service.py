@@ -1,32 +1,92 @@
-from typing import Dict
+import sys
+import threading
+from typing import Dict, Optional
 import requests
+from app.cache.name_index import PokemonNameIndex
+from app.cache.pokemon_cache import URL_MAPPING_KEY
 from app.config import Config
 from app.exceptions import PokemonAPIException, PokemonNotFoundException
+from app.services.http_session import get_session, default_timeout
 
 
 class PokemonURLMapper:
-    def __init__(self, cache_manager):
+    """
+    Resolves Pokemon names through a name -> id index that is loaded lazily on the first lookup
+    from the persisted PokemonNameIndex, and fetched from PokeAPI only when no index exists yet.
+    An index older than `refresh_seconds` is served as-is while a background thread refreshes it.
+    """
+
+    def __init__(self, cache_manager, name_index: Optional[PokemonNameIndex] = None,
+                 refresh_seconds: float = Config.POKEMON_INDEX_REFRESH_SECONDS):
         self.base_url = Config.POKEAPI_BASE_URL
         self.cache_manager = cache_manager
-        self.pokemon_urls: Dict[str, str] = {}
-        self._initialize_mapping()
+        self.name_index = name_index or PokemonNameIndex(Config.POKEMON_INDEX_PATH)
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def get_pokemon_url(self, pokemon_name: str) -> str:
+        return f'{self.base_url}/pokemon/{self.get_pokemon_id(pokemon_name)}/'
+
+    def get_pokemon_id(self, pokemon_name: str) -> int:
+        pokemon_name = pokemon_name.lower()
+        pokemon_ids = self._get_pokemon_ids()
+        if pokemon_name not in pokemon_ids:
+            raise PokemonNotFoundException(pokemon_name)
+        return pokemon_ids[pokemon_name]
+
+    def refresh(self) -> Dict[str, int]:
+        pokemon_ids = self._fetch_all_pokemon_ids()
+        self.name_index.save(pokemon_ids)
+        self.cache_manager.set_pokemon_data(URL_MAPPING_KEY, pokemon_ids)
+        return pokemon_ids
+
+    def _get_pokemon_ids(self) -> Dict[str, int]:
+        pokemon_ids = self.cache_manager.get_pokemon_data(URL_MAPPING_KEY)
+        if pokemon_ids:
+            return pokemon_ids
+
+        with self._lock:
+            pokemon_ids = self.cache_manager.get_pokemon_data(URL_MAPPING_KEY)
+            if pokemon_ids:
+                return pokemon_ids
+            return self._load_index()
 
-    def _initialize_mapping(self) -> None:
+    def _load_index(self) -> Dict[str, int]:
         try:
-            cached_mapping = self.cache_manager.get_pokemon_data('pokemon_url_mapping')
-            if cached_mapping:
-                self.pokemon_urls = cached_mapping
-                return
+            pokemon_ids = self.name_index.load()
+            if not pokemon_ids:
+                return self.refresh()
 
-            self._fetch_all_pokemon_urls()
-            self.cache_manager.set_pokemon_data('pokemon_url_mapping', self.pokemon_urls)
+            age = self.name_index.age()
+            if age is None or age > self.refresh_seconds:
+                self._schedule_refresh()
 
+            self.cache_manager.set_pokemon_data(URL_MAPPING_KEY, pokemon_ids)
+            return pokemon_ids
+
+        except PokemonAPIException:
+            raise
         except requests.RequestException as e:
             raise PokemonAPIException(f"Failed to connect to PokeAPI: {str(e)}")
         except Exception as e:
             raise PokemonAPIException(f"Failed to initialize Pokemon mapping: {str(e)}")
 
-    def _fetch_all_pokemon_urls(self) -> None:
+    def _schedule_refresh(self) -> None:
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(target=self._refresh_quietly, name='pokemon-index-refresh',
+                                                daemon=True)
+        self._refresh_thread.start()
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            # The stale index keeps serving lookups; the next load schedules another attempt.
+            pass
+
+    def _fetch_all_pokemon_ids(self) -> Dict[str, int]:
         url = f'{self.base_url}/pokemon?offset=0&limit=1302'
         all_pokemon = []
         next_url = url
@@ -37,24 +97,22 @@ class PokemonURLMapper:
             all_pokemon.extend(data['results'])
             next_url = data.get('next')
 
-        self.pokemon_urls = {
-            pokemon['name']: pokemon['url']
+        return {
+            sys.intern(pokemon['name']): self.pokemon_id_from_url(pokemon['url'])
             for pokemon in all_pokemon
         }
 
-    def get_pokemon_url(self, pokemon_name: str) -> str:
-        pokemon_name = pokemon_name.lower()
-        if pokemon_name not in self.pokemon_urls:
-            raise PokemonNotFoundException(pokemon_name)
-        return self.pokemon_urls[pokemon_name]
+    @staticmethod
+    def pokemon_id_from_url(url: str) -> int:
+        return int(url.rstrip('/').rsplit('/', 1)[-1])
 
     @staticmethod
     def _make_api_request(url: str) -> requests.Response:
         try:
-            response = requests.get(url, timeout=10)
+            response = get_session().get(url, timeout=default_timeout())
             response.raise_for_status()
             return response
         except requests.Timeout:
             raise PokemonAPIException("Request timed out")
         except requests.RequestException as e:
-            raise PokemonAPIException(f"API request failed: {str(e)}")
\ No newline at end of file
+            raise PokemonAPIException(f"API request failed: {str(e)}")
@@ -0,0 +1,39 @@
+from unittest.mock import Mock
+
+from app.battle_logic.battle_simulation import BattleSimulation
+from app.battle_logic.move_handler import MoveHandler
+from app.models import Pokemon
+
+TYPES = ['normal', 'fire', 'water', 'grass', 'rock', 'ghost', 'steel', 'bug', 'ice', 'dragon']
+
+
+def make_pokemon(name, hp, attack, moves=('tackle', 'slam'), speed=10):
+    return Pokemon(id=1, name=name, hp=hp, attack=attack, defense=10, special_attack=10, special_defense=10,
+                   speed=speed, types=['normal'], moves=list(moves))
+
+
+def build_simulation(resolution, max_turns=1000):
+    """Normal-type battles where everyone uses their first move: tackle hits for 10 power, anything else for 25."""
+    move_handler = Mock()
+    move_handler.select_move.side_effect = lambda pokemon, defender=None: pokemon.moves[0] if pokemon.moves else None
+    move_handler.get_move_data.side_effect = lambda move: {'name': move, 'power': 10 if move == 'tackle' else 25,
+                                                           'type': 'normal', 'damage_class': 'physical'}
+    type_effectiveness = Mock()
+    type_effectiveness.get_type_effectiveness.return_value = 1.0
+    return BattleSimulation(type_effectiveness, move_handler, resolution=resolution, max_turns=max_turns)
+
+
+def random_pokemon(rng, pokemon_id):
+    return Pokemon(id=pokemon_id, name=f'pokemon-{pokemon_id}', hp=rng.randint(1, 255),
+                   attack=rng.randint(5, 190), defense=rng.randint(5, 230), special_attack=rng.randint(10, 194),
+                   special_defense=rng.randint(20, 230), speed=rng.randint(5, 180),
+                   types=rng.sample(TYPES, rng.choice([1, 2])), moves=[f'move-{pokemon_id}'])
+
+
+def move_handler_for(rng, count):
+    moves = {f'move-{move_id}': {'name': f'move-{move_id}', 'power': rng.choice([None, 10, 40, 90, 150]),
+                                 'type': rng.choice(TYPES), 'damage_class': rng.choice(['physical', 'special'])}
+             for move_id in range(count)}
+    move_handler = Mock(wraps=MoveHandler(Mock()))
+    move_handler.get_move_data.side_effect = moves.__getitem__
+    return move_handler
@@ -15,15 +15,34 @@ def test_successful_get(api_client):
     mock_response.json.return_value = {"name": "pikachu"}
     mock_response.raise_for_status.return_value = None
 
-    with patch('requests.get', return_value=mock_response) as mock_get:
+    with patch('requests.Session.get', return_value=mock_response) as mock_get:
         result = api_client.get("pokemon/pikachu")
 
         assert result == {"name": "pikachu"}
-        mock_get.assert_called_once_with("https://test-api.com/pokemon/pikachu")
+        mock_get.assert_called_once_with("https://test-api.com/pokemon/pikachu", timeout=api_client.timeout)
 
 
 def test_timeout_error(api_client):
-    with patch('requests.get', side_effect=requests.Timeout):
+    with patch('requests.Session.get', side_effect=requests.Timeout):
         with pytest.raises(PokemonAPIException, match="Request timed out"):
             api_client.get("pokemon/pikachu")
 
+
+def test_http_error_keeps_status_code(api_client):
+    mock_response = Mock(status_code=404)
+    mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found", response=mock_response)
+
+    with patch('requests.Session.get', return_value=mock_response):
+        with pytest.raises(PokemonAPIException) as exc_info:
+            api_client.get("move/not-exists")
+
+    assert exc_info.value.status_code == 404, "move lookups rely on the status code to detect unknown moves"
+
+
+def test_pokemon_not_found(api_client):
+    mock_response = Mock(status_code=404)
+    mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found", response=mock_response)
+
+    with patch('requests.Session.get', return_value=mock_response):
+        with pytest.raises(PokemonNotFoundException):
+            api_client.get("pokemon/not-exists")
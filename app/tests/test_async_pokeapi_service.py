@@ -0,0 +1,163 @@
+import asyncio
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from app.cache.records import SpeciesRecord
+from app.exceptions import MoveNotFoundException, PokemonAPIException, PokemonNotFoundException
+from app.services.async_pokeapi_service import AsyncPokeAPIService
+from app.services.background_refresh import BackgroundRefresher
+from app.services.data_tranformer import PokemonDataTransformer
+from app.services.event_loop import BackgroundEventLoop
+
+
+class ConcurrencyTrackingClient:
+    """Fake AsyncAPIClient that records how many requests were in flight at once."""
+
+    def __init__(self, failing_endpoints=()):
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requested = []
+        self.failing_endpoints = failing_endpoints
+
+    async def get_raw(self, endpoint: str) -> bytes:
+        return json.dumps(await self.get(endpoint)).encode()
+
+    async def get(self, endpoint: str) -> dict:
+        self.requested.append(endpoint)
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if endpoint in self.failing_endpoints:
+            raise PokemonAPIException("Not found", status_code=404)
+
+        kind, name = endpoint.split('/')
+        if kind == 'move':
+            return {'name': name, 'power': 40, 'type': {'name': 'normal'}, 'damage_class': {'name': 'physical'}}
+        return {
+            'id': 1,
+            'name': name,
+            'types': [{'type': {'name': 'normal'}}],
+            'moves': [{'move': {'name': f'{name}-move-a'}}, {'move': {'name': f'{name}-move-b'}}],
+            'stats': [{'base_stat': 50, 'stat': {'name': 'hp'}}]
+        }
+
+
+@pytest.fixture
+def cache_manager():
+    cache = {}
+    manager = Mock()
+    manager.get_pokemon_data.side_effect = lambda name: cache.get(f'pokemon_{name}')
+    manager.set_pokemon_data.side_effect = lambda name, data: cache.__setitem__(f'pokemon_{name}', data)
+    manager.get_move_data.side_effect = lambda name: cache.get(f'move_{name}')
+    manager.set_move_data.side_effect = lambda name, data: cache.__setitem__(f'move_{name}', data)
+    return manager
+
+
+def build_service(cache_manager, api_client):
+    return AsyncPokeAPIService(cache_manager=cache_manager, url_mapper=Mock(), api_client=api_client,
+                               data_transformer=PokemonDataTransformer(), event_loop=BackgroundEventLoop())
+
+
+def test_battle_data_is_fetched_concurrently(cache_manager):
+    api_client = ConcurrencyTrackingClient()
+    service = build_service(cache_manager, api_client)
+
+    pokemon1_data, pokemon2_data = service.fetch_battle_data('pikachu', 'eevee')
+
+    assert isinstance(pokemon1_data, SpeciesRecord)
+    assert pokemon2_data.name == 'eevee'
+    assert len(api_client.requested) == 6, "two species and two moves each"
+    assert api_client.peak_in_flight == 4, "all four moves should be requested at the same time"
+    assert cache_manager.get_move_data('eevee-move-b')['power'] == 40, "moves are cached for the simulation"
+
+
+def test_battle_data_ignores_move_failures(cache_manager):
+    api_client = ConcurrencyTrackingClient(failing_endpoints={'move/pikachu-move-a'})
+    service = build_service(cache_manager, api_client)
+
+    pokemon1_data, _ = service.fetch_battle_data('pikachu', 'eevee')
+
+    assert pokemon1_data.name == 'pikachu'
+    assert cache_manager.get_move_data('pikachu-move-a') is None
+
+
+def test_unknown_pokemon_is_raised_through_facade(cache_manager):
+    service = build_service(cache_manager, ConcurrencyTrackingClient())
+    service.url_mapper.get_pokemon_url.side_effect = PokemonNotFoundException('missingno')
+
+    with pytest.raises(PokemonNotFoundException):
+        service.fetch_battle_data('pikachu', 'missingno')
+
+
+def running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def test_url_lookup_runs_off_the_event_loop(cache_manager):
+    service = build_service(cache_manager, ConcurrencyTrackingClient())
+    loops = []
+    service.url_mapper.get_pokemon_url.side_effect = lambda name: loops.append(running_loop())
+
+    service.fetch_battle_data('pikachu', 'eevee')
+
+    assert loops == [None, None], "a blocking index refresh must not stall the loop"
+
+
+def record_loops(method, loops):
+    call = method.side_effect
+
+    def recording_call(*args):
+        loops.append(running_loop())
+        return call(*args)
+
+    method.side_effect = recording_call
+
+
+def test_cache_reads_and_writes_run_off_the_event_loop(cache_manager):
+    service = build_service(cache_manager, ConcurrencyTrackingClient())
+    loops = []
+    for method in (cache_manager.get_pokemon_data, cache_manager.set_pokemon_data,
+                   cache_manager.get_move_data, cache_manager.set_move_data):
+        record_loops(method, loops)
+
+    service.fetch_battle_data('pikachu', 'eevee')
+    service.fetch_battle_data('pikachu', 'eevee')
+
+    assert len(loops) > 12 and set(loops) == {None}, "a slow shared-cache write must not stall the loop"
+
+
+def test_move_list_is_fetched_concurrently_in_order(cache_manager):
+    api_client = ConcurrencyTrackingClient(failing_endpoints={'move/growl'})
+    service = build_service(cache_manager, api_client)
+
+    tackle, growl, ember = service.fetch_move_list(['tackle', 'growl', 'ember'])
+
+    assert (tackle['name'], ember['name']) == ('tackle', 'ember')
+    assert isinstance(growl, MoveNotFoundException)
+    assert api_client.peak_in_flight == 3
+
+
+def test_stale_refresh_uses_a_value_another_worker_already_stored(cache_manager):
+    api_client = ConcurrencyTrackingClient()
+    service = build_service(cache_manager, api_client)
+    service.refresher = BackgroundRefresher(max_workers=1)
+    fresh = {'name': 'thunder', 'power': 110, 'type': 'electric', 'damage_class': 'special'}
+    cache_manager.get_move_entry.side_effect = lambda name: ({'name': 'thunder', 'power': 100}, True)
+    cache_manager.get_move_data.side_effect = lambda name: fresh
+
+    stale = service.event_loop.run(service.get_move_data('thunder'))
+    deadline = time.monotonic() + 5
+    while service.refresher.stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert stale['power'] == 100
+    assert api_client.requested == [], "the refresh found the shared cache already refreshed"
+    cache_manager.set_move_data.assert_not_called()
@@ -0,0 +1,83 @@
+import random
+from unittest.mock import Mock
+
+import numpy as np
+
+from app.battle_logic.batch_simulation import UNDECIDED, BatchBattleSimulation, MatchupBatch, build_matchups
+from app.battle_logic.battle_simulation import DRAW, ITERATIVE, BattleSimulation
+from app.battle_logic.move_handler import BestDamageMoveHandler, MoveHandler
+from app.battle_logic.type_effectiveness import TypeEffectiveness, defender_type_index
+from app.models import Pokemon
+from app.tests.factories import TYPES, move_handler_for, random_pokemon
+
+def test_batch_results_match_the_scalar_engine():
+    rng = random.Random(7)
+    move_handler = move_handler_for(rng, 200)
+    type_effectiveness = TypeEffectiveness()
+    pokemon = [random_pokemon(rng, pokemon_id) for pokemon_id in range(200)]
+    pairs = [(rng.choice(pokemon), rng.choice(pokemon)) for _ in range(500)]
+
+    result = BatchBattleSimulation().simulate(build_matchups(pairs, move_handler, type_effectiveness))
+
+    scalar = BattleSimulation(type_effectiveness, move_handler)
+    for index, (pokemon1, pokemon2) in enumerate(pairs):
+        pokemon1, pokemon2 = pokemon1.model_copy(), pokemon2.model_copy()
+        winner, battle_log = scalar.simulate_battle(pokemon1, pokemon2)
+
+        assert result.winner[index] == (0 if winner == pokemon1.name else 1)
+        assert result.turns[index] == len(battle_log)
+        assert (result.hp1[index], result.hp2[index]) == (pokemon1.hp, pokemon2.hp)
+
+
+def test_batch_results_match_the_scalar_engine_with_per_defender_moves():
+    rng = random.Random(11)
+    moves = {f'move-{move_id}': {'name': f'move-{move_id}', 'power': rng.choice([None, 10, 40, 90, 150]),
+                                 'type': rng.choice(TYPES + ['shadow']),
+                                 'damage_class': rng.choice(['physical', 'special'])}
+             for move_id in range(40)}
+    service = Mock()
+    service.get_move_data.side_effect = moves.__getitem__
+    move_handler = BestDamageMoveHandler(service)
+    type_effectiveness = TypeEffectiveness()
+    pokemon = [random_pokemon(rng, pokemon_id) for pokemon_id in range(60)]
+    pokemon[0].types = ['fire', 'water', 'grass']
+    pokemon[1].types = ['shadow']
+    for index, species in enumerate(pokemon):
+        species.moves = rng.sample(list(moves), rng.randint(0, 4))
+        species.type_index = defender_type_index(species.types) if index % 3 else None
+    pairs = [(rng.choice(pokemon), rng.choice(pokemon)) for _ in range(300)]
+
+    result = BatchBattleSimulation().simulate(build_matchups(pairs, move_handler, type_effectiveness))
+
+    scalar = BattleSimulation(type_effectiveness, move_handler)
+    for index, (pokemon1, pokemon2) in enumerate(pairs):
+        pokemon1, pokemon2 = pokemon1.model_copy(), pokemon2.model_copy()
+        winner, battle_log = scalar.simulate_battle(pokemon1, pokemon2)
+
+        assert result.winner[index] == (UNDECIDED if winner == DRAW else 0 if winner == pokemon1.name else 1)
+        assert result.turns[index] == len(battle_log) - (winner == DRAW), "a draw ends with the draw message"
+        assert (result.hp1[index], result.hp2[index]) == (pokemon1.hp, pokemon2.hp)
+
+
+def test_battles_without_damage_stop_at_the_turn_budget():
+    batch = MatchupBatch(hp1=np.array([10, 10]), hp2=np.array([10, 5]), damage1=np.array([0, 5]),
+                         damage2=np.array([0, 0]))
+
+    result = BatchBattleSimulation(max_turns=50).simulate(batch)
+
+    assert result.winner.tolist() == [UNDECIDED, 0]
+    assert result.turns.tolist() == [50, 1]
+
+
+def test_default_turn_budget_matches_the_scalar_engine():
+    pokemon1 = Pokemon(id=1, name='a', hp=10, attack=10, defense=10, special_attack=10, special_defense=10,
+                       speed=10, types=['normal'], moves=[])
+    pokemon2 = pokemon1.model_copy(update={'id': 2, 'name': 'b'})
+    batch = MatchupBatch(hp1=np.array([10]), hp2=np.array([10]), damage1=np.array([0]), damage2=np.array([0]))
+
+    result = BatchBattleSimulation().simulate(batch)
+    winner, battle_log = BattleSimulation(TypeEffectiveness(), MoveHandler(Mock()), resolution=ITERATIVE,
+                                          max_seconds=0).simulate_battle(pokemon1, pokemon2)
+
+    assert winner == DRAW and result.winner.tolist() == [UNDECIDED]
+    assert result.turns.tolist() == [len(battle_log) - 1], "every turn of the budget, then the draw message"
@@ -0,0 +1,97 @@
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+from app.battle_logic.battle_record import BattleRecord
+from app.battle_logic.battle_simulation import ANALYTIC, ITERATIVE, STOCHASTIC
+from app.database import db
+from app.database.models import Battle
+from app.repositories.battle_repository import BattleRepository
+from app.tests.factories import build_simulation, make_pokemon
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'battles.db'}"
+    db.init_app(app)
+    return app
+
+
+@pytest.mark.parametrize('resolution', [ANALYTIC, ITERATIVE, STOCHASTIC])
+@pytest.mark.parametrize('hp1, attack1, hp2, attack2, max_turns', [
+    (100, 30, 100, 20, 1000), (35, 7, 90, 12, 1000), (90, 12, 35, 7, 1000), (255, 1, 255, 1, 40), (80, 0, 80, 0, 50)
+])
+def test_record_renders_the_simulated_log(resolution, hp1, attack1, hp2, attack2, max_turns):
+    simulation = build_simulation(resolution, max_turns=max_turns)
+    pokemon1, pokemon2 = make_pokemon('a', hp1, attack1), make_pokemon('b', hp2, attack2, speed=20)
+
+    outcome, record = simulation.record_battle(pokemon1, pokemon2, seed=5)
+    decoded = BattleRecord.decode(record.encode())
+    winner, battle_log = simulation.simulate_battle(pokemon1, pokemon2, seed=5)
+
+    assert decoded == record
+    assert (outcome.winner, list(decoded.iter_log())) == (winner, battle_log)
+    assert record.final_hp == (outcome.hp1, outcome.hp2) == (pokemon1.hp, pokemon2.hp)
+
+
+def test_deterministic_records_stay_small():
+    simulation = build_simulation(ANALYTIC, max_turns=100000)
+
+    outcome, record = simulation.record_battle(make_pokemon('a', 255, 1), make_pokemon('b', 255, 1))
+
+    assert outcome.turns == 509
+    assert record.runs == ((1, 255), (1, 254))
+    assert len(record.encode()) < 50 < len('\n'.join(record.iter_log())) // 100
+
+
+def test_typical_records_take_a_byte_per_number():
+    record = BattleRecord.from_events('a', 'b', 200, 30, [(0, 20, 10), (1, 150, 50), (0, 10, 0)])
+
+    assert record.runs == ((20, 1, 10, 1), (150, 1))
+    assert len(record.encode()) == 1 + 7 + 6 + len('ab')
+    assert BattleRecord.decode(record.encode()) == record
+
+
+def test_battles_store_records_and_read_legacy_logs(app):
+    record = BattleRecord.from_events('a', 'b', 30, 30, [(0, 20, 10), (1, 5, 25), (0, 10, 0)])
+    with app.app_context():
+        db.create_all()
+        BattleRepository.create_battle(1, 2, 'a', record)
+        legacy = Battle(pokemon1_id=1, pokemon2_id=2, winner='a')
+        legacy.set_battle_log(['first', 'second'])
+        db.session.add(legacy)
+        db.session.commit()
+
+        stored, legacy = db.session.scalars(sa.select(Battle).order_by(Battle.id)).all()
+
+        assert stored.get_battle_log() == ["a dealt 20 damage to b. Remaining HP: 10",
+                                           "b dealt 5 damage to a. Remaining HP: 25",
+                                           "a dealt 10 damage to b. Remaining HP: 0"]
+        assert legacy.get_battle_log() == ['first', 'second']
+
+
+def test_record_column_is_added_to_an_existing_table(app):
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(sa.text('CREATE TABLE battles (id INTEGER PRIMARY KEY, pokemon1_id INTEGER NOT NULL, '
+                                       'pokemon2_id INTEGER NOT NULL, winner VARCHAR(50) NOT NULL, '
+                                       'battle_log TEXT NOT NULL)'))
+            connection.execute(sa.text("INSERT INTO battles VALUES (1, 1, 2, 'a', 'old log')"))
+
+        BattleRepository.ensure_record_column()
+        BattleRepository.ensure_record_column()
+
+        assert 'battle_record' in {column['name'] for column in sa.inspect(db.engine).get_columns('battles')}
+        assert db.session.get(Battle, 1).get_battle_log() == ['old log']
+
+
+def test_long_records_are_compressed():
+    simulation = build_simulation(STOCHASTIC, max_turns=5000)
+
+    outcome, record = simulation.record_battle(make_pokemon('a', 2000, 3), make_pokemon('b', 2000, 3), seed=1)
+    payload = record.encode()
+
+    assert payload[0] & 4, "compressed flag"
+    assert BattleRecord.decode(payload) == record
+    assert len(payload) < (len(record.runs[0]) + len(record.runs[1])) // 2, "under a byte per run"
@@ -0,0 +1,113 @@
+import itertools
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.battle_logic.battle_simulation import ANALYTIC, DRAW, ITERATIVE, STOCHASTIC, BattleSimulation
+from app.battle_logic.move_handler import MoveHandler
+from app.battle_logic.type_effectiveness import TypeEffectiveness
+from app.cache.bounded_cache import BoundedCache
+from app.models import PokemonData
+from app.services.battle_service import BattleService
+from app.services.data_tranformer import PokemonDataTransformer
+
+
+def species(pokemon_id, name, move, attack=50):
+    return PokemonData(id=pokemon_id, name=name, types=['normal'], moves=[move],
+                       stats={'hp': 100, 'attack': attack, 'defense': 50, 'special-attack': 50,
+                              'special-defense': 50, 'speed': 50})
+
+
+@pytest.fixture
+def data():
+    return {
+        'species': {'bulbasaur': species(1, 'bulbasaur', 'tackle'), 'charmander': species(4, 'charmander', 'ember')},
+        'moves': {'tackle': {'name': 'tackle', 'power': 40, 'type': 'normal', 'damage_class': 'physical'},
+                  'ember': {'name': 'ember', 'power': 40, 'type': 'fire', 'damage_class': 'special'}},
+    }
+
+
+@pytest.fixture
+def battle_service(data):
+    pokeapi_service = Mock()
+    pokeapi_service.get_pokemon_data.side_effect = lambda name: data['species'][name]
+    pokeapi_service.get_move_data.side_effect = lambda name: data['moves'][name]
+    pokeapi_service.transform_pokemon_data.side_effect = PokemonDataTransformer().transform_to_pokemon
+    simulation = BattleSimulation(TypeEffectiveness(), MoveHandler(pokeapi_service), resolution=ANALYTIC)
+    simulation.record_battle = Mock(wraps=simulation.record_battle)
+    return BattleService(pokeapi_service, simulation, result_cache=BoundedCache(max_entries=16))
+
+
+@pytest.fixture(autouse=True)
+def repository():
+    with patch('app.services.battle_service.BattleRepository') as repository:
+        yield repository
+
+
+def test_repeated_battles_reuse_the_result(battle_service, repository):
+    first = battle_service.create_battle('bulbasaur', 'charmander')
+    second = battle_service.create_battle('bulbasaur', 'charmander')
+
+    assert second == first
+    assert battle_service.battle_simulation.record_battle.call_count == 1
+    assert repository.create_battle.call_count == 2, "every battle is still recorded"
+
+
+def test_matchups_are_ordered(battle_service):
+    battle_service.create_battle('bulbasaur', 'charmander')
+    battle_service.create_battle('charmander', 'bulbasaur')
+
+    assert battle_service.battle_simulation.record_battle.call_count == 2
+
+
+@pytest.mark.parametrize('change', [
+    lambda data: data['species'].update(bulbasaur=species(1, 'bulbasaur', 'tackle', attack=90)),
+    lambda data: data['moves'].update(tackle={'name': 'tackle', 'power': 60, 'type': 'normal',
+                                              'damage_class': 'physical'}),
+])
+def test_data_changes_invalidate_the_result(battle_service, data, change):
+    battle_service.create_battle('bulbasaur', 'charmander')
+    change(data)
+    battle_service.create_battle('bulbasaur', 'charmander')
+
+    assert battle_service.battle_simulation.record_battle.call_count == 2
+
+
+def test_rule_version_is_part_of_the_key(battle_service):
+    battle_service.create_battle('bulbasaur', 'charmander')
+    with patch('app.services.battle_service.RULE_VERSION', -1):
+        battle_service.create_battle('bulbasaur', 'charmander')
+
+    assert battle_service.battle_simulation.record_battle.call_count == 2
+
+
+def test_stochastic_battles_are_not_memoized(battle_service):
+    battle_service.battle_simulation.resolution = STOCHASTIC
+    battle_service.create_battle('bulbasaur', 'charmander')
+    battle_service.create_battle('bulbasaur', 'charmander')
+
+    assert battle_service.battle_simulation.record_battle.call_count == 2
+    assert len(battle_service.result_cache) == 0
+
+
+def test_streamed_battles_share_the_result_cache(battle_service, repository):
+    result = battle_service.create_battle('bulbasaur', 'charmander')
+    summary, battle_log = battle_service.start_battle('bulbasaur', 'charmander')
+
+    assert (summary.winner, list(battle_log)) == (result.winner, result.battle_log)
+    assert battle_service.battle_simulation.record_battle.call_count == 1
+    assert repository.create_battle.call_count == 2
+
+
+def test_battles_cut_short_by_the_time_budget_are_not_memoized(battle_service):
+    simulation = battle_service.battle_simulation
+    simulation.resolution, simulation.max_seconds = ITERATIVE, 1e-9
+
+    # Every clock read is a second later, so the battle stops before its first turn.
+    with patch('app.battle_logic.battle_simulation.time.monotonic', side_effect=itertools.count()):
+        first = battle_service.create_battle('bulbasaur', 'charmander')
+        battle_service.create_battle('bulbasaur', 'charmander')
+
+    assert first.winner == DRAW
+    assert simulation.record_battle.call_count == 2
+    assert len(battle_service.result_cache) == 0
@@ -1,8 +1,11 @@
 from unittest.mock import Mock
 
-from app.battle_logic.battle_simulation import BattleSimulation
+import pytest
+
+from app.battle_logic.battle_simulation import ANALYTIC, DRAW, ITERATIVE, STOCHASTIC, BattleSimulation
 
 from app.models import Pokemon
+from app.tests.factories import build_simulation, make_pokemon
 
 
 def test_battle_simulation_creates_detailed_log():
@@ -51,3 +54,109 @@ def test_battle_simulation_creates_detailed_log():
     # Verify log contains expected entries
     assert len(log) == 1, "after one hit the HP of pokemon 2 is -1, so the battle should end"
     assert winner == "Charizard", "Charizard should win the battle because Venusaur's HP is -1 after one hit"
+
+
+@pytest.mark.parametrize('hp1, attack1, hp2, attack2', [
+    (100, 30, 100, 30), (35, 7, 90, 12), (90, 12, 35, 7), (1, 1, 255, 1), (255, 50, 1, 1), (20, 20, 20, 20)
+])
+def test_analytic_resolution_matches_turn_by_turn(hp1, attack1, hp2, attack2):
+    expected = build_simulation(ITERATIVE).simulate_battle(make_pokemon('a', hp1, attack1, ['tackle']),
+                                                           make_pokemon('b', hp2, attack2, ['tackle']))
+    pokemon1, pokemon2 = make_pokemon('a', hp1, attack1, ['tackle']), make_pokemon('b', hp2, attack2, ['tackle'])
+
+    result = build_simulation(ANALYTIC).simulate_battle(pokemon1, pokemon2)
+
+    assert result == expected
+    assert 0 in (pokemon1.hp, pokemon2.hp)
+
+
+def test_analytic_resolution_skips_the_log_on_request():
+    simulation = build_simulation(ANALYTIC)
+
+    winner, battle_log = simulation.simulate_battle(make_pokemon('a', 100, 30, ['tackle']),
+                                                    make_pokemon('b', 100, 20, ['tackle']), with_log=False)
+    outcome = simulation.resolve_battle(make_pokemon('a', 100, 30, ['tackle']), make_pokemon('b', 100, 20, ['tackle']))
+
+    assert (winner, battle_log) == ('a', [])
+    assert outcome.turns == 7 and outcome.hp1 == 40
+
+
+@pytest.mark.parametrize('resolution', [ANALYTIC, ITERATIVE])
+def test_battle_without_moves_is_a_draw(resolution):
+    winner, battle_log = build_simulation(resolution, max_turns=50).simulate_battle(
+        make_pokemon('a', 100, 30, []), make_pokemon('b', 100, 30, []))
+
+    assert winner == DRAW
+    assert battle_log[-1].endswith("It is a draw.")
+
+
+def test_analytic_resolution_of_a_battle_without_damage():
+    pokemon1, pokemon2 = make_pokemon('a', 100, 30, []), make_pokemon('b', 80, 30, [])
+    expected = build_simulation(ITERATIVE, max_turns=50).simulate_battle(make_pokemon('a', 100, 30, []),
+                                                                          make_pokemon('b', 80, 30, []))
+
+    outcome = build_simulation(ANALYTIC, max_turns=50).resolve_battle(pokemon1, pokemon2)
+
+    assert outcome == (DRAW, 50, 100, 80, 0, 0)
+    assert build_simulation(ANALYTIC, max_turns=50).simulate_battle(pokemon1, pokemon2) == expected
+
+
+@pytest.mark.parametrize('resolution', [ANALYTIC, ITERATIVE])
+def test_turn_budget_ends_long_battles_in_a_draw(resolution):
+    winner, battle_log = build_simulation(resolution, max_turns=10).simulate_battle(
+        make_pokemon('a', 255, 1, ['tackle']), make_pokemon('b', 255, 1, ['tackle']))
+
+    assert winner == DRAW
+    assert len(battle_log) == 11, "ten turns and the draw message"
+
+
+@pytest.mark.parametrize('resolution', [ANALYTIC, ITERATIVE, STOCHASTIC])
+@pytest.mark.parametrize('hp1, attack1, hp2, attack2, max_turns', [
+    (100, 30, 100, 20, 1000), (35, 7, 90, 12, 1000), (255, 1, 255, 1, 40), (80, 0, 80, 0, 1000)
+])
+def test_play_battle_matches_simulate_battle(resolution, hp1, attack1, hp2, attack2, max_turns):
+    simulation = build_simulation(resolution, max_turns=max_turns)
+    pokemon1, pokemon2 = make_pokemon('a', hp1, attack1, ['tackle']), make_pokemon('b', hp2, attack2, ['tackle'])
+
+    outcome, battle_log = simulation.play_battle(pokemon1, pokemon2, seed=3)
+    assert (pokemon1.hp, pokemon2.hp) == (hp1, hp2), "play_battle leaves the Pokemon untouched"
+    battle_log = list(battle_log)
+    expected = simulation.simulate_battle(pokemon1, pokemon2, seed=3)
+
+    assert (outcome.winner, battle_log) == expected
+    assert (outcome.hp1, outcome.hp2) == (pokemon1.hp, pokemon2.hp)
+    assert outcome.turns == len(battle_log) - (outcome.winner == DRAW)
+
+
+@pytest.mark.parametrize('resolution', [ANALYTIC, ITERATIVE])
+def test_play_battle_log_is_generated_lazily(resolution):
+    simulation = build_simulation(resolution, max_turns=100000)
+    pokemon1, pokemon2 = make_pokemon('a', 255, 1, ['tackle']), make_pokemon('b', 255, 1, ['tackle'])
+
+    outcome, battle_log = simulation.play_battle(pokemon1, pokemon2)
+
+    assert outcome.winner == 'a' and outcome.turns == 509
+    assert next(battle_log) == "a dealt 1 damage to b. Remaining HP: 254"
+
+
+@pytest.mark.parametrize('resolution', [ANALYTIC, ITERATIVE])
+def test_moves_are_resolved_once_per_battle(resolution):
+    simulation = build_simulation(resolution, max_turns=100000)
+
+    winner, battle_log = simulation.simulate_battle(make_pokemon('a', 255, 1, ['tackle']),
+                                                    make_pokemon('b', 255, 1, ['tackle']))
+
+    assert (winner, len(battle_log)) == ('a', 509)
+    assert simulation.move_handler.select_move.call_count == 2
+    assert simulation.move_handler.get_move_data.call_count == 2
+    assert simulation.type_effectiveness_service.get_type_effectiveness.call_count == 2
+
+
+def test_compile_damage():
+    simulation = build_simulation(ANALYTIC)
+    simulation.type_effectiveness_service.get_type_effectiveness.return_value = 2.0
+
+    profile = simulation.compile_damage(make_pokemon('a', 100, 30, ['tackle']), make_pokemon('b', 100, 30, []))
+
+    assert profile == ('tackle', 2.0, 60)
+    assert simulation.compile_damage(make_pokemon('b', 100, 30, []), make_pokemon('a', 100, 30, [])).damage == 0
@@ -0,0 +1,124 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+from app.battle_logic.battle_record import BattleRecord
+from app.database import db
+from app.database.models import Battle
+from app.repositories.battle_repository import BattleRepository
+from app.repositories.battle_writer import BattleWriteBehind
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'battles.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def row(index):
+    return {'pokemon1_id': index, 'pokemon2_id': index + 1, 'winner': f'pokemon-{index}', 'battle_log': 'log'}
+
+
+def stored(app):
+    with app.app_context():
+        return db.session.scalar(sa.select(sa.func.count()).select_from(Battle))
+
+
+def test_rows_are_written_in_batches(app):
+    writer = BattleWriteBehind(app, batch_size=100, flush_interval=5)
+
+    for index in range(250):
+        writer.submit(row(index))
+    writer.close()
+
+    assert stored(app) == 250
+    assert writer.stats()['batches'] == 3
+    assert writer.stats()['written'] == 250
+
+
+def test_partial_batches_are_written_after_the_flush_interval(app):
+    writer = BattleWriteBehind(app, batch_size=100, flush_interval=0.05)
+
+    writer.submit(row(1))
+    writer.submit(row(2))
+
+    deadline = time.monotonic() + 5
+    while stored(app) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert stored(app) == 2
+    writer.close()
+
+
+def test_full_queue_blocks_then_writes_inline(app):
+    writer = BattleWriteBehind(app, max_queue=1, batch_size=1, flush_interval=0, put_timeout=0.01)
+    release = threading.Event()
+    write = writer._write
+
+    def slow_write(batch):
+        if threading.current_thread().name == 'battle-writer':
+            release.wait(5)
+        write(batch)
+
+    with patch.object(writer, '_write', side_effect=slow_write):
+        for index in range(5):
+            writer.submit(row(index))
+        stats = writer.stats()
+        release.set()
+        writer.close()
+
+    assert stats['blocked'] >= 1 and stats['direct'] >= 1
+    assert stored(app) == 5
+
+
+def test_rows_submitted_after_close_are_written_inline(app):
+    writer = BattleWriteBehind(app)
+    writer.close()
+
+    writer.submit(row(1))
+
+    assert stored(app) == 1
+    assert writer.stats()['queued'] == 0
+
+
+def test_repository_uses_the_write_behind_queue(app):
+    record = BattleRecord.from_events('bulbasaur', 'charmander', 30, 30, [(0, 20, 10), (1, 5, 25), (0, 10, 0)])
+    writer = BattleWriteBehind(app, flush_interval=0.01)
+    with patch.object(BattleRepository, 'write_behind', writer):
+        BattleRepository.create_battle(1, 4, 'bulbasaur', record)
+        writer.flush()
+
+    with app.app_context():
+        battle = db.session.scalar(sa.select(Battle))
+        assert (battle.winner, battle.get_battle_log()) == ('bulbasaur', list(record.iter_log()))
+    writer.close()
+
+
+def test_failed_batches_are_logged_and_retried_row_by_row(app, caplog):
+    writer = BattleWriteBehind(app, batch_size=3, flush_interval=5)
+    rows = [row(1), dict(row(2), winner=None), row(3)]
+
+    for battle in rows:
+        writer.submit(battle)
+    writer.close()
+
+    assert stored(app) == 2, "only the row the database rejects is dropped"
+    assert (writer.stats()['written'], writer.stats()['failed']) == (2, 1)
+    assert "retrying them one at a time" in caplog.text
+    assert "Dropping battle 2 vs 3" in caplog.text
+
+
+def test_inline_writes_raise_database_errors(app):
+    writer = BattleWriteBehind(app)
+    writer.close()
+
+    with pytest.raises(sa.exc.IntegrityError):
+        writer.submit(dict(row(1), winner=None))
+    assert stored(app) == 0
@@ -1,5 +1,8 @@
+import json
+
 import pytest
 from app.services.data_tranformer import PokemonDataTransformer
+from app.services.payload_parser import select_fields
 from app.models import PokemonData, Pokemon
 
 
@@ -55,4 +58,55 @@ def test_extract_stats_empty_data():
 
 def test_extract_stats_missing_stats():
     result = PokemonDataTransformer._extract_stats({"other_field": "value"})
-    assert result == {}
\ No newline at end of file
+    assert result == {}
+
+def test_transform_raw_matches_full_parse(sample_raw_data):
+    raw = json.dumps(sample_raw_data).encode()
+
+    result = PokemonDataTransformer.transform_raw_to_pokemon_data(raw)
+
+    assert result == PokemonDataTransformer.transform_to_pokemon_data(sample_raw_data)
+    assert result.moves == ["thunder", "quick-attack", "thunderbolt", "volt-tackle"]
+
+
+def test_transform_raw_ignores_nested_keys_after_moves(sample_raw_data):
+    payload = {
+        "id": 25,
+        "moves": sample_raw_data["moves"],
+        "name": "pikachu",
+        "species": {"name": "not-the-name", "stats": []},
+        "stats": sample_raw_data["stats"],
+        "types": sample_raw_data["types"],
+        "sprites": {"types": [], "name": "sprite"}
+    }
+
+    result = PokemonDataTransformer.transform_raw_to_pokemon_data(json.dumps(payload, indent=2))
+
+    assert result.name == "pikachu", "keys of nested objects must not be mistaken for top-level fields"
+    assert result.types == ["electric"]
+    assert result.stats["speed"] == 90
+
+
+@pytest.mark.parametrize("separators", [(" , ", " : "), (",\n", "\t:\t")])
+def test_transform_raw_accepts_whitespace_around_separators(sample_raw_data, separators):
+    # Fields after the truncated moves list are found from the end of the document
+    payload = {key: sample_raw_data[key] for key in ("id", "moves", "name", "stats", "types")}
+
+    result = PokemonDataTransformer.transform_raw_to_pokemon_data(json.dumps(payload, separators=separators),
+                                                                   moves_limit=2)
+
+    assert result == PokemonDataTransformer.transform_to_pokemon_data(payload, moves_limit=2)
+    assert result.name == "pikachu"
+
+
+def test_select_fields_stops_after_list_limit():
+    raw = '{"moves": [1, 2, 3, {"broken": ], "name": "pikachu"}'
+
+    result = select_fields(raw, ("moves",), list_limits={"moves": 2})
+
+    assert result == {"moves": [1, 2]}, "the rest of a truncated list is never decoded"
+
+
+def test_transform_raw_falls_back_to_full_parse_for_malformed_input():
+    with pytest.raises(ValueError):
+        PokemonDataTransformer.transform_raw_to_pokemon_data(b'{"id": 25, "name": }')
@@ -0,0 +1,93 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.cache.http_cache import DiskHTTPCache
+from app.services.api_client import APIClient
+from app.services.async_api_client import AsyncAPIClient
+
+URL = "https://test-api.com/pokemon/pikachu"
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    return DiskHTTPCache(str(tmp_path / "http_cache.sqlite"), max_bytes=1024, freshness_seconds=60)
+
+
+def network_response(body=b'{"name": "pikachu"}', status_code=200, headers=None):
+    response = Mock(status_code=status_code, content=body, headers=headers or {})
+    response.json.return_value = {"name": "pikachu"}
+    response.raise_for_status.return_value = None
+    return response
+
+
+def test_store_and_get(http_cache):
+    http_cache.store(URL, b'{"name": "pikachu"}', '"abc"', None)
+
+    entry = http_cache.get(URL)
+
+    assert entry.body == b'{"name": "pikachu"}'
+    assert http_cache.is_fresh(entry)
+    assert http_cache.conditional_headers(entry) == {'If-None-Match': '"abc"'}
+
+
+def test_cache_is_shared_between_instances(http_cache):
+    http_cache.store(URL, b'{}', None, 'Wed, 21 Oct 2015 07:28:00 GMT')
+
+    other_worker_cache = DiskHTTPCache(http_cache.path)
+
+    assert other_worker_cache.get(URL).last_modified == 'Wed, 21 Oct 2015 07:28:00 GMT'
+
+
+def test_least_recently_used_entries_are_evicted_by_size(http_cache):
+    http_cache.store("https://test-api.com/a", b'a' * 600, None, None)
+    http_cache.store("https://test-api.com/b", b'b' * 600, None, None)
+
+    assert http_cache.get("https://test-api.com/a") is None, "total size is bounded by max_bytes"
+    assert http_cache.get("https://test-api.com/b") is not None
+    assert http_cache.stats()['evictions'] == 1
+
+
+def test_fresh_entry_skips_the_network(http_cache):
+    api_client = APIClient(base_url="https://test-api.com", http_cache=http_cache)
+
+    with patch('requests.Session.get', return_value=network_response(headers={'ETag': '"v1"'})) as mock_get:
+        api_client.get("pokemon/pikachu")
+        result = api_client.get("pokemon/pikachu")
+
+    assert result == {"name": "pikachu"}
+    assert mock_get.call_count == 1
+
+
+def test_stale_entry_is_revalidated(http_cache):
+    http_cache.freshness_seconds = 0
+    http_cache.store(URL, b'{"name": "pikachu"}', '"v1"', None)
+    api_client = APIClient(base_url="https://test-api.com", http_cache=http_cache)
+
+    with patch('requests.Session.get', return_value=network_response(body=b'', status_code=304)) as mock_get:
+        result = api_client.get_raw("pokemon/pikachu")
+
+    assert result == b'{"name": "pikachu"}', "a 304 is answered from the cached body"
+    assert mock_get.call_args.kwargs['headers'] == {'If-None-Match': '"v1"'}
+    assert http_cache.stats()['revalidated'] == 1
+
+
+def test_async_client_reads_the_cache_off_the_event_loop(http_cache):
+    http_cache.store(URL, b'{"name": "pikachu"}', None, None)
+    api_client = AsyncAPIClient(base_url="https://test-api.com", http_cache=http_cache)
+    loops = []
+    get = http_cache.get
+
+    def tracking_get(url):
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return get(url)
+
+    with patch.object(http_cache, 'get', side_effect=tracking_get):
+        result = asyncio.run(api_client.get_raw("pokemon/pikachu"))
+
+    assert result == b'{"name": "pikachu"}'
+    assert loops == [None], "SQLite reads run on the executor"
@@ -0,0 +1,41 @@
+from unittest.mock import patch
+
+from app.services.http_session import HTTPSessionFactory, RETRY_STATUSES
+
+
+def test_session_is_reused_within_a_process():
+    factory = HTTPSessionFactory()
+
+    assert factory.get_session() is factory.get_session()
+
+
+def test_session_is_rebuilt_after_fork():
+    factory = HTTPSessionFactory()
+    parent_session = factory.get_session()
+
+    with patch('app.services.http_session.os.getpid', return_value=-1):
+        child_session = factory.get_session()
+
+    assert child_session is not parent_session, "a forked worker must not share sockets with its parent"
+
+
+def test_adapter_pool_and_retry_configuration():
+    factory = HTTPSessionFactory(pool_maxsize=5, host_pool_sizes={'pokeapi.co': 20}, max_retries=2)
+    session = factory.get_session()
+
+    default_adapter = session.get_adapter('https://example.com/')
+    host_adapter = session.get_adapter('https://pokeapi.co/api/v2/pokemon/pikachu')
+
+    assert default_adapter._pool_maxsize == 5
+    assert host_adapter._pool_maxsize == 20
+    retry = host_adapter.max_retries
+    assert retry.total == 2
+    assert set(RETRY_STATUSES) <= set(retry.status_forcelist)
+    assert retry.backoff_jitter > 0
+
+
+def test_pool_stats_without_traffic():
+    factory = HTTPSessionFactory()
+    factory.get_session()
+
+    assert factory.pool_stats() == {'requests': 0, 'connections': 0, 'reused': 0}
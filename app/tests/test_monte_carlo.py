@@ -0,0 +1,131 @@
+import random
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from app.battle_logic.batch_simulation import UNDECIDED
+from app.battle_logic.battle_simulation import DRAW, STOCHASTIC, BattleSimulation
+from app.battle_logic.monte_carlo import MonteCarloSimulation, StochasticMatchup, wilson_interval
+from app.battle_logic.type_effectiveness import TypeEffectiveness
+from app.models import PokemonData
+from app.services.data_tranformer import PokemonDataTransformer
+from app.services.simulation_service import SimulationService
+from app.tests.factories import TYPES, move_handler_for, random_pokemon
+
+
+def stochastic_simulation(rng, max_turns=1000):
+    return BattleSimulation(TypeEffectiveness(), move_handler_for(rng, 200), resolution=STOCHASTIC,
+                            max_turns=max_turns)
+
+
+def with_moves(rng, pokemon):
+    pokemon.moves = [f'move-{rng.randrange(200)}' for _ in range(rng.randint(0, 4))]
+    return pokemon
+
+
+def test_single_trial_replays_the_scalar_battle():
+    rng = random.Random(11)
+    simulation = stochastic_simulation(rng)
+    monte_carlo = MonteCarloSimulation(max_turns=1000)
+
+    for seed in range(200):
+        pokemon1 = with_moves(rng, random_pokemon(rng, 1))
+        pokemon2 = with_moves(rng, random_pokemon(rng, 2))
+        if seed % 5 == 0:
+            pokemon2.speed = pokemon1.speed
+        matchup = StochasticMatchup.build(pokemon1, pokemon2, simulation)
+
+        result = monte_carlo.simulate(matchup, 1, seed)
+        winner, battle_log = simulation.simulate_battle(pokemon1, pokemon2, seed=seed)
+
+        expected = UNDECIDED if winner == DRAW else (0 if winner == pokemon1.name else 1)
+        assert result.winner[0] == expected
+        assert result.turns[0] == len(battle_log) - (winner == DRAW)
+        assert (result.hp1[0], result.hp2[0]) == (pokemon1.hp, pokemon2.hp)
+
+
+def test_trials_are_reproducible_from_the_seed():
+    rng = random.Random(1)
+    simulation = stochastic_simulation(rng)
+    pokemon1 = with_moves(rng, random_pokemon(rng, 1))
+    pokemon2 = with_moves(rng, random_pokemon(rng, 2))
+    matchup = StochasticMatchup.build(pokemon1, pokemon2, simulation)
+    monte_carlo = MonteCarloSimulation()
+
+    first = monte_carlo.simulate(matchup, 1000, 42)
+    second = monte_carlo.simulate(matchup, 1000, 42)
+
+    assert np.array_equal(first.winner, second.winner)
+    assert np.array_equal(first.turns, second.turns)
+
+
+def test_ten_thousand_trials_finish_quickly():
+    matchup = StochasticMatchup(hp=(300, 300), speed=(50, 50), damage_options=((10.0, 12.5, 3.0, 20.0), (11.0,)))
+
+    start = time.perf_counter()
+    outcomes = MonteCarloSimulation().count_outcomes(matchup, 10000, 0)
+
+    assert time.perf_counter() - start < 1.0
+    assert outcomes.sum() == 10000
+
+
+def test_sides_without_moves_draw_at_the_turn_budget():
+    matchup = StochasticMatchup(hp=(100, 100), speed=(10, 20), damage_options=((), ()))
+
+    result = MonteCarloSimulation(max_turns=20).simulate(matchup, 10, 0)
+
+    assert (result.winner == UNDECIDED).all()
+    assert (result.turns == 20).all()
+
+
+def test_wilson_interval():
+    low, high = wilson_interval(50, 100)
+    assert low == pytest.approx(0.4038, abs=1e-4)
+    assert high == pytest.approx(0.5962, abs=1e-4)
+    assert wilson_interval(0, 10)[0] == 0.0
+    assert wilson_interval(10, 10)[1] == 1.0
+
+
+@pytest.fixture
+def simulation_service():
+    rng = random.Random(4)
+    roster = {name: PokemonData(id=index, name=name, types=[rng.choice(TYPES)], moves=['move-1', 'move-2'],
+                                stats={'hp': 120, 'attack': 80, 'defense': 70, 'special-attack': 90,
+                                       'special-defense': 75, 'speed': 60 + index})
+              for index, name in enumerate(['bulbasaur', 'charmander'])}
+    pokeapi_service = Mock()
+    pokeapi_service.get_pokemon_data.side_effect = roster.__getitem__
+    pokeapi_service.transform_pokemon_data.side_effect = PokemonDataTransformer().transform_to_pokemon
+    return SimulationService(pokeapi_service, stochastic_simulation(rng), workers=0, chunk_trials=3000,
+                             max_trials=20000)
+
+
+def test_simulation_service_estimate(simulation_service):
+    result = simulation_service.estimate_win_probability('bulbasaur', 'charmander', 10000, seed=7)
+
+    assert result.wins1 + result.wins2 + result.draws == 10000
+    assert result.win_probability == result.wins1 / 10000
+    assert result.confidence_interval[0] <= result.win_probability <= result.confidence_interval[1]
+    assert simulation_service.estimate_win_probability('bulbasaur', 'charmander', 10000, seed=7) == result
+
+
+def test_simulation_service_reports_a_generated_seed(simulation_service):
+    result = simulation_service.estimate_win_probability('bulbasaur', 'charmander', 500)
+
+    assert simulation_service.estimate_win_probability('bulbasaur', 'charmander', 500, seed=result.seed) == result
+
+
+@pytest.mark.parametrize('trials', [0, 20001])
+def test_simulation_service_rejects_trial_counts_out_of_range(simulation_service, trials):
+    with pytest.raises(ValueError):
+        simulation_service.estimate_win_probability('bulbasaur', 'charmander', trials)
+
+
+def test_process_pool_gives_the_in_process_result(simulation_service):
+    matchup = StochasticMatchup(hp=(200, 180), speed=(70, 70), damage_options=((9.0, 14.0), (12.0, 4.0, 30.0)))
+    in_process = simulation_service.count_outcomes(matchup, 10000, 3)
+
+    simulation_service.workers = 2
+    assert np.array_equal(simulation_service.count_outcomes(matchup, 10000, 3), in_process)
@@ -1,17 +1,21 @@
+import random
+
 import pytest
 from unittest.mock import Mock, patch
 
 from app.battle_logic.battle_simulation import BattleSimulation
 
-from app.battle_logic.move_handler import MoveHandler
-from app.battle_logic.type_effectiveness import TypeEffectiveness
+from app.battle_logic.move_handler import BestDamageMoveHandler, MoveHandler
+from app.battle_logic.type_effectiveness import TypeEffectiveness, defender_type_index
 from app.cache.pokemon_cache import PokemonCacheManager
 from app.config import Config
+from app.exceptions import MoveNotFoundException
 from app.models import Pokemon
 from app.services.api_client import APIClient
 from app.services.data_tranformer import PokemonDataTransformer
 from app.services.pokeapi_service import PokeAPIService
 from app.services.url_map_service import PokemonURLMapper
+from app.tests.factories import TYPES, random_pokemon
 
 
 def test_get_move_data_success():
@@ -42,7 +46,7 @@ def test_get_move_data_success():
             return mock_pokemon_list_response
         return mock_move_response
 
-    with patch('requests.get', side_effect=mock_get):
+    with patch('requests.Session.get', side_effect=mock_get):
         cache_manager = PokemonCacheManager()
         pokeapi_service = PokeAPIService(cache_manager=cache_manager,
                                          url_mapper=PokemonURLMapper(cache_manager),
@@ -130,4 +134,132 @@ def test_damage_calculation(mock_pokeapi_service):
 
     assert damage > 0, "Damage should be greater than 0 because the move is super effective against Grass, special attack is used, and the move has good base power"
 
-    assert damage > 50, "Damage should be high because the move is super effective against Grass, special attack is used, and the move has good base power"
\ No newline at end of file
+    assert damage > 50, "Damage should be high because the move is super effective against Grass, special attack is used, and the move has good base power"
+
+LEARNSET = {
+    'tackle': {'name': 'tackle', 'power': 40, 'type': 'normal', 'damage_class': 'physical'},
+    'hyper-beam': {'name': 'hyper-beam', 'power': 150, 'type': 'normal', 'damage_class': 'special'},
+    'ember': {'name': 'ember', 'power': 40, 'type': 'fire', 'damage_class': 'special'},
+    'growl': {'name': 'growl', 'power': None, 'type': 'normal', 'damage_class': 'status'},
+}
+
+
+def learnset_service(moves=None):
+    moves = moves if moves is not None else LEARNSET
+    service = Mock()
+
+    def get_move_data(move_name):
+        if move_name not in moves:
+            raise MoveNotFoundException(f"Move {move_name} not found")
+        return moves[move_name]
+
+    service.get_move_data.side_effect = get_move_data
+    return service
+
+
+def battler(name, types, moves, type_index=True):
+    return Pokemon(id=1, name=name, hp=100, attack=80, defense=80, special_attack=80, special_defense=80, speed=80,
+                   types=types, moves=moves, type_index=defender_type_index(types) if type_index else None)
+
+
+@pytest.mark.parametrize('type_index', [True, False])
+def test_best_move_depends_on_the_defender(type_index):
+    move_handler = BestDamageMoveHandler(learnset_service())
+    attacker = battler('charmander', ['fire'], list(LEARNSET))
+
+    assert move_handler.select_move(attacker, battler('bulbasaur', ['grass', 'poison'], [], type_index)) == 'hyper-beam'
+    assert move_handler.select_move(attacker, battler('gastly', ['ghost', 'poison'], [], type_index)) == 'ember'
+    assert move_handler.select_move(attacker) == 'hyper-beam'
+
+
+def test_best_move_matches_the_scalar_damage_formula():
+    rng = random.Random(2)
+    moves = {f'move-{move_id}': {'name': f'move-{move_id}', 'power': rng.choice([None, 20, 40, 60, 90, 120]),
+                                 'type': rng.choice(TYPES + ['shadow']),
+                                 'damage_class': rng.choice(['physical', 'special', 'status'])}
+             for move_id in range(60)}
+    move_handler = BestDamageMoveHandler(learnset_service(moves))
+    simulation = BattleSimulation(TypeEffectiveness(), move_handler)
+
+    for pokemon_id in range(300):
+        attacker = random_pokemon(rng, pokemon_id)
+        attacker.moves = rng.sample(list(moves), rng.randint(1, 30))
+        defender = random_pokemon(rng, pokemon_id + 1000)
+        defender.type_index = defender_type_index(defender.types) if pokemon_id % 2 else None
+
+        best = max(attacker.moves, key=lambda move: simulation.base_damage(attacker, defender, moves[move]))
+        chosen = move_handler.select_move(attacker, defender)
+
+        assert simulation.base_damage(attacker, defender, moves[chosen]) == pytest.approx(
+            simulation.base_damage(attacker, defender, moves[best]))
+
+
+def test_learnset_is_resolved_once_per_species():
+    service = learnset_service()
+    move_handler = BestDamageMoveHandler(service)
+    attacker = battler('charmander', ['fire'], list(LEARNSET) + ['unknown-move'])
+
+    for defender_types in (['grass'], ['ghost'], ['water', 'rock']):
+        move_handler.select_move(attacker, battler('defender', defender_types, []))
+
+    assert service.get_move_data.call_count == len(LEARNSET) + 1
+    assert move_handler.move_table(attacker).names == tuple(LEARNSET)
+    assert move_handler.candidate_moves(attacker) == list(LEARNSET) + ['unknown-move']
+
+
+def test_battles_use_the_best_move():
+    move_handler = BestDamageMoveHandler(learnset_service())
+    simulation = BattleSimulation(TypeEffectiveness(), move_handler)
+    gastly = battler('gastly', ['ghost', 'poison'], [])
+
+    profile = simulation.compile_damage(battler('charmander', ['fire'], list(LEARNSET)), gastly)
+
+    assert profile.move == 'ember'
+    assert simulation.compile_damage(gastly, battler('charmander', ['fire'], [])) == (None, 1.0, 0)
+
+
+def test_warm_builds_tables_before_the_first_battle():
+    service = learnset_service()
+    move_handler = BestDamageMoveHandler(service)
+    roster = [battler('charmander', ['fire'], list(LEARNSET)), battler('eevee', ['normal'], ['tackle', 'growl'])]
+
+    assert move_handler.warm(roster) == 2
+    fetched = service.get_move_data.call_count
+    move_handler.select_move(roster[0], roster[1])
+
+    assert service.get_move_data.call_count == fetched, "battles only read the prebuilt tables"
+
+
+def test_missing_tables_fetch_moves_concurrently_with_the_async_service():
+    service = learnset_service()
+    async_service = Mock()
+    async_service.fetch_move_list.side_effect = lambda names: [
+        LEARNSET[name] if name in LEARNSET else MoveNotFoundException(name) for name in names]
+    move_handler = BestDamageMoveHandler(service, async_pokeapi_service=async_service)
+
+    table = move_handler.move_table(battler('charmander', ['fire'], list(LEARNSET) + ['unknown-move']))
+
+    assert table.names == tuple(LEARNSET)
+    async_service.fetch_move_list.assert_called_once_with(list(LEARNSET) + ['unknown-move'])
+    service.get_move_data.assert_not_called()
+
+
+def test_refreshed_moves_invalidate_their_tables():
+    moves = dict(LEARNSET)
+    move_handler = BestDamageMoveHandler(learnset_service(moves))
+    charmander = battler('charmander', ['fire'], ['tackle', 'ember'])
+    eevee = battler('eevee', ['normal'], ['tackle'])
+    gastly = battler('gastly', ['ghost', 'poison'], [])
+    eevee_table = move_handler.move_table(eevee)
+    assert move_handler.select_move(charmander, gastly) == 'ember'
+
+    moves['ember'] = dict(LEARNSET['ember'], power=5)
+    cache_manager = PokemonCacheManager()
+    cache_manager.add_move_listener(move_handler.invalidate_move)
+    try:
+        cache_manager.set_move_data('ember', moves['ember'])
+    finally:
+        cache_manager._move_listeners.remove(move_handler.invalidate_move)
+
+    assert move_handler.select_move(charmander, battler('bulbasaur', ['grass'], [])) == 'tackle'
+    assert move_handler.move_table(eevee) is eevee_table, "tables without the move are kept"
@@ -1,5 +1,10 @@
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock
+from app.cache.records import SpeciesRecord
+from app.services.background_refresh import BackgroundRefresher
 from app.services.pokeapi_service import PokeAPIService
 from app.models import PokemonData
 from app.exceptions import (
@@ -29,16 +34,32 @@ def test_get_pokemon_data_from_api(service):
     # Arrange
     service.cache_manager.get_pokemon_data.return_value = None
     service.url_mapper.get_pokemon_url.return_value = 'pokemon/pikachu'
-    service.api_client.get.return_value = {'raw': 'data'}
-    service.data_transformer.transform_to_pokemon_data.return_value = PokemonData(
+    service.api_client.get_raw.return_value = b'{"raw": "data"}'
+    service.data_transformer.transform_raw_to_pokemon_data.return_value = PokemonData(
         id=25, name='pikachu', stats={}, types=[], moves=[]
     )
 
     result = service.get_pokemon_data('pikachu')
 
-    assert isinstance(result, PokemonData)
+    assert isinstance(result, SpeciesRecord)
     service.cache_manager.set_pokemon_data.assert_called_once()
 
+def test_cache_hits_and_misses_return_the_same_type(service):
+    cache = {}
+    service.cache_manager.get_pokemon_data.side_effect = cache.get
+    service.cache_manager.set_pokemon_data.side_effect = cache.__setitem__
+    service.url_mapper.get_pokemon_url.return_value = 'pokemon/pikachu'
+    service.data_transformer.transform_raw_to_pokemon_data.return_value = PokemonData(
+        id=25, name='pikachu', stats={'hp': 35}, types=['electric'], moves=['growl']
+    )
+
+    fetched = service.get_pokemon_data('pikachu')
+    cached = service.get_pokemon_data('pikachu')
+
+    assert type(fetched) is type(cached) is SpeciesRecord
+    assert cached == fetched
+    assert service.api_client.get_raw.call_count == 1
+
 def test_get_pokemon_data_not_found(service):
     service.cache_manager.get_pokemon_data.return_value = None
     service.url_mapper.get_pokemon_url.side_effect = PokemonNotFoundException('pikachu')
@@ -96,3 +117,80 @@ def test_transform_pokemon_data(service):
 
     assert result == mock_pokemon
     service.data_transformer.transform_to_pokemon.assert_called_once_with(mock_data)
+
+def test_unknown_pokemon_is_negatively_cached(service):
+    service.cache_manager.get_pokemon_data.return_value = None
+    service.url_mapper.get_pokemon_url.side_effect = PokemonNotFoundException('pikachuu')
+
+    for _ in range(3):
+        with pytest.raises(PokemonNotFoundException):
+            service.get_pokemon_data('Pikachuu')
+
+    service.url_mapper.get_pokemon_url.assert_called_once()
+    assert service.negative_cache.stats()['hits'] == 2
+
+def test_unknown_move_is_negatively_cached(service):
+    service.cache_manager.get_move_data.return_value = None
+    mock_error = PokemonAPIException("Not found", status_code=404)
+    service.api_client.get.side_effect = mock_error
+
+    for _ in range(3):
+        with pytest.raises(MoveNotFoundException):
+            service.get_move_data('not-exists')
+
+    service.api_client.get.assert_called_once()
+
+def test_upstream_errors_are_not_negatively_cached(service):
+    service.cache_manager.get_move_data.return_value = None
+    service.api_client.get.side_effect = PokemonAPIException("Service unavailable", status_code=503)
+
+    for _ in range(2):
+        with pytest.raises(PokemonAPIException):
+            service.get_move_data('thunder')
+
+    assert service.api_client.get.call_count == 2
+
+def wait_for_refreshes(refresher):
+    deadline = time.monotonic() + 5
+    while refresher.stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_stale_move_is_served_while_refreshing(service):
+    service.refresher = BackgroundRefresher(max_workers=1)
+    service.cache_manager.get_move_entry.return_value = ({'name': 'thunder', 'power': 100}, True)
+    service.cache_manager.get_move_data.return_value = None
+    service.api_client.get.return_value = {
+        'name': 'thunder', 'power': 110, 'type': {'name': 'electric'}, 'damage_class': {'name': 'special'}
+    }
+
+    result = service.get_move_data('thunder')
+    wait_for_refreshes(service.refresher)
+
+    assert result == {'name': 'thunder', 'power': 100}, "the stale value is returned without waiting"
+    service.cache_manager.set_move_data.assert_called_once_with(
+        'thunder', {'name': 'thunder', 'power': 110, 'type': 'electric', 'damage_class': 'special'})
+
+def test_move_past_max_staleness_is_fetched_inline(service):
+    service.refresher = BackgroundRefresher(max_workers=1)
+    service.cache_manager.get_move_entry.return_value = None
+    service.cache_manager.get_move_data.return_value = None
+    service.api_client.get.return_value = {
+        'name': 'thunder', 'power': 110, 'type': {'name': 'electric'}, 'damage_class': {'name': 'special'}
+    }
+
+    result = service.get_move_data('thunder')
+
+    assert result['power'] == 110
+    assert service.refresher.stats()['scheduled'] == 0
+
+def test_refresher_runs_one_refresh_per_key():
+    refresher = BackgroundRefresher(max_workers=2, max_pending=1)
+    release = threading.Event()
+
+    assert refresher.schedule('pokemon_pikachu', lambda: release.wait(5))
+    assert not refresher.schedule('pokemon_pikachu', lambda: None)
+    assert not refresher.schedule('pokemon_eevee', lambda: None), "the queue is full"
+    release.set()
+    wait_for_refreshes(refresher)
+
+    assert refresher.stats() == {'scheduled': 1, 'deduplicated': 1, 'dropped': 1, 'failed': 0, 'pending': 0}
@@ -0,0 +1,210 @@
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from app.cache.bounded_cache import BoundedCache, approximate_size
+from app.cache.pokemon_cache import URL_MAPPING_KEY, PokemonCacheManager
+from app.cache.records import MoveRecord, SpeciesRecord
+from app.cache.shared_cache import SharedCacheBackend, SQLiteCacheBackend
+from app.models import PokemonData
+from app.services.data_tranformer import PokemonDataTransformer
+
+TACKLE = {'name': 'tackle', 'power': 40, 'type': 'normal', 'damage_class': 'physical'}
+
+
+def test_least_recently_used_entry_is_evicted_by_count():
+    cache = BoundedCache(max_entries=2, stripes=1)
+    cache.set('bulbasaur', 1)
+    cache.set('charmander', 4)
+    cache.get('bulbasaur')
+
+    cache.set('squirtle', 7)
+
+    assert cache.get('charmander') is None
+    assert cache.get('bulbasaur') == 1
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_are_evicted_by_size():
+    cache = BoundedCache(max_bytes=approximate_size('x' * 100) * 2, stripes=1)
+    for name in ('a', 'b', 'c'):
+        cache.set(name, name * 100)
+
+    assert len(cache) == 2
+    assert cache.get('a') is None
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+
+def test_entry_larger_than_the_cache_is_not_stored():
+    cache = BoundedCache(max_bytes=64, stripes=1)
+
+    cache.set('huge', 'x' * 1000)
+
+    assert cache.get('huge') is None
+
+
+def test_entries_expire_after_ttl():
+    cache = BoundedCache(ttl_seconds=10)
+    cache.set('pikachu', 25)
+
+    with patch('app.cache.bounded_cache.time.monotonic', return_value=time.monotonic() + 11):
+        assert cache.get('pikachu') is None
+
+    assert cache.stats() == {'hits': 0, 'stale_hits': 0, 'misses': 1, 'evictions': 0, 'expirations': 1,
+                             'entries': 0, 'bytes': 0}
+
+
+def test_expired_entries_are_served_stale_until_max_staleness():
+    cache = BoundedCache(ttl_seconds=10, max_stale_seconds=60)
+    cache.set('pikachu', 25)
+    now = time.monotonic()
+
+    with patch('app.cache.bounded_cache.time.monotonic', return_value=now + 11):
+        assert cache.get('pikachu') is None, "plain reads only return fresh values"
+        assert cache.get_entry('pikachu') == (25, True)
+    with patch('app.cache.bounded_cache.time.monotonic', return_value=now + 71):
+        assert cache.get_entry('pikachu') is None
+
+    assert cache.get_entry('pikachu') is None
+    assert cache.stats()['stale_hits'] == 1
+
+
+def test_concurrent_access_keeps_counters_consistent():
+    cache = BoundedCache(max_entries=64, stripes=4)
+
+    def worker(offset):
+        for index in range(500):
+            key = (offset + index) % 100
+            if cache.get(key) is None:
+                cache.set(key, index)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(worker, range(8)))
+
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 8 * 500
+    assert stats['entries'] <= 64
+
+
+def test_cache_manager_keeps_namespaces_apart():
+    cache_manager = PokemonCacheManager()
+    cache_manager.clear()
+
+    cache_manager.set_pokemon_data('Tackle', {'kind': 'pokemon'})
+    cache_manager.set_move_data('tackle', TACKLE)
+    cache_manager.set_pokemon_data(URL_MAPPING_KEY, {'pikachu': 25})
+
+    assert cache_manager.get_pokemon_data('tackle') == {'kind': 'pokemon'}
+    assert cache_manager.get_move_data('TACKLE')['power'] == 40
+    stats = cache_manager.stats()
+    assert stats['url_mapping']['entries'] == 1
+    assert stats['pokemon']['entries'] == 1
+    assert PokemonCacheManager() is cache_manager
+
+
+def test_shared_cache_fills_another_workers_l1(tmp_path):
+    path = str(tmp_path / 'shared_cache.sqlite')
+    cache_manager = PokemonCacheManager()
+    cache_manager.clear()
+    previous_shared_cache = cache_manager.shared_cache
+    try:
+        PokemonCacheManager(shared_cache=SQLiteCacheBackend(path))
+        cache_manager.set_move_data('tackle', TACKLE)
+
+        # Another worker: empty L1, its own connection to the same file
+        cache_manager.clear()
+        cache_manager.shared_cache = SQLiteCacheBackend(path)
+
+        assert cache_manager.get_move_data('tackle') == TACKLE
+        assert cache_manager.get_move_data('tackle') == TACKLE
+        assert cache_manager.stats()['shared']['hits'] == 1, "the second read is served by L1"
+    finally:
+        cache_manager.shared_cache = previous_shared_cache
+
+
+def test_shared_cache_expires_and_evicts(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'shared_cache.sqlite'), max_bytes=200)
+    backend.set('move', 'expired', 'x' * 10, ttl_seconds=10)
+    with patch('app.cache.shared_cache.time.time', return_value=time.time() + 11):
+        assert backend.get('move', 'expired') is None
+
+    backend.set('move', 'a', 'a' * 100)
+    backend.set('move', 'b', 'b' * 100)
+
+    assert backend.get('move', 'a') is None
+    assert backend.get('move', 'b') == 'b' * 100
+
+
+def stored_bytes(backend):
+    connection = backend._connection()
+    return (backend._stored_bytes(connection),
+            connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0])
+
+
+def test_shared_cache_keeps_a_running_size_total(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / 'shared_cache.sqlite'), max_bytes=400)
+    backend.set('move', 'a', 'a' * 100)
+    backend.set('move', 'a', 'a' * 150)
+    backend.set('move', 'b', 'b' * 100, ttl_seconds=10)
+    with patch('app.cache.shared_cache.time.time', return_value=time.time() + 11):
+        backend.set('move', 'c', 'c' * 200)
+
+    total, summed = stored_bytes(backend)
+    assert total == summed <= 400
+    assert backend.get('move', 'b') is None and backend.get('move', 'c') == 'c' * 200
+    assert backend.stats()['bytes'] == total
+
+
+def test_shared_cache_seeds_the_size_total_of_an_existing_file(tmp_path):
+    path = str(tmp_path / 'shared_cache.sqlite')
+    backend = SQLiteCacheBackend(path)
+    backend.set('move', 'a', 'a' * 100)
+    connection = backend._connection()
+    connection.execute('DROP TABLE entries_size')
+    for event in ('insert', 'delete', 'update'):
+        connection.execute(f'DROP TRIGGER entries_size_{event}')
+
+    total, summed = stored_bytes(SQLiteCacheBackend(path))
+
+    assert total == summed > 100
+
+
+def test_incomplete_shared_cache_backend_cannot_be_created():
+    class ReadOnlyBackend(SharedCacheBackend):
+        def get(self, namespace, key):
+            return None
+
+    with pytest.raises(TypeError):
+        ReadOnlyBackend()
+
+
+def test_species_are_cached_as_compact_records():
+    cache_manager = PokemonCacheManager()
+    cache_manager.clear()
+    pokemon_data = PokemonData(id=25, name='pikachu', types=['electric'], moves=['thunder-shock', 'growl'],
+                               stats={'hp': 35, 'attack': 55, 'defense': 40, 'special-attack': 50,
+                                      'special-defense': 50, 'speed': 90})
+
+    cache_manager.set_pokemon_data('pikachu', pokemon_data)
+    record = cache_manager.get_pokemon_data('pikachu')
+
+    assert isinstance(record, SpeciesRecord)
+    assert record.to_pokemon_data() == pokemon_data
+    assert PokemonDataTransformer.transform_to_pokemon(record) == PokemonDataTransformer.transform_to_pokemon(
+        pokemon_data)
+    assert approximate_size(record) < approximate_size(pokemon_data)
+
+
+def test_move_record_reads_like_the_move_dict():
+    move_data = {'name': 'thunder', 'power': None, 'type': 'electric', 'damage_class': 'special'}
+
+    record = MoveRecord.from_dict(move_data)
+
+    assert record == move_data
+    assert record['power'] is None and record.get('accuracy') is None
+    assert pickle.loads(pickle.dumps(record)) == record
+    with pytest.raises(AttributeError):
+        record.power = 120
@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+from app.database import db
+from app.database.models import Pokemon
+from app.models import PokemonData
+from app.repositories.pokemon_repository import PokemonRepository
+
+STATS = {'hp': 45, 'attack': 49, 'defense': 49, 'special-attack': 65, 'special-defense': 65, 'speed': 45}
+
+
+@pytest.fixture
+def flask_app(tmp_path):
+    flask_app = Flask(__name__)
+    flask_app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'pokemon.db'}"
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.drop_all()
+
+
+def species(name, types=('grass',), **stats):
+    return PokemonData(id=1, name=name, types=list(types), moves=[], stats=dict(STATS, **stats))
+
+
+def stored_rows():
+    return db.session.scalar(sa.select(sa.func.count()).select_from(Pokemon))
+
+
+def test_lookups_use_the_unique_name_index(flask_app):
+    plan = db.session.execute(sa.text("EXPLAIN QUERY PLAN SELECT * FROM pokemon WHERE name = 'bulbasaur'")).all()
+
+    assert any('USING INDEX ix_pokemon_name' in str(row) for row in plan)
+
+
+def test_upsert_inserts_then_updates_by_normalized_name(flask_app):
+    repository = PokemonRepository()
+
+    repository.upsert_pokemon('Bulbasaur', ['grass', 'poison'], STATS)
+    updated = repository.upsert_pokemon(' BULBASAUR ', ['grass'], dict(STATS, attack=80))
+
+    assert stored_rows() == 1
+    assert updated.name == 'bulbasaur'
+    assert updated.stats.attack == 80
+    assert repository.get_pokemon_by_name('bulbasaur').types == ['grass']
+
+
+def test_concurrent_first_requests_store_one_row(flask_app):
+    repository = PokemonRepository()
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def store():
+        with flask_app.app_context():
+            barrier.wait()
+            try:
+                repository.upsert_pokemon('pikachu', ['electric'], STATS)
+            except Exception as error:
+                errors.append(error)
+
+    threads = [threading.Thread(target=store) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert stored_rows() == 1
+
+
+def test_upsert_many_and_get_many(flask_app):
+    repository = PokemonRepository()
+    repository.create_pokemon('bulbasaur', ['grass'], STATS)
+
+    written = repository.upsert_many([species('bulbasaur', speed=99), species('Charmander', ['fire']),
+                                      species('charmander', ['fire'], hp=39), species('missingno', [])],
+                                     batch_size=1)
+    found = repository.get_many(['Bulbasaur', 'charmander', 'pikachu', 'bulbasaur'], batch_size=1)
+
+    assert written == 2
+    assert sorted(found) == ['bulbasaur', 'charmander']
+    assert found['bulbasaur'].stats.speed == 99
+    assert found['charmander'].stats.hp == 39
+
+
+def test_create_many_skips_stored_names(flask_app):
+    repository = PokemonRepository()
+    repository.create_pokemon('bulbasaur', ['grass'], STATS)
+
+    inserted = repository.create_many([species('Bulbasaur', speed=99), species('charmander', ['fire'])])
+
+    assert inserted == 1
+    assert repository.get_pokemon_by_name('bulbasaur').stats.speed == 45
+
+
+def test_ensure_name_index_removes_duplicates_from_older_tables(flask_app):
+    db.session.execute(sa.text('DROP INDEX ix_pokemon_name'))
+    row = PokemonRepository._build_row('bulbasaur', ['grass'], STATS)
+    db.session.execute(sa.insert(Pokemon), [row, dict(row, hp=1), dict(row, name='charmander')])
+    db.session.commit()
+
+    PokemonRepository.ensure_name_index()
+    PokemonRepository.ensure_name_index()
+
+    assert stored_rows() == 2
+    assert PokemonRepository().get_pokemon_by_name('bulbasaur').stats.hp == 45
+    with pytest.raises(sa.exc.IntegrityError):
+        db.session.execute(sa.insert(Pokemon), [row])
+    db.session.rollback()
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from app.exceptions import PokemonAPIException
+from app.services.pokeapi_service import PokeAPIService
+from app.services.single_flight import AsyncSingleFlight, SingleFlight
+
+CALLERS = 8
+
+
+def run_concurrently(single_flight, fn):
+    """Start CALLERS threads on the same key and release the leader once everybody is waiting."""
+    release = threading.Event()
+
+    def blocking_fetch():
+        release.wait(timeout=5)
+        return fn()
+
+    def wait_for_followers():
+        while single_flight.stats()['calls'] < CALLERS:
+            pass
+        release.set()
+
+    with ThreadPoolExecutor(max_workers=CALLERS + 1) as executor:
+        executor.submit(wait_for_followers)
+        futures = [executor.submit(single_flight.do, 'pokemon_pikachu', blocking_fetch) for _ in range(CALLERS)]
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_callers_share_one_fetch():
+    single_flight = SingleFlight()
+    fetch = Mock(return_value={'name': 'pikachu'})
+
+    results = run_concurrently(single_flight, fetch)
+
+    assert fetch.call_count == 1, "only the first caller should hit the upstream API"
+    assert all(result == {'name': 'pikachu'} for result in results)
+    assert single_flight.stats() == {'calls': CALLERS, 'executions': 1, 'collapsed': CALLERS - 1, 'in_flight': 0}
+
+
+def test_concurrent_callers_share_the_exception():
+    single_flight = SingleFlight()
+    error = PokemonAPIException("Request timed out")
+
+    results = run_concurrently(single_flight, Mock(side_effect=error))
+
+    assert all(result is error for result in results), "every waiter should see the leader's failure"
+
+
+def test_key_is_released_after_the_fetch():
+    single_flight = SingleFlight()
+
+    single_flight.do('move_tackle', lambda: 1)
+    single_flight.do('move_tackle', lambda: 2)
+
+    assert single_flight.stats()['executions'] == 2, "finished flights must not be memoized"
+
+
+def test_async_callers_share_one_fetch():
+    single_flight = AsyncSingleFlight()
+    fetch_count = 0
+
+    async def fetch():
+        nonlocal fetch_count
+        fetch_count += 1
+        await asyncio.sleep(0.01)
+        return 'tackle'
+
+    async def main():
+        return await asyncio.gather(*(single_flight.do('move_tackle', fetch) for _ in range(CALLERS)))
+
+    results = asyncio.run(main())
+
+    assert results == ['tackle'] * CALLERS
+    assert fetch_count == 1
+    assert single_flight.stats()['collapsed'] == CALLERS - 1
+
+
+def test_pokeapi_service_collapses_concurrent_move_misses():
+    service = PokeAPIService(cache_manager=Mock(), url_mapper=Mock(), api_client=Mock(), data_transformer=Mock())
+    service.cache_manager.get_move_data.return_value = None
+    release = threading.Event()
+
+    def slow_get(endpoint):
+        release.wait(timeout=5)
+        return {'name': 'thunder', 'power': 110, 'type': {'name': 'electric'}, 'damage_class': {'name': 'special'}}
+
+    service.api_client.get.side_effect = slow_get
+
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        futures = [executor.submit(service.get_move_data, 'thunder') for _ in range(CALLERS)]
+        while service.fetch_stats()['calls'] < CALLERS:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert service.api_client.get.call_count == 1
+    assert all(result['power'] == 110 for result in results)
+    assert service.fetch_stats()['collapsed'] == CALLERS - 1
@@ -0,0 +1,170 @@
+import json
+import sqlite3
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from flask import Flask
+
+from app.cache.name_index import PokemonNameIndex
+from app.cache.pokemon_cache import PokemonCacheManager
+from app.cache.shared_cache import SQLiteCacheBackend
+from app.database import db
+from app.repositories.pokemon_repository import PokemonRepository
+from app.config import Config
+from app.services.background_refresh import BackgroundRefresher
+from app.services.pokeapi_service import PokeAPIService
+from app.services.snapshot_importer import SnapshotImporter, main, parse_snapshot_file
+
+
+def pokemon_payload(pokemon_id, name, types):
+    return {
+        'id': pokemon_id,
+        'name': name,
+        'types': [{'type': {'name': type_name}} for type_name in types],
+        'moves': [{'move': {'name': 'tackle'}}],
+        'stats': [
+            {'base_stat': 45, 'stat': {'name': 'hp'}},
+            {'base_stat': 49, 'stat': {'name': 'attack'}},
+            {'base_stat': 49, 'stat': {'name': 'defense'}},
+            {'base_stat': 65, 'stat': {'name': 'special-attack'}},
+            {'base_stat': 65, 'stat': {'name': 'special-defense'}},
+            {'base_stat': 45, 'stat': {'name': 'speed'}}
+        ]
+    }
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    (tmp_path / 'pokemon' / '1').mkdir(parents=True)
+    (tmp_path / 'move').mkdir()
+    (tmp_path / 'pokemon' / '1' / 'index.json').write_text(
+        json.dumps(pokemon_payload(1, 'bulbasaur', ['grass', 'poison'])))
+    (tmp_path / 'pokemon' / 'charmander.json').write_text(json.dumps(pokemon_payload(4, 'charmander', ['fire'])))
+    (tmp_path / 'pokemon' / 'index.json').write_text(json.dumps({
+        'results': [{'name': 'pikachu', 'url': 'https://pokeapi.co/api/v2/pokemon/25/'}]
+    }))
+    (tmp_path / 'move' / 'tackle.json').write_text(json.dumps({
+        'name': 'tackle', 'power': 40, 'type': {'name': 'normal'}, 'damage_class': {'name': 'physical'}
+    }))
+    (tmp_path / 'move' / 'broken.json').write_text('{not json')
+    return tmp_path
+
+
+@pytest.fixture
+def flask_app():
+    flask_app = Flask(__name__)
+    flask_app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.drop_all()
+
+
+@pytest.fixture
+def cache_manager():
+    cache = {}
+    manager = Mock()
+    manager.get_pokemon_data.side_effect = lambda name: cache.get(f'pokemon_{name}')
+    manager.set_pokemon_data.side_effect = lambda name, data, pinned=False: cache.__setitem__(f'pokemon_{name}', data)
+    manager.get_move_data.side_effect = lambda name: cache.get(f'move_{name}')
+    manager.set_move_data.side_effect = lambda name, data, pinned=False: cache.__setitem__(f'move_{name}', data)
+    return manager
+
+
+def test_parse_snapshot_file_skips_unrelated_payloads(tmp_path):
+    other = tmp_path / 'type' / 'fire.json'
+    other.parent.mkdir()
+    other.write_text('{"name": "fire"}')
+
+    assert parse_snapshot_file(str(other)) is None
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_import_snapshot_warms_cache_and_database(flask_app, snapshot_dir, cache_manager, workers, tmp_path):
+    repository = PokemonRepository()
+    name_index = PokemonNameIndex(str(tmp_path / 'pokemon_index.sqlite'))
+    importer = SnapshotImporter(cache_manager=cache_manager, pokemon_repository=repository,
+                                name_index=name_index, workers=workers, batch_size=1)
+
+    result = importer.import_snapshot(str(snapshot_dir))
+
+    assert result == {'pokemon': 2, 'moves': 1, 'names': 3, 'inserted': 2}
+    assert cache_manager.get_pokemon_data('bulbasaur').types == ['grass', 'poison']
+    assert cache_manager.get_move_data('tackle')['power'] == 40
+    assert cache_manager.get_pokemon_data('pokemon_url_mapping') == {'bulbasaur': 1, 'charmander': 4, 'pikachu': 25}
+    assert name_index.load() == {'bulbasaur': 1, 'charmander': 4, 'pikachu': 25}, "the index is persisted"
+
+    assert repository.get_pokemon_by_name('Charmander').stats.special_attack == 65
+
+
+def test_import_snapshot_is_idempotent(flask_app, snapshot_dir):
+    importer = SnapshotImporter(pokemon_repository=PokemonRepository(), workers=1)
+
+    importer.import_snapshot(str(snapshot_dir))
+    result = importer.import_snapshot(str(snapshot_dir))
+
+    assert result['inserted'] == 0, "already stored Pokemon must not be inserted twice"
+
+
+def test_cli_imports_into_a_database_without_the_name_index(snapshot_dir, tmp_path):
+    database = tmp_path / 'old.db'
+    with sqlite3.connect(database) as connection:
+        connection.execute('CREATE TABLE pokemon (id INTEGER PRIMARY KEY, name VARCHAR(50) NOT NULL, '
+                           'hp INTEGER NOT NULL, attack INTEGER NOT NULL, defense INTEGER NOT NULL, '
+                           'special_attack INTEGER NOT NULL, special_defense INTEGER NOT NULL, '
+                           'speed INTEGER NOT NULL, type1 VARCHAR(20), type2 VARCHAR(20))')
+        connection.execute("INSERT INTO pokemon VALUES (1, 'bulbasaur', 45, 49, 49, 65, 65, 45, 'grass', 'poison')")
+
+    with patch.object(Config, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{database}'), \
+            patch.object(Config, 'POKEMON_INDEX_PATH', str(tmp_path / 'pokemon_index.sqlite')), \
+            patch.object(Config, 'SHARED_CACHE_PATH', ''):
+        main([str(snapshot_dir), '--workers', '1'])
+
+    with sqlite3.connect(database) as connection:
+        names = [name for name, in connection.execute('SELECT name FROM pokemon ORDER BY id')]
+    assert names == ['bulbasaur', 'charmander']
+
+
+def test_cli_stores_moves_in_the_shared_cache(snapshot_dir, tmp_path):
+    shared_cache_path = str(tmp_path / 'shared_cache.sqlite')
+    cache_manager = PokemonCacheManager()
+    try:
+        with patch.object(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'pokemon.db'}"), \
+                patch.object(Config, 'POKEMON_INDEX_PATH', str(tmp_path / 'pokemon_index.sqlite')), \
+                patch.object(Config, 'SHARED_CACHE_PATH', shared_cache_path), \
+                patch.object(cache_manager, 'shared_cache', None):
+            main([str(snapshot_dir), '--workers', '1'])
+    finally:
+        cache_manager.clear()
+
+    shared_cache = SQLiteCacheBackend(shared_cache_path)
+    assert shared_cache.get('move', 'tackle')['power'] == 40, "another worker finds the move"
+    assert shared_cache.get('pokemon', 'charmander').types == ('fire',)
+
+
+def test_snapshot_entries_are_served_offline_past_ttl_and_max_staleness(snapshot_dir, tmp_path):
+    cache_manager = PokemonCacheManager()
+    cache_manager.clear()
+    api_client = Mock()
+    api_client.get.side_effect = ConnectionError("offline")
+    service = PokeAPIService(cache_manager=cache_manager, url_mapper=Mock(), api_client=api_client,
+                             data_transformer=Mock(), refresher=BackgroundRefresher(max_workers=1))
+    later = max(Config.CACHE_POKEMON_TTL_SECONDS, Config.CACHE_MOVE_TTL_SECONDS) + Config.CACHE_MAX_STALE_SECONDS + 1
+    try:
+        with patch.object(cache_manager, 'shared_cache', SQLiteCacheBackend(str(tmp_path / 'shared_cache.sqlite'))):
+            SnapshotImporter(cache_manager=cache_manager, workers=1).import_snapshot(str(snapshot_dir))
+
+            with patch('app.cache.bounded_cache.time.monotonic', return_value=time.monotonic() + later), \
+                    patch('app.cache.shared_cache.time.time', return_value=time.time() + later):
+                assert service.get_pokemon_data('bulbasaur').types == ('grass', 'poison')
+                assert service.get_move_data('tackle')['power'] == 40
+
+                cache_manager.clear()
+                assert service.get_pokemon_data('charmander').types == ('fire',), "another worker reads L2"
+    finally:
+        cache_manager.clear()
+
+    api_client.get.assert_not_called()
+    assert service.refresher.stats()['scheduled'] == 0, "pinned entries never go stale"
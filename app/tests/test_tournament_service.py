@@ -0,0 +1,104 @@
+import random
+from unittest.mock import Mock
+
+import pytest
+
+from app.battle_logic.battle_simulation import BattleSimulation, DRAW
+from app.battle_logic.type_effectiveness import TypeEffectiveness
+from app.exceptions import PokemonNotFoundException
+from app.models import PokemonData
+from app.services.data_tranformer import PokemonDataTransformer
+from app.services.tournament_service import TournamentService
+from app.tests.factories import TYPES, move_handler_for
+
+
+def pokemon_data(rng, pokemon_id):
+    return PokemonData(id=pokemon_id, name=f'pokemon-{pokemon_id}',
+                       stats={'hp': rng.randint(1, 255), 'attack': rng.randint(5, 190),
+                              'defense': rng.randint(5, 230), 'special-attack': rng.randint(10, 194),
+                              'special-defense': rng.randint(20, 230), 'speed': rng.randint(5, 180)},
+                       types=rng.sample(TYPES, rng.choice([1, 2])), moves=[f'move-{pokemon_id}'])
+
+
+@pytest.fixture
+def roster():
+    rng = random.Random(3)
+    return {f'pokemon-{pokemon_id}': pokemon_data(rng, pokemon_id) for pokemon_id in range(8)}
+
+
+@pytest.fixture
+def move_handler():
+    return move_handler_for(random.Random(5), 8)
+
+
+@pytest.fixture
+def pokeapi_service(roster):
+    service = Mock()
+    service.get_pokemon_data.side_effect = roster.__getitem__
+    service.transform_pokemon_data.side_effect = PokemonDataTransformer().transform_to_pokemon
+    return service
+
+
+def test_tournament_matches_individual_battles(roster, move_handler, pokeapi_service):
+    service = TournamentService(pokeapi_service, move_handler, TypeEffectiveness())
+
+    result = service.run_tournament(list(roster))
+
+    scalar = BattleSimulation(TypeEffectiveness(), move_handler)
+    transform = PokemonDataTransformer().transform_to_pokemon
+    expected = [[0] * len(roster) for _ in roster]
+    draws = 0
+    for i, name1 in enumerate(result.pokemon):
+        for j, name2 in enumerate(result.pokemon):
+            if i == j:
+                continue
+            winner, _ = scalar.simulate_battle(transform(roster[name1]), transform(roster[name2]), with_log=False)
+            if winner == DRAW:
+                draws += 1
+            elif winner == name1:
+                expected[i][j] += 1
+            else:
+                expected[j][i] += 1
+
+    assert result.win_matrix == expected
+    assert [standing.wins for standing in result.standings] == sorted(map(sum, expected), reverse=True)
+    assert sum(standing.draws for standing in result.standings) == 2 * draws
+
+
+def test_tournament_fetches_each_species_and_move_once(roster, move_handler, pokeapi_service):
+    service = TournamentService(pokeapi_service, move_handler, TypeEffectiveness())
+
+    service.run_tournament(['Pokemon-1', 'pokemon-2', 'pokemon-1', 'pokemon-3'])
+
+    assert [call.args[0] for call in pokeapi_service.get_pokemon_data.call_args_list] == \
+        ['pokemon-1', 'pokemon-2', 'pokemon-3']
+    assert move_handler.get_move_data.call_count == 3
+
+
+def test_tournament_uses_the_concurrent_roster_fetch(roster, move_handler, pokeapi_service):
+    async_service = Mock()
+    async_service.fetch_roster_data.side_effect = lambda names: [roster[name] for name in names]
+    service = TournamentService(pokeapi_service, move_handler, TypeEffectiveness(),
+                                async_pokeapi_service=async_service)
+
+    result = service.run_tournament(['pokemon-1', 'pokemon-2'])
+
+    async_service.fetch_roster_data.assert_called_once_with(['pokemon-1', 'pokemon-2'])
+    pokeapi_service.get_pokemon_data.assert_not_called()
+    assert result.pokemon == ['pokemon-1', 'pokemon-2']
+
+
+@pytest.mark.parametrize('names', [['pokemon-1'], ['pokemon-1', 'POKEMON-1'], [f'pokemon-{i}' for i in range(5)]])
+def test_tournament_rejects_invalid_roster_sizes(move_handler, pokeapi_service, names):
+    service = TournamentService(pokeapi_service, move_handler, TypeEffectiveness(), max_roster=4)
+
+    with pytest.raises(ValueError):
+        service.run_tournament(names)
+
+
+def test_tournament_unknown_pokemon(move_handler, pokeapi_service):
+    pokeapi_service.get_pokemon_data.side_effect = PokemonNotFoundException('missingno')
+    service = TournamentService(pokeapi_service, move_handler, TypeEffectiveness())
+
+    with pytest.raises(PokemonNotFoundException):
+        service.run_tournament(['missingno', 'pikachu'])
@@ -0,0 +1,46 @@
+import pytest
+
+from app.battle_logic.type_effectiveness import (
+    DEFENDER_CHART,
+    DEFENDER_TYPES,
+    TYPES,
+    TypeEffectiveness,
+    defender_type_index
+)
+
+
+@pytest.fixture
+def type_effectiveness():
+    return TypeEffectiveness()
+
+
+@pytest.mark.parametrize('move_type, defender_types, expected', [
+    ('fire', ['grass'], 2.0),
+    ('fire', ['grass', 'steel'], 4.0),
+    ('electric', ['water', 'ground'], 0.0),
+    ('water', ['fire', 'ground'], 4.0),
+    ('fighting', ['ghost'], 0.0),
+    ('dragon', ['fairy', 'flying'], 0.0),
+    ('normal', ['normal'], 1.0),
+    ('FIRE', ['Grass'], 2.0),
+])
+def test_type_effectiveness(type_effectiveness, move_type, defender_types, expected):
+    assert type_effectiveness.get_type_effectiveness([move_type], defender_types) == expected
+
+
+def test_unknown_types_are_neutral(type_effectiveness):
+    assert type_effectiveness.get_type_effectiveness(['shadow'], ['fire']) == 1.0
+    assert type_effectiveness.get_type_effectiveness(['fire'], ['grass', 'stellar']) == 2.0
+
+
+def test_dual_type_table_covers_every_defender(type_effectiveness):
+    assert DEFENDER_CHART.shape == (18, 171)
+
+    for defender_index, type_ids in enumerate(DEFENDER_TYPES):
+        defender_types = [TYPES[type_id] for type_id in type_ids]
+        assert defender_type_index(list(reversed(defender_types))) == defender_index
+        for attacker_type in TYPES:
+            expected = 1.0
+            for defender_type in defender_types:
+                expected *= TypeEffectiveness.TYPE_EFFECTIVENESS[attacker_type].get(defender_type, 1.0)
+            assert type_effectiveness.get_type_effectiveness_by_index(attacker_type, defender_index) == expected
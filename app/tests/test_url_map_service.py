@@ -1,97 +1,124 @@
 import pytest
 import requests
 from unittest.mock import Mock, patch
+from app.cache.name_index import PokemonNameIndex
 from app.services.url_map_service import PokemonURLMapper
 from app.exceptions import PokemonAPIException, PokemonNotFoundException
 
 
 @pytest.fixture
 def cache_manager():
-    return Mock()
+    cache = {}
+    manager = Mock()
+    manager.get_pokemon_data.side_effect = lambda name: cache.get(name)
+    manager.set_pokemon_data.side_effect = lambda name, data: cache.__setitem__(name, data)
+    return manager
 
 
 @pytest.fixture
-def url_mapper(cache_manager):
-    return PokemonURLMapper(cache_manager)
+def name_index(tmp_path):
+    return PokemonNameIndex(str(tmp_path / 'pokemon_index.sqlite'))
 
 
-def test_initialize_mapping_from_cache(cache_manager):
+@pytest.fixture
+def url_mapper(cache_manager, name_index):
+    return PokemonURLMapper(cache_manager, name_index=name_index)
+
+
+def listing_response(results, next_url=None):
+    response = Mock()
+    response.json.return_value = {'results': results, 'next': next_url}
+    response.raise_for_status.return_value = None
+    return response
+
+
+def test_mapping_is_not_loaded_at_construction(cache_manager, name_index):
+    with patch('requests.Session.get') as mock_get:
+        # Act
+        PokemonURLMapper(cache_manager, name_index=name_index)
+
+        # Assert
+        mock_get.assert_not_called()
+        cache_manager.get_pokemon_data.assert_not_called()
+
+
+def test_mapping_from_cache(url_mapper, cache_manager):
     # Arrange
-    cached_mapping = {
-        'pikachu': 'https://pokeapi.co/api/v2/pokemon/25'
-    }
-    cache_manager.get_pokemon_data.return_value = cached_mapping
+    cache_manager.set_pokemon_data('pokemon_url_mapping', {'pikachu': 25})
 
     # Act
-    mapper = PokemonURLMapper(cache_manager)
+    url = url_mapper.get_pokemon_url('pikachu')
 
     # Assert
-    assert mapper.pokemon_urls == cached_mapping
-    cache_manager.get_pokemon_data.assert_called_once_with('pokemon_url_mapping')
+    assert url == 'https://pokeapi.co/api/v2/pokemon/25/'
+
+
+def test_mapping_from_persisted_index(url_mapper, name_index):
+    # Arrange
+    name_index.save({'pikachu': 25})
+
+    with patch('requests.Session.get') as mock_get:
+        # Act
+        pokemon_id = url_mapper.get_pokemon_id('pikachu')
+
+        # Assert
+        assert pokemon_id == 25
+        mock_get.assert_not_called()
 
 
-def test_initialize_mapping_from_api(cache_manager):
+def test_mapping_from_api_is_persisted(url_mapper, name_index):
     # Arrange
-    cache_manager.get_pokemon_data.return_value = None
-    mock_response = Mock()
-    mock_response.json.return_value = {
-        'results': [
-            {'name': 'pikachu', 'url': 'https://pokeapi.co/api/v2/pokemon/25'}
-        ],
-        'next': None
-    }
-    mock_response.raise_for_status.return_value = None
-
-    with patch('requests.get', return_value=mock_response) as mock_get:
+    response = listing_response([{'name': 'pikachu', 'url': 'https://pokeapi.co/api/v2/pokemon/25/'}])
+
+    with patch('requests.Session.get', return_value=response) as mock_get:
         # Act
-        mapper = PokemonURLMapper(cache_manager)
+        url = url_mapper.get_pokemon_url('pikachu')
 
         # Assert
-        assert mapper.pokemon_urls == {
-            'pikachu': 'https://pokeapi.co/api/v2/pokemon/25'
-        }
-        cache_manager.set_pokemon_data.assert_called_once()
-        mock_get.assert_called()
+        assert url == 'https://pokeapi.co/api/v2/pokemon/25/'
+        assert name_index.load() == {'pikachu': 25}
+        mock_get.assert_called_once()
 
 
-def test_get_pokemon_url_success(url_mapper):
+def test_stale_index_is_refreshed_in_background(cache_manager, name_index):
     # Arrange
-    url_mapper.pokemon_urls = {
-        'pikachu': 'https://pokeapi.co/api/v2/pokemon/25'
-    }
+    name_index.save({'pikachu': 25})
+    mapper = PokemonURLMapper(cache_manager, name_index=name_index, refresh_seconds=0)
+    response = listing_response([{'name': 'pikachu', 'url': 'url/25/'}, {'name': 'eevee', 'url': 'url/133/'}])
 
-    # Act
-    url = url_mapper.get_pokemon_url('pikachu')
+    with patch('requests.Session.get', return_value=response):
+        # Act
+        assert mapper.get_pokemon_id('pikachu') == 25, "the stale index answers immediately"
+        mapper._refresh_thread.join(timeout=5)
 
     # Assert
-    assert url == 'https://pokeapi.co/api/v2/pokemon/25'
+    assert mapper.get_pokemon_id('eevee') == 133
+    assert name_index.load() == {'pikachu': 25, 'eevee': 133}
 
 
-def test_get_pokemon_url_not_found(url_mapper):
+def test_get_pokemon_url_not_found(url_mapper, cache_manager):
     # Arrange
-    url_mapper.pokemon_urls = {}
+    cache_manager.set_pokemon_data('pokemon_url_mapping', {'pikachu': 25})
 
     # Act/Assert
     with pytest.raises(PokemonNotFoundException):
         url_mapper.get_pokemon_url('not-exists')
 
 
-def test_get_pokemon_url_case_insensitive(url_mapper):
+def test_get_pokemon_url_case_insensitive(url_mapper, cache_manager):
     # Arrange
-    url_mapper.pokemon_urls = {
-        'pikachu': 'https://pokeapi.co/api/v2/pokemon/25'
-    }
+    cache_manager.set_pokemon_data('pokemon_url_mapping', {'pikachu': 25})
 
     # Act
     url = url_mapper.get_pokemon_url('PIKACHU')
 
     # Assert
-    assert url == 'https://pokeapi.co/api/v2/pokemon/25'
+    assert url == 'https://pokeapi.co/api/v2/pokemon/25/'
 
 
 def test_make_api_request_timeout():
     # Arrange
-    with patch('requests.get', side_effect=requests.Timeout):
+    with patch('requests.Session.get', side_effect=requests.Timeout):
         # Act/Assert
         with pytest.raises(PokemonAPIException, match="Request timed out"):
             PokemonURLMapper._make_api_request("https://test-url.com")
@@ -99,35 +126,26 @@ def test_make_api_request_timeout():
 
 def test_make_api_request_error():
     # Arrange
-    with patch('requests.get', side_effect=requests.RequestException("Network error")):
+    with patch('requests.Session.get', side_effect=requests.RequestException("Network error")):
         # Act/Assert
         with pytest.raises(PokemonAPIException, match="API request failed: Network error"):
             PokemonURLMapper._make_api_request("https://test-url.com")
 
 
-def test_fetch_all_pokemon_urls_pagination(cache_manager):
+def test_fetch_all_pokemon_ids_pagination(url_mapper):
     # Arrange
-    cache_manager.get_pokemon_data.return_value = None
-    first_response = Mock()
-    first_response.json.return_value = {
-        'results': [{'name': 'pikachu', 'url': 'url1'}],
-        'next': 'next_url'
-    }
-    second_response = Mock()
-    second_response.json.return_value = {
-        'results': [{'name': 'charmander', 'url': 'url2'}],
-        'next': None
-    }
-
-    with patch('requests.get') as mock_get:
+    first_response = listing_response([{'name': 'pikachu', 'url': 'url/25/'}], next_url='next_url')
+    second_response = listing_response([{'name': 'charmander', 'url': 'url/4'}])
+
+    with patch('requests.Session.get') as mock_get:
         mock_get.side_effect = [first_response, second_response]
 
         # Act
-        mapper = PokemonURLMapper(cache_manager)
+        url_mapper.get_pokemon_id('pikachu')
 
         # Assert
-        assert mapper.pokemon_urls == {
-            'pikachu': 'url1',
-            'charmander': 'url2'
+        assert url_mapper.cache_manager.get_pokemon_data('pokemon_url_mapping') == {
+            'pikachu': 25,
+            'charmander': 4
         }
-        assert mock_get.call_count == 2
\ No newline at end of file
+        assert mock_get.call_count == 2
@@ -0,0 +1,74 @@
+"""
+Battles per second of the scalar BattleSimulation loop vs BatchBattleSimulation, including the
+build_roster_matchups step that turns a roster and its pairings into damage arrays.
+
+    python -m benchmarks.bench_batch_battles [--battles 1000000] [--species 1000] [--scalar-battles 2000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.battle_logic.batch_simulation import BatchBattleSimulation, build_roster_matchups
+from app.battle_logic.battle_simulation import BattleSimulation
+from app.battle_logic.move_handler import MoveHandler
+from app.models import Pokemon
+
+
+class FixedDamageMoves(MoveHandler):
+    """Move handler stand-in whose single move always deals the attacker's attack stat as damage."""
+
+    def __init__(self):
+        super().__init__(None)
+
+    @staticmethod
+    def select_move(pokemon, defender=None):
+        return 'strike'
+
+    def get_move_data(self, move_name):
+        return {'name': move_name, 'power': 1, 'type': 'normal', 'damage_class': 'physical'}
+
+
+class NeutralTypes:
+    @staticmethod
+    def get_type_effectiveness(attacker_types, defender_types):
+        return 1.0
+
+
+def random_roster(species: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    return [Pokemon(id=index, name=f'species-{index}', hp=int(hp), attack=int(attack), defense=1,
+                    special_attack=1, special_defense=1, speed=1, types=['normal'], moves=['strike'])
+            for index, (hp, attack) in enumerate(zip(rng.integers(20, 256, species), rng.integers(1, 60, species)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--battles', type=int, default=1000000)
+    parser.add_argument('--species', type=int, default=1000)
+    parser.add_argument('--scalar-battles', type=int, default=2000)
+    args = parser.parse_args()
+
+    roster = random_roster(args.species)
+    rng = np.random.default_rng(1)
+    first, second = rng.integers(0, args.species, args.battles), rng.integers(0, args.species, args.battles)
+
+    started = time.perf_counter()
+    batch = build_roster_matchups(roster, first, second, FixedDamageMoves(), NeutralTypes())
+    build_seconds = time.perf_counter() - started
+    BatchBattleSimulation().simulate(batch)
+    batch_seconds = time.perf_counter() - started
+
+    scalar = BattleSimulation(NeutralTypes(), FixedDamageMoves())
+    started = time.perf_counter()
+    for index in range(args.scalar_battles):
+        scalar.simulate_battle(roster[first[index]].model_copy(), roster[second[index]].model_copy())
+    scalar_seconds = time.perf_counter() - started
+
+    print(f"scalar: {args.scalar_battles / scalar_seconds:12,.0f} battles/s")
+    print(f" batch: {args.battles / batch_seconds:12,.0f} battles/s ({args.battles:,} battles in {batch_seconds:.2f}s, "
+          f"{build_seconds:.2f}s of it building the matchups)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Size of the battles table and insert time: newline-joined text logs vs compressed battle records.
+
+    python -m benchmarks.bench_battle_storage [--battles 5000] [--resolution stochastic] [--long] [--batch-size 500]
+                                              [--repeat 5]
+
+`--long` pits weak attackers against sturdy defenders, so battles last hundreds of turns and their text
+logs run to kilobytes. Each batch is committed on its own, as the write-behind queue does; a batch size
+of 1 is the inline path, which commits every battle. Insert rates are from the fastest of `--repeat` runs.
+Long battles shrink the table 46x (stochastic) to 82x (analytic) and insert faster; battles of a few turns
+shrink it 7-9x, bounded by the row's other columns, and insert at about the rate of text.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import sqlalchemy as sa
+
+from app.battle_logic.battle_simulation import ANALYTIC, ITERATIVE, STOCHASTIC
+from app.database.models import Battle
+from app.models import Pokemon
+from benchmarks.bench_battle_turns import build_simulation
+
+
+def random_pokemon(rng: random.Random, pokemon_id: int, long: bool = False) -> Pokemon:
+    attack, defense = ((10, 30), (200, 250)) if long else ((20, 150), (20, 230))
+    return Pokemon(id=pokemon_id, name=f'pokemon-{pokemon_id}', hp=rng.randint(40, 255),
+                   attack=rng.randint(*attack), defense=rng.randint(*defense), special_attack=rng.randint(*attack),
+                   special_defense=rng.randint(*defense), speed=rng.randint(5, 150), types=['normal'],
+                   moves=['tackle', 'ember'])
+
+
+def build_rows(battles: int, resolution: str, long: bool = False):
+    simulation = build_simulation()
+    simulation.resolution, simulation.max_turns = resolution, 10000
+    rng = random.Random(0)
+    text_rows, record_rows = [], []
+    for index in range(battles):
+        pokemon1, pokemon2 = random_pokemon(rng, 2 * index, long), random_pokemon(rng, 2 * index + 1, long)
+        outcome, record = simulation.record_battle(pokemon1, pokemon2, seed=index)
+        row = {'pokemon1_id': pokemon1.id, 'pokemon2_id': pokemon2.id, 'winner': outcome.winner}
+        text_rows.append((row, list(record.iter_log())))
+        record_rows.append((row, record))
+    return text_rows, record_rows
+
+
+def encode_text(row, log):
+    return {**row, 'battle_log': '\n'.join(log), 'battle_record': None}
+
+
+def encode_record(row, record):
+    return {**row, 'battle_log': '', 'battle_record': record.encode()}
+
+
+def store(path: str, rows, encode, batch_size: int):
+    """Encoding is part of the insert cost for both formats: joining the log lines, or packing the record."""
+    engine = sa.create_engine(f'sqlite:///{path}')
+    Battle.__table__.create(engine)
+    written = []
+    started = time.perf_counter()
+    for start in range(0, len(rows), batch_size):
+        batch = [encode(*row) for row in rows[start:start + batch_size]]
+        with engine.begin() as connection:
+            connection.execute(sa.insert(Battle.__table__), batch)
+        written += batch
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    payload = sum(len(row['battle_log']) + len(row['battle_record'] or b'') for row in written)
+    return elapsed, os.path.getsize(path), payload / len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--battles', type=int, default=5000)
+    parser.add_argument('--resolution', choices=(ANALYTIC, ITERATIVE, STOCHASTIC), default=STOCHASTIC)
+    parser.add_argument('--long', action='store_true')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text_rows, record_rows = build_rows(args.battles, args.resolution, args.long)
+    text_runs, record_runs = [], []
+    for run in range(args.repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            text_runs.append(store(os.path.join(directory, 'text.db'), text_rows, encode_text, args.batch_size))
+            record_runs.append(store(os.path.join(directory, 'record.db'), record_rows, encode_record,
+                                     args.batch_size))
+    text_time, text_size, text_payload = min(text_runs)
+    record_time, record_size, record_payload = min(record_runs)
+
+    print(f"text logs:      {text_size / 1024:10,.0f} KiB {text_payload:8,.0f} B/battle "
+          f"{args.battles / text_time:12,.0f} inserts/s")
+    print(f"battle records: {record_size / 1024:10,.0f} KiB {record_payload:8,.0f} B/battle "
+          f"{args.battles / record_time:12,.0f} inserts/s "
+          f"(table {text_size / record_size:.1f}x, payload {text_payload / record_payload:.1f}x smaller)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Turns per second of the iterative battle loop: damage resolved every turn vs once per battle.
+
+    python -m benchmarks.bench_battle_turns [--battles 200] [--hp 5000]
+"""
+import argparse
+import time
+
+from app.battle_logic.battle_simulation import ITERATIVE, BattleSimulation
+from app.battle_logic.move_handler import MoveHandler
+from app.battle_logic.type_effectiveness import TypeEffectiveness
+from app.cache.pokemon_cache import PokemonCacheManager
+from app.models import Pokemon
+from app.services.pokeapi_service import PokeAPIService
+
+
+def build_simulation() -> BattleSimulation:
+    """Moves come from a warm PokemonCacheManager through PokeAPIService, as in the app."""
+    cache_manager = PokemonCacheManager()
+    cache_manager.set_move_data('tackle', {'name': 'tackle', 'power': 40, 'type': 'normal',
+                                           'damage_class': 'physical'})
+    cache_manager.set_move_data('ember', {'name': 'ember', 'power': 40, 'type': 'fire', 'damage_class': 'special'})
+    move_handler = MoveHandler(PokeAPIService(cache_manager=cache_manager))
+    return BattleSimulation(TypeEffectiveness(), move_handler, resolution=ITERATIVE, max_turns=10 ** 9,
+                            max_seconds=0)
+
+
+def long_battle(hp: int):
+    # High defense keeps every hit at the 1 damage minimum, so a battle lasts about 2 * hp turns.
+    return (Pokemon(id=1, name='snorlax', hp=hp, attack=10, defense=250, special_attack=10, special_defense=250,
+                    speed=30, types=['normal'], moves=['tackle']),
+            Pokemon(id=2, name='shuckle', hp=hp, attack=10, defense=250, special_attack=10, special_defense=250,
+                    speed=5, types=['bug', 'rock'], moves=['ember']))
+
+
+def per_turn(simulation: BattleSimulation, pokemon1: Pokemon, pokemon2: Pokemon) -> int:
+    """The loop before damage profiles: move lookup, type multiplier and formula on every attack."""
+    turns = 0
+    while pokemon1.hp > 0 and pokemon2.hp > 0:
+        simulation.attack(pokemon1, pokemon2)
+        turns += 1
+        if pokemon2.hp == 0:
+            break
+        simulation.attack(pokemon2, pokemon1)
+        turns += 1
+    return turns
+
+
+def compiled(simulation: BattleSimulation, pokemon1: Pokemon, pokemon2: Pokemon) -> int:
+    # play_battle runs the iterative turn loop once without formatting the (unused) log.
+    outcome, _ = simulation.play_battle(pokemon1, pokemon2)
+    return outcome.turns
+
+
+def turns_per_second(loop, simulation: BattleSimulation, battles: int, hp: int) -> float:
+    turns = 0
+    started = time.perf_counter()
+    for _ in range(battles):
+        turns += loop(simulation, *long_battle(hp))
+    return turns / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--battles', type=int, default=200)
+    parser.add_argument('--hp', type=int, default=5000)
+    args = parser.parse_args()
+
+    simulation = build_simulation()
+    before = turns_per_second(per_turn, simulation, args.battles, args.hp)
+    after = turns_per_second(compiled, simulation, args.battles, args.hp)
+
+    print(f"per-turn resolution: {before:14,.0f} turns/s")
+    print(f" compiled profiles:  {after:14,.0f} turns/s ({after / before:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Bytes per cached species and move: pydantic PokemonData / move dicts vs SpeciesRecord / MoveRecord.
+
+    python -m benchmarks.bench_cache_memory [--species 1025] [--moves 919]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+
+from app.cache.records import MoveRecord, SpeciesRecord
+from app.services.data_tranformer import PokemonDataTransformer
+from benchmarks.payloads import move_payload, pokemon_payload
+
+
+def retained_bytes(build) -> int:
+    """Memory still allocated by the values `build` returns, after temporaries are freed."""
+    # Warm-up run, so one-off growth of interpreter tables (e.g. the interned strings dict) is not counted.
+    build()
+    gc.collect()
+    tracemalloc.start()
+    values = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del values
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--species', type=int, default=1025)
+    parser.add_argument('--moves', type=int, default=919)
+    args = parser.parse_args()
+
+    # Decode from bytes on each build, as a fetch would, so no strings are shared with the payloads.
+    species_raw = [json.dumps(pokemon_payload(pokemon_id, moves_count=8)).encode()
+                   for pokemon_id in range(1, args.species + 1)]
+    moves_raw = [json.dumps(move_payload(move_id)).encode() for move_id in range(1, args.moves + 1)]
+
+    def pokemon_data():
+        return [PokemonDataTransformer.transform_raw_to_pokemon_data(raw) for raw in species_raw]
+
+    def move_dicts():
+        return [PokemonDataTransformer.transform_to_move_data(json.loads(raw)) for raw in moves_raw]
+
+    rows = (
+        ('species', 'PokemonData', retained_bytes(pokemon_data), args.species),
+        ('species', 'SpeciesRecord',
+         retained_bytes(lambda: [SpeciesRecord.from_pokemon_data(data) for data in pokemon_data()]), args.species),
+        ('moves', 'dict', retained_bytes(move_dicts), args.moves),
+        ('moves', 'MoveRecord', retained_bytes(lambda: [MoveRecord.from_dict(data) for data in move_dicts()]),
+         args.moves),
+    )
+    for kind, representation, total, count in rows:
+        print(f"{kind:>8} {representation:>14}: {total / count:7.0f} B/entry  {total / 1024:8.0f} KB total")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Compare the full-document parse of `/pokemon/{name}` payloads with the field-selective one.
+
+    python -m benchmarks.bench_pokemon_parsing [--moves 100] [--iterations 200]
+"""
+import argparse
+import json
+import timeit
+import tracemalloc
+
+from app.services.data_tranformer import PokemonDataTransformer
+from benchmarks.payloads import pokemon_payload
+
+
+def full_parse(raw: bytes):
+    return PokemonDataTransformer.transform_to_pokemon_data(json.loads(raw))
+
+
+def selective_parse(raw: bytes):
+    return PokemonDataTransformer.transform_raw_to_pokemon_data(raw)
+
+
+def peak_allocation(fn, raw: bytes) -> int:
+    tracemalloc.start()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--moves', type=int, default=100, help="Moves in the synthetic payload")
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    raw = json.dumps(pokemon_payload(25, moves_count=args.moves)).encode()
+    assert full_parse(raw) == selective_parse(raw), "both paths must produce the same PokemonData"
+
+    print(f"payload: {len(raw) / 1024:.0f} KB, {args.moves} moves")
+    for name, fn in (('full', full_parse), ('selective', selective_parse)):
+        seconds = min(timeit.repeat(lambda: fn(raw), number=args.iterations, repeat=5)) / args.iterations
+        print(f"{name:>10}: {seconds * 1e6:8.0f} us/parse  peak {peak_allocation(fn, raw) / 1024:8.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
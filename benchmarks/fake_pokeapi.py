@@ -0,0 +1,211 @@
+"""
+Local stand-in for PokeAPI with configurable latency, error rate and payload fixtures.
+
+Serves the endpoints `APIClient` and `PokemonURLMapper` call:
+    GET /api/v2/pokemon?offset=&limit=     paginated listing
+    GET /api/v2/pokemon/{id or name}/
+    GET /api/v2/move/{id or name}/
+
+Payloads come from a PokeAPI dump (`--fixtures`, same layout the snapshot importer reads)
+or are generated by `benchmarks.payloads`. Responses carry an ETag and honour If-None-Match.
+
+    python -m benchmarks.fake_pokeapi [--port 8765] [--count 1025] [--latency-ms 80] [--jitter-ms 40]
+                                      [--error-rate 0.01] [--fixtures /path/to/dump]
+
+Point the app at it with POKEAPI_BASE_URL=http://127.0.0.1:8765/api/v2.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.payloads import move_payload, pokemon_name, pokemon_payload
+
+API_PREFIX = '/api/v2'
+RESOURCE_PATH = re.compile(r'^/api/v2/(pokemon|move)/([^/]+)/?$')
+LISTING_PATH = re.compile(r'^/api/v2/pokemon/?$')
+SYNTHETIC_NAME = re.compile(r'^(?:pokemon|move)-(\d+)$')
+
+
+class FixtureStore:
+    """JSON payloads by kind and by name or id, read from a PokeAPI dump or generated on demand."""
+
+    def __init__(self, count: int = 1025, moves_count: int = 100, fixtures_dir: Optional[str] = None):
+        self.count = count
+        self.moves_count = moves_count
+        self._files: Dict[Tuple[str, str], str] = {}
+        self._names: Dict[int, str] = {}
+        if fixtures_dir:
+            self._index_fixtures(fixtures_dir)
+
+    def listing(self, offset: int, limit: int, base_url: str) -> dict:
+        ids = sorted(self._names) if self._names else range(1, self.count + 1)
+        page = list(ids)[offset:offset + limit]
+        next_offset = offset + limit
+        return {
+            'count': len(ids),
+            'next': f'{base_url}{API_PREFIX}/pokemon?offset={next_offset}&limit={limit}' if next_offset < len(ids)
+            else None,
+            'previous': None,
+            'results': [{'name': self._names.get(pokemon_id, pokemon_name(pokemon_id)),
+                         'url': f'{base_url}{API_PREFIX}/pokemon/{pokemon_id}/'} for pokemon_id in page]
+        }
+
+    @lru_cache(maxsize=4096)
+    def resource(self, kind: str, key: str) -> Optional[bytes]:
+        path = self._files.get((kind, key))
+        if path is not None:
+            with open(path, 'rb') as payload_file:
+                return payload_file.read()
+        if self._files:
+            return None
+
+        match = SYNTHETIC_NAME.match(key)
+        resource_id = int(match.group(1)) if match else int(key) if key.isdigit() else None
+        if resource_id is None or resource_id < 1:
+            return None
+        if kind == 'pokemon':
+            if resource_id > self.count:
+                return None
+            return json.dumps(pokemon_payload(resource_id, moves_count=self.moves_count)).encode()
+        return json.dumps(move_payload(resource_id)).encode()
+
+    def _index_fixtures(self, fixtures_dir: str) -> None:
+        for root, _, files in os.walk(fixtures_dir):
+            for file_name in files:
+                if not file_name.endswith('.json'):
+                    continue
+                path = os.path.join(root, file_name)
+                kind = next((part for part in reversed(os.path.relpath(root, fixtures_dir).split(os.sep))
+                             if part in ('pokemon', 'move')), None)
+                if kind is None:
+                    continue
+                with open(path, 'rb') as payload_file:
+                    try:
+                        data = json.loads(payload_file.read())
+                    except ValueError:
+                        continue
+                if not isinstance(data, dict) or 'id' not in data or 'name' not in data:
+                    continue
+                self._files[(kind, data['name'])] = path
+                self._files[(kind, str(data['id']))] = path
+                if kind == 'pokemon':
+                    self._names[data['id']] = data['name']
+
+
+class FakePokeAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], fixtures: FixtureStore, latency_ms: float = 0,
+                 jitter_ms: float = 0, error_rate: float = 0, seed: Optional[int] = None):
+        super().__init__(address, FakePokeAPIHandler)
+        self.fixtures = fixtures
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self.requests_served = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def draw_delay_and_error(self) -> Tuple[float, bool]:
+        """Fixed latency plus an exponential jitter tail, like a real upstream's p99."""
+        with self._rng_lock:
+            self.requests_served += 1
+            jitter = self._rng.expovariate(1 / self.jitter_ms) if self.jitter_ms > 0 else 0
+            return (self.latency_ms + jitter) / 1000, self._rng.random() < self.error_rate
+
+
+class FakePokeAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server: FakePokeAPIServer
+
+    def do_GET(self):
+        delay, fail = self.server.draw_delay_and_error()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send(503, b'{"detail": "injected error"}')
+            return
+
+        url = urlsplit(self.path)
+        if LISTING_PATH.match(url.path):
+            query = parse_qs(url.query)
+            offset = int(query.get('offset', ['0'])[0])
+            limit = int(query.get('limit', ['20'])[0])
+            self._send(200, json.dumps(self.server.fixtures.listing(offset, limit, self.server.base_url)).encode())
+            return
+
+        match = RESOURCE_PATH.match(url.path)
+        body = self.server.fixtures.resource(match.group(1), match.group(2).lower()) if match else None
+        if body is None:
+            self._send(404, b'Not Found', content_type='text/plain')
+            return
+
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if self.headers.get('If-None-Match') == etag:
+            self._send(304, b'', etag=etag)
+            return
+        self._send(200, body, etag=etag)
+
+    def _send(self, status: int, body: bytes, content_type: str = 'application/json', etag: Optional[str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0, **options) -> FakePokeAPIServer:
+    """Start a server on a daemon thread (port 0 picks a free port) and return it."""
+    fixtures = options.pop('fixtures', None) or FixtureStore()
+    server = FakePokeAPIServer((host, port), fixtures, **options)
+    threading.Thread(target=server.serve_forever, name='fake-pokeapi', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--count', type=int, default=1025, help="Synthetic Pokemon to serve")
+    parser.add_argument('--moves', type=int, default=100, help="Moves per synthetic Pokemon")
+    parser.add_argument('--fixtures', help="PokeAPI dump directory to serve instead of synthetic payloads")
+    parser.add_argument('--latency-ms', type=float, default=80, help="Fixed latency added to every response")
+    parser.add_argument('--jitter-ms', type=float, default=40, help="Mean of the exponential latency tail")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    fixtures = FixtureStore(count=args.count, moves_count=args.moves, fixtures_dir=args.fixtures)
+    server = FakePokeAPIServer((args.host, args.port), fixtures, latency_ms=args.latency_ms,
+                               jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed)
+    print(f"Fake PokeAPI listening on {server.base_url}{API_PREFIX}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+End-to-end load generator for `POST /api/battles` and `GET /api/pokemon/<name>`.
+
+Names are drawn from a Zipf distribution over the upstream listing, so a few popular Pokemon
+dominate the traffic like in production. Each request is labelled cold when it is the first one
+touching its name(s) in this run and warm otherwise; throughput and p50/p95/p99 latency are
+reported per endpoint and per label.
+
+    python -m benchmarks.load_test --target http://127.0.0.1:5001 --pokeapi http://127.0.0.1:8765/api/v2
+                                   [--requests 2000] [--concurrency 16] [--battle-ratio 0.5] [--zipf 1.1]
+
+Pass `--fake-pokeapi` instead of `--pokeapi` to start `benchmarks.fake_pokeapi` in-process; the
+app under test must then be started with POKEAPI_BASE_URL set to the printed URL.
+"""
+import argparse
+import bisect
+import itertools
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import requests
+
+from benchmarks.fake_pokeapi import FixtureStore, start_server
+
+BATTLE = 'POST /api/battles'
+POKEMON = 'GET /api/pokemon/<name>'
+
+
+class Sample(NamedTuple):
+    endpoint: str
+    label: str
+    status: int
+    seconds: float
+
+
+class ZipfNames:
+    """Draws names with probability proportional to 1 / rank ** exponent."""
+
+    def __init__(self, names: Sequence[str], exponent: float, rng: random.Random):
+        self.names = list(names)
+        self.cumulative = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, len(self.names) + 1)))
+        self.rng = rng
+
+    def draw(self) -> str:
+        return self.names[bisect.bisect(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+
+def fetch_names(pokeapi_url: str, limit: int) -> List[str]:
+    response = requests.get(f'{pokeapi_url}/pokemon', params={'offset': 0, 'limit': limit}, timeout=30)
+    response.raise_for_status()
+    return [entry['name'] for entry in response.json()['results']]
+
+
+def plan_requests(names: Sequence[str], total: int, battle_ratio: float, exponent: float, seed: int):
+    """The full request schedule, decided up front so runs are reproducible."""
+    rng = random.Random(seed)
+    zipf = ZipfNames(names, exponent, rng)
+    seen = set()
+    plan = []
+    for _ in range(total):
+        if rng.random() < battle_ratio:
+            touched = (zipf.draw(), zipf.draw())
+            endpoint = BATTLE
+        else:
+            touched = (zipf.draw(),)
+            endpoint = POKEMON
+        label = 'warm' if seen.issuperset(touched) else 'cold'
+        seen.update(touched)
+        plan.append((endpoint, label, touched))
+    return plan
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class LoadGenerator:
+    def __init__(self, target: str, concurrency: int, timeout: float = 30):
+        self.target = target.rstrip('/')
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def run(self, plan) -> List[Sample]:
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(lambda entry: self._send(*entry), plan))
+
+    def _send(self, endpoint: str, label: str, names) -> Sample:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+
+        started = time.perf_counter()
+        try:
+            if endpoint == BATTLE:
+                response = session.post(f'{self.target}/api/battles', timeout=self.timeout,
+                                        json={'pokemon1': names[0], 'pokemon2': names[1]})
+            else:
+                response = session.get(f'{self.target}/api/pokemon/{names[0]}', timeout=self.timeout)
+            status = response.status_code
+        except requests.RequestException:
+            status = 0
+        return Sample(endpoint, label, status, time.perf_counter() - started)
+
+
+def report(samples: List[Sample], elapsed: float) -> None:
+    groups: Dict[tuple, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        groups[(sample.endpoint, sample.label)].append(sample)
+        groups[(sample.endpoint, 'all')].append(sample)
+
+    print(f"{len(samples)} requests in {elapsed:.2f}s ({len(samples) / elapsed:.1f} req/s)")
+    print(f"{'endpoint':<26}{'cache':>6}{'count':>7}{'errors':>8}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for (endpoint, label), group in sorted(groups.items()):
+        latencies = sorted(sample.seconds * 1000 for sample in group)
+        errors = sum(1 for sample in group if not 200 <= sample.status < 300)
+        print(f"{endpoint:<26}{label:>6}{len(group):>7}{errors:>8}{len(group) / elapsed:>8.1f}"
+              f"{percentile(latencies, 0.50):>9.1f}{percentile(latencies, 0.95):>9.1f}"
+              f"{percentile(latencies, 0.99):>9.1f}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--target', default='http://127.0.0.1:5001', help="Base URL of the app under test")
+    upstream = parser.add_mutually_exclusive_group()
+    upstream.add_argument('--pokeapi', default='https://pokeapi.co/api/v2', help="Upstream used for the name list")
+    upstream.add_argument('--fake-pokeapi', type=int, metavar='PORT',
+                          help="Start benchmarks.fake_pokeapi on this port and take names from it")
+    parser.add_argument('--latency-ms', type=float, default=80, help="Fake upstream latency")
+    parser.add_argument('--jitter-ms', type=float, default=40, help="Fake upstream latency tail")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fake upstream 503 rate")
+    parser.add_argument('--names', type=int, default=1025, help="Size of the name population")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--battle-ratio', type=float, default=0.5, help="Fraction of requests that are battles")
+    parser.add_argument('--zipf', type=float, default=1.1, help="Zipf exponent of name popularity")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    pokeapi_url = args.pokeapi
+    if args.fake_pokeapi is not None:
+        server = start_server(port=args.fake_pokeapi, fixtures=FixtureStore(count=args.names),
+                              latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                              error_rate=args.error_rate, seed=args.seed)
+        pokeapi_url = f'{server.base_url}/api/v2'
+        print(f"Fake PokeAPI listening on {pokeapi_url}")
+        input("Start the app with POKEAPI_BASE_URL set to it, then press Enter...")
+
+    plan = plan_requests(fetch_names(pokeapi_url, args.names), args.requests, args.battle_ratio, args.zipf,
+                         args.seed)
+    started = time.perf_counter()
+    samples = LoadGenerator(args.target, args.concurrency).run(plan)
+    report(samples, time.perf_counter() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import random
+from typing import Dict, List
+
+VERSION_GROUPS = [
+    'red-blue', 'yellow', 'gold-silver', 'crystal', 'ruby-sapphire', 'emerald', 'firered-leafgreen',
+    'diamond-pearl', 'platinum', 'heartgold-soulsilver', 'black-white', 'black-2-white-2', 'x-y',
+    'omega-ruby-alpha-sapphire', 'sun-moon', 'ultra-sun-ultra-moon', 'sword-shield', 'scarlet-violet'
+]
+TYPES = [
+    'normal', 'fire', 'water', 'electric', 'grass', 'ice', 'fighting', 'poison', 'ground',
+    'flying', 'psychic', 'bug', 'rock', 'ghost', 'dark', 'dragon', 'steel', 'fairy'
+]
+STATS = ['hp', 'attack', 'defense', 'special-attack', 'special-defense', 'speed']
+BASE_URL = 'https://pokeapi.co/api/v2'
+
+
+def _ref(kind: str, name: str, resource_id: int) -> Dict[str, str]:
+    return {'name': name, 'url': f'{BASE_URL}/{kind}/{resource_id}/'}
+
+
+def move_name(move_id: int) -> str:
+    return f'move-{move_id}'
+
+
+def pokemon_name(pokemon_id: int) -> str:
+    return f'pokemon-{pokemon_id}'
+
+
+def pokemon_payload(pokemon_id: int, moves_count: int = 100, move_pool: int = 900) -> dict:
+    """
+    A synthetic `/pokemon/{id}` document with the same shape and roughly the same size as the
+    real PokeAPI response (~200 KB for a species with 100 moves).
+    """
+    rng = random.Random(pokemon_id)
+    move_ids = rng.sample(range(1, move_pool + 1), min(moves_count, move_pool))
+    types = rng.sample(TYPES, rng.choice([1, 2]))
+
+    moves = [{
+        'move': _ref('move', move_name(move_id), move_id),
+        'version_group_details': [{
+            'level_learned_at': rng.randint(0, 60),
+            'move_learn_method': _ref('move-learn-method', 'level-up', 1),
+            'order': None,
+            'version_group': _ref('version-group', version_group, index + 1)
+        } for index, version_group in enumerate(VERSION_GROUPS[:rng.randint(3, len(VERSION_GROUPS))])]
+    } for move_id in move_ids]
+
+    sprites = {
+        'front_default': f'https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png',
+        'other': {
+            f'generation-{generation}': {
+                version_group: {
+                    'front_default': f'https://raw.githubusercontent.com/PokeAPI/sprites/{version_group}/{pokemon_id}.png',
+                    'front_shiny': None
+                } for version_group in VERSION_GROUPS[:4]
+            } for generation in range(1, 9)
+        }
+    }
+
+    return {
+        'abilities': [{'ability': _ref('ability', 'static', 9), 'is_hidden': False, 'slot': 1}],
+        'base_experience': rng.randint(40, 300),
+        'cries': {'latest': f'https://raw.githubusercontent.com/PokeAPI/cries/main/cries/pokemon/latest/{pokemon_id}.ogg'},
+        'forms': [_ref('pokemon-form', pokemon_name(pokemon_id), pokemon_id)],
+        'game_indices': [{'game_index': pokemon_id, 'version': _ref('version', version_group, index + 1)}
+                         for index, version_group in enumerate(VERSION_GROUPS)],
+        'height': rng.randint(2, 40),
+        'held_items': [],
+        'id': pokemon_id,
+        'is_default': True,
+        'location_area_encounters': f'{BASE_URL}/pokemon/{pokemon_id}/encounters',
+        'moves': moves,
+        'name': pokemon_name(pokemon_id),
+        'order': pokemon_id,
+        'past_abilities': [],
+        'past_types': [],
+        'species': _ref('pokemon-species', pokemon_name(pokemon_id), pokemon_id),
+        'sprites': sprites,
+        'stats': [{'base_stat': rng.randint(20, 160), 'effort': 0, 'stat': _ref('stat', stat, index + 1)}
+                  for index, stat in enumerate(STATS)],
+        'types': [{'slot': slot + 1, 'type': _ref('type', type_name, TYPES.index(type_name) + 1)}
+                  for slot, type_name in enumerate(types)],
+        'weight': rng.randint(10, 2000)
+    }
+
+
+def move_payload(move_id: int) -> dict:
+    rng = random.Random(-move_id)
+    return {
+        'id': move_id,
+        'name': move_name(move_id),
+        'accuracy': 100,
+        'power': rng.choice([None, 40, 60, 75, 80, 90, 100, 120]),
+        'pp': rng.choice([5, 10, 15, 20, 35]),
+        'priority': 0,
+        'type': _ref('type', rng.choice(TYPES), 1),
+        'damage_class': _ref('move-damage-class', rng.choice(['physical', 'special', 'status']), 1)
+    }
+
+
+def pokemon_listing(count: int) -> List[Dict[str, str]]:
+    return [_ref('pokemon', pokemon_name(pokemon_id), pokemon_id) for pokemon_id in range(1, count + 1)]